@@ -1,6 +1,7 @@
 # app/api/crm_webhook_router.py
 from __future__ import annotations
 
+from functools import partial
 from typing import Any, Dict, List, Mapping
 from uuid import UUID
 
@@ -16,6 +17,7 @@ from app.integrations.webhooks.webhook_security import verify_webhook_signature
 from app.integrations.webhooks.hubspot_company_webhook_processor import (
     HubSpotCompanyWebhookProcessor,
 )
+from app.integrations.webhooks.webhook_queue import webhook_queue
 from app.dependencies import (
     get_db,
     get_crm_field_mapping_engine,
@@ -114,9 +116,18 @@ async def handle_crm_webhook(
                     detail="Expected a list of events for HubSpot webhook payload",
                 )
 
-        await hubspot_company_processor.handle_events(events)
-
-        return {"status": "ok", "processed_events": len(events)}
+        if not webhook_queue.running:
+            await hubspot_company_processor.handle_events(events)
+            return {"status": "ok", "processed_events": len(events)}
+
+        # Idempotenz im Request (Events sind danach gesichert), Mapping/Save
+        # im Hintergrund – bei voller Queue doch inline
+        received = await hubspot_company_processor.receive_events(events)
+        job = partial(hubspot_company_processor.process_events, received)
+        if received and not webhook_queue.submit(job):
+            await job()
+            return {"status": "ok", "processed_events": len(events)}
+        return {"status": "accepted", "received_events": len(received)}
 
     # Andere CRMs noch nicht implementiert
     raise HTTPException(
@@ -15,7 +15,7 @@ from pydantic import BaseModel
 from app.config import settings
 from app.integrations.credentials.crm_credentials_store import CRMCredentialsStore
 from app.integrations.crm.crm_types import CRMSystem
-from app.integrations.crm.hubspot.hubspot_auth import HubSpotOAuthClient
+from app.integrations.crm.hubspot.hubspot_refresh import hubspot_oauth_client
 
 from app.dependencies import (
     ensure_path_tenant_matches_token,
@@ -29,8 +29,6 @@ tenant_crm_router = APIRouter(
     tags=["tenant-crm"],
 )
 
-hubspot_oauth_client = HubSpotOAuthClient()
-
 
 # ---------------------------------------------------------------------------
 # OAuth State Helpers (signierter State für HubSpot-Connect)
@@ -38,6 +38,22 @@ class Settings(BaseSettings):
     database_url: str
     database_schema: str = "public"
 
+    # Ein gemeinsamer asyncpg-Pool (app.state.db) für alle Repositories.
+    # database_connect_on_startup=False: app.state.db wird extern gesetzt.
+    database_connect_on_startup: bool = False
+    db_pool_min_size: int = 5
+    db_pool_max_size: int = 20
+    # asyncpg cached Prepared Statements pro Connection (LRU, Key = SQL-Text);
+    # Platz für die konstanten Repo-Queries plus die Multi-Row-Bulk-Upserts
+    # (ein Statement je Chunk-Breite). Hinter PgBouncer/Supabase-Pooler im
+    # Transaction-Mode auf 0 setzen.
+    db_statement_cache_size: int = 2048
+    # 0 = gecachte Statements laufen nicht ab (asyncpg-Default: 300 s)
+    db_max_cached_statement_lifetime: int = 0
+
+    # LISTEN/NOTIFY-Invalidierung der CRM-Caches (Trigger aus ideas.txt nötig)
+    crm_cache_notify_enabled: bool = False
+
     # ------------------------------------------------------------------ #
     # Security / Auth
     # ------------------------------------------------------------------ #
@@ -89,6 +105,26 @@ class Settings(BaseSettings):
     hubspot_redirect_uri: AnyHttpUrl
     hubspot_scopes: str = "crm.objects.contacts.read crm.objects.contacts.write"
     hubspot_webhook_secret: Optional[str] = None
+    # Max. parallel verarbeitete Companies pro Webhook-Request (Mapping + Save)
+    webhook_concurrency: int = 8
+    # > 0: Webhooks nach Signatur + Idempotenz sofort beantworten, Verarbeitung
+    # durch so viele Hintergrund-Worker; 0 = inline im Request
+    webhook_queue_workers: int = 0
+    # Tenant + Roh-Event in crm_webhook_events mitspeichern (Replay verlorener
+    # Jobs). Braucht die Spalten tenant_id/payload/claimed_at (ideas.txt) –
+    # erst einschalten, wenn das Schema migriert ist.
+    webhook_event_inbox_enabled: bool = False
+    # Events, die so lange (Sekunden) auf 'received' stehen, erneut verarbeiten
+    # (verlorene Jobs, siehe WebhookReplayer); 0 = aus. Nur mit
+    # webhook_event_inbox_enabled aktiv.
+    webhook_replay_after_seconds: int = 300
+
+    # ------------------------------------------------------------------ #
+    # Salesforce OAuth Config (Connected App, für Token-Refresh)
+    # ------------------------------------------------------------------ #
+
+    salesforce_client_id: Optional[str] = None
+    salesforce_client_secret: Optional[str] = None
 
     class Config:
         env_file = ".env"
@@ -97,6 +133,12 @@ class Settings(BaseSettings):
 
         fields = {
             "database_url": {"env": "DATABASE_URL"},
+            "database_connect_on_startup": {"env": "DATABASE_CONNECT_ON_STARTUP"},
+            "db_pool_min_size": {"env": "DB_POOL_MIN_SIZE"},
+            "db_pool_max_size": {"env": "DB_POOL_MAX_SIZE"},
+            "db_statement_cache_size": {"env": "DB_STATEMENT_CACHE_SIZE"},
+            "db_max_cached_statement_lifetime": {"env": "DB_MAX_CACHED_STATEMENT_LIFETIME"},
+            "crm_cache_notify_enabled": {"env": "CRM_CACHE_NOTIFY_ENABLED"},
             "environment": {"env": "APP_ENV"},
             "secret_key": {"env": "SECRET_KEY"},
             "cors_origins": {"env": "CORS_ORIGINS"},
@@ -106,6 +148,13 @@ class Settings(BaseSettings):
             "hubspot_redirect_uri": {"env": "HUBSPOT_REDIRECT_URI"},
             "hubspot_scopes": {"env": "HUBSPOT_SCOPES"},
             "hubspot_webhook_secret": {"env": "HUBSPOT_WEBHOOK_SECRET"},
+            "webhook_concurrency": {"env": "WEBHOOK_CONCURRENCY"},
+            "webhook_queue_workers": {"env": "WEBHOOK_QUEUE_WORKERS"},
+            "webhook_event_inbox_enabled": {"env": "WEBHOOK_EVENT_INBOX_ENABLED"},
+            "webhook_replay_after_seconds": {"env": "WEBHOOK_REPLAY_AFTER_SECONDS"},
+
+            "salesforce_client_id": {"env": "SALESFORCE_CLIENT_ID"},
+            "salesforce_client_secret": {"env": "SALESFORCE_CLIENT_SECRET"},
             # JWT kannst du entweder per Default-Namen setzen oder hier mappen:
             # "jwt_issuer": {"env": "JWT_ISSUER"},
             # "jwt_audience": {"env": "JWT_AUDIENCE"},
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Any, Mapping, Optional, Sequence, Tuple, List, AsyncIterator
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple, List, AsyncIterator
 
 import asyncpg  # in requirements aufnehmen (z.B. asyncpg>=0.29)
 
@@ -12,6 +12,10 @@ logger = logging.getLogger(__name__)
 # :named_param → für unsere SQL-Queries in den Repositories
 _PARAM_PATTERN = re.compile(r":([a-zA-Z_][a-zA-Z0-9_]*)")
 
+# Cache: SQL mit :named_params → ($n-SQL, Reihenfolge der Parameter-Namen).
+# Die Repositories nutzen konstante SQL-Strings, daher bleibt der Cache klein.
+_COMPILED_QUERIES: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+
 
 class Database:
     """
@@ -23,6 +27,11 @@ class Database:
         postgres://...
 
     Unterstützt benannte Parameter im Stil :param_name, wie in deinen Repos.
+
+    asyncpg prepared jede Query beim ersten Aufruf pro Connection und cached
+    das Statement (statement_cache_size) – Postgres parst/plant die Repo-Queries
+    also nur einmal pro Connection, solange der SQL-Text konstant bleibt
+    (Werte immer als Parameter, nie in den String formatieren).
     """
 
     def __init__(
@@ -31,10 +40,17 @@ class Database:
         *,
         min_size: int = 1,
         max_size: int = 10,
+        statement_cache_size: int = 100,
+        max_cached_statement_lifetime: int = 0,
     ) -> None:
         self._dsn = dsn
         self._min_size = min_size
         self._max_size = max_size
+        # asyncpg-Prepared-Statement-Cache pro Connection (asyncpg-Default: 100)
+        self._statement_cache_size = statement_cache_size
+        # Sekunden bis asyncpg ein gecachtes Statement neu prepared;
+        # 0 = nie (asyncpg-Default: 300) – die Repo-Queries sind konstant.
+        self._max_cached_statement_lifetime = max_cached_statement_lifetime
         self._pool: Optional[asyncpg.Pool] = None
 
     # ------------------------------------------------------------------ #
@@ -58,6 +74,8 @@ class Database:
             dsn=self._dsn,
             min_size=self._min_size,
             max_size=self._max_size,
+            statement_cache_size=self._statement_cache_size,
+            max_cached_statement_lifetime=self._max_cached_statement_lifetime,
         )
         logger.info("DB-Pool initialisiert.")
 
@@ -105,6 +123,30 @@ class Database:
             rows = await conn.fetch(sql, *args)
             return [dict(r) for r in rows]
 
+    async def stream(
+        self,
+        query: str,
+        params: Optional[Mapping[str, Any]] = None,
+        *,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Mapping[str, Any]]:
+        """
+        SELECT über einen serverseitigen Cursor – liefert die Datensätze
+        einzeln als Dicts, ohne das ganze Ergebnis im Speicher zu halten.
+
+            async for row in db.stream(sql, params):
+                ...
+
+        asyncpg-Cursor brauchen eine Transaktion; die Connection bleibt
+        belegt, bis der Iterator erschöpft oder geschlossen ist.
+        """
+        sql, args = self._compile_query(query, params)
+
+        async with self._acquire_conn() as conn:
+            async with conn.transaction():
+                async for row in conn.cursor(sql, *args, prefetch=batch_size):
+                    yield dict(row)
+
     async def execute(
         self,
         query: str,
@@ -125,19 +167,20 @@ class Database:
         params_seq: Sequence[Mapping[str, Any]],
     ) -> None:
         """
-        Mehrere Execute-Aufrufe innerhalb einer Transaktion.
+        Mehrere Execute-Aufrufe innerhalb einer Transaktion (ein Commit).
+        asyncpg.executemany schickt alle Parametersätze gepipelined für ein
+        Prepared Statement, statt einen Round-Trip pro Satz.
         """
         if not params_seq:
             return
 
-        sql_template = query
+        sql = self._compile_query(query, params_seq[0])[0]
+        args_seq = [self._compile_query(query, params)[1] for params in params_seq]
         pool = self._ensure_pool()
 
         async with pool.acquire() as conn:
             async with conn.transaction():
-                for params in params_seq:
-                    sql, args = self._compile_query(sql_template, params)
-                    await conn.execute(sql, *args)
+                await conn.executemany(sql, args_seq)
 
     # ------------------------------------------------------------------ #
     # Transaktionen – für komplexere Use-Cases
@@ -195,26 +238,24 @@ class Database:
         """
         Wandelt :named_parameter in $1, $2, ... um und liefert
         (compiled_sql, args_list) zurück.
+
+        Das Umschreiben passiert pro SQL-String nur einmal (_COMPILED_QUERIES);
+        pro Aufruf werden nur noch die Argumente eingesammelt.
         """
         if not params:
             return query, []
 
-        used_keys: List[str] = []
-
-        def replacer(match: re.Match) -> str:
-            key = match.group(1)
-            if key not in params:
-                raise KeyError(f"Missing query parameter: {key}")
+        compiled = _COMPILED_QUERIES.get(query)
+        if compiled is None:
+            compiled = _rewrite_named_params(query)
+            _COMPILED_QUERIES[query] = compiled
 
-            if key not in used_keys:
-                used_keys.append(key)
-            index = used_keys.index(key) + 1  # asyncpg ist 1-basiert: $1, $2, ...
-
-            return f"${index}"
-
-        compiled = _PARAM_PATTERN.sub(replacer, query)
-        args = [params[k] for k in used_keys]
-        return compiled, args
+        sql, keys = compiled
+        try:
+            args = [params[k] for k in keys]
+        except KeyError as exc:
+            raise KeyError(f"Missing query parameter: {exc.args[0]}") from None
+        return sql, args
 
     class _ConnectionContext:
         """
@@ -236,3 +277,19 @@ class Database:
     def _acquire_conn(self) -> "Database._ConnectionContext":
         pool = self._ensure_pool()
         return Database._ConnectionContext(pool)
+
+
+def _rewrite_named_params(query: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    :named_parameter → $1, $2, ... (asyncpg ist 1-basiert).
+    Mehrfach verwendete Namen bekommen denselben Index.
+    """
+    used_keys: List[str] = []
+
+    def replacer(match: re.Match) -> str:
+        key = match.group(1)
+        if key not in used_keys:
+            used_keys.append(key)
+        return f"${used_keys.index(key) + 1}"
+
+    return _PARAM_PATTERN.sub(replacer, query), tuple(used_keys)
@@ -12,6 +12,7 @@ from typing import (
     Dict,
     Generic,
     List,
+    Optional,
     Type,
     TypeVar,
 )
@@ -47,14 +48,138 @@ class EventBus:
         await event_bus.publish(
             CompanyUpdatedEvent(tenant_id=tenant_id, company_id=company_id)
         )
+
+    Hintergrund-Events (publish_background):
+      - Nach start() landen Events in einer begrenzten asyncio.Queue.
+      - Ein einzelner Consumer-Task sammelt bis zu `batch_size` Events
+        (oder wartet max. `flush_ms`) und dispatcht sie als Batch.
+      - Ist die Queue voll, wird das Event verworfen und geloggt,
+        statt beliebig viele Tasks zu erzeugen.
+      - Ohne start() bleibt das alte Verhalten (ein Task pro Event).
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        queue_maxsize: int = 10_000,
+        batch_size: int = 64,
+        flush_ms: int = 50,
+        stop_timeout_seconds: float = 10.0,
+    ) -> None:
         # Mapping: Event-Typ -> Liste von Handlern
         self._subscribers: DefaultDict[
             Type[DomainEvent], List[EventHandler[Any]]
         ] = defaultdict(list)
 
+        self._queue_maxsize = queue_maxsize
+        self._batch_size = batch_size
+        self._flush_seconds = flush_ms / 1000.0
+        self._stop_timeout = stop_timeout_seconds
+
+        self._queue: Optional[asyncio.Queue[DomainEvent]] = None
+        self._consumer_task: Optional[asyncio.Task[None]] = None
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle (Hintergrund-Consumer)
+    # ------------------------------------------------------------------ #
+
+    async def start(self) -> None:
+        """
+        Startet den Consumer-Task für publish_background (z. B. im App-Startup).
+        """
+        if self._consumer_task is not None:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self._queue_maxsize)
+        self._consumer_task = asyncio.get_running_loop().create_task(
+            self._consume(self._queue)
+        )
+        logger.info(
+            "EventBus-Consumer gestartet (queue_maxsize=%s, batch_size=%s, flush_ms=%s)",
+            self._queue_maxsize,
+            self._batch_size,
+            int(self._flush_seconds * 1000),
+        )
+
+    async def stop(self) -> None:
+        """
+        Stoppt den Consumer-Task und arbeitet noch wartende Events ab.
+
+        Wartet bis zu stop_timeout_seconds, bis der Consumer die Queue
+        (inkl. des laufenden Batches) abgearbeitet hat, und bricht ihn erst
+        danach ab. Was dann noch in der Queue liegt, wird hier dispatcht.
+        """
+        task, queue = self._consumer_task, self._queue
+        if task is None or queue is None:
+            return
+
+        self._consumer_task = None
+        self._queue = None  # neue Events ab jetzt ohne Queue (ein Task pro Event)
+
+        try:
+            await asyncio.wait_for(queue.join(), self._stop_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "EventBus-Consumer nach %.1fs nicht leer – breche ab (%d Events wartend)",
+                self._stop_timeout,
+                queue.qsize(),
+            )
+
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+        remaining: List[DomainEvent] = []
+        while not queue.empty():
+            remaining.append(queue.get_nowait())
+        if remaining:
+            await self._dispatch_batch(remaining)
+
+        logger.info("EventBus-Consumer gestoppt.")
+
+    async def _consume(self, queue: "asyncio.Queue[DomainEvent]") -> None:
+        # Queue als Argument: stop() setzt self._queue ggf. schon zurück,
+        # bevor der Task zum ersten Mal läuft
+        while True:
+            batch = await self._drain(queue)
+            try:
+                await self._dispatch_batch(batch)
+            finally:
+                # erst nach dem Dispatch als erledigt markieren → stop() wartet via join()
+                for _ in batch:
+                    queue.task_done()
+
+    async def _drain(self, queue: "asyncio.Queue[DomainEvent]") -> List[DomainEvent]:
+        """
+        Wartet auf mindestens ein Event und sammelt dann weitere, bis
+        batch_size erreicht oder flush_ms abgelaufen ist.
+        """
+        batch: List[DomainEvent] = [await queue.get()]
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._flush_seconds
+
+        while len(batch) < self._batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _dispatch_batch(self, batch: List[DomainEvent]) -> None:
+        """
+        Dispatcht einen Batch; die Parallelität ist durch batch_size begrenzt.
+        Fehler werden bereits in publish() pro Handler geloggt.
+        """
+        logger.debug("Dispatche Event-Batch mit %d Events", len(batch))
+        await asyncio.gather(*(self.publish(event) for event in batch))
+
     # ------------------------------------------------------------------ #
     # Subscription-API
     # ------------------------------------------------------------------ #
@@ -133,9 +258,23 @@ class EventBus:
         await schreiben zu müssen (z. B. in sync-Kontexten).
 
         Hinweis:
-          - Funktioniert nur, wenn bereits eine Event-Loop läuft
+          - Nach start(): Event wird in die begrenzte Queue gelegt
+            (bei voller Queue verworfen + geloggt).
+          - Sonst: funktioniert nur, wenn bereits eine Event-Loop läuft
             (z. B. in FastAPI-Request-Handlern).
         """
+        if self._queue is not None:
+            try:
+                self._queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning(
+                    "EventBus-Queue voll (maxsize=%s) – Event %s (%s) verworfen",
+                    self._queue_maxsize,
+                    event.event_name,
+                    event.id,
+                )
+            return
+
         try:
             loop = asyncio.get_running_loop()
         except RuntimeError:
@@ -2,10 +2,11 @@
 
 from .company import Company
 from .contact import Contact
-from .opportunity import Opportunity
+from .opportunity import Opportunity, OpportunitySummary
 
 __all__ = [
     "Company",
     "Contact",
     "Opportunity",
+    "OpportunitySummary",
 ]
@@ -5,7 +5,7 @@ from typing import Optional, List, Dict, Any
 from uuid import UUID
 
 
-@dataclass
+@dataclass(slots=True)
 class Company:
     """
     Tenant-spezifische Sicht auf eine Sub-Company (Account).
@@ -5,7 +5,7 @@ from typing import Optional
 from uuid import UUID
 
 
-@dataclass
+@dataclass(slots=True)
 class Contact:
     """
     Tenant-spezifische Sicht auf einen Kontakt.
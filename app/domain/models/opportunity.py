@@ -1,11 +1,11 @@
 # app/domain/models/opportunity.py
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import NamedTuple, Optional
 from uuid import UUID
 
 
-@dataclass
+@dataclass(slots=True)
 class Opportunity:
     """
     Tenant-spezifische Sicht auf eine Demo / Opportunity.
@@ -45,3 +45,23 @@ class Opportunity:
     last_modified_time: datetime = field(default_factory=datetime.utcnow)
     created_by: Optional[str] = None
     modified_by: Optional[str] = None
+
+    # False: bant_comment wurde nicht geladen (Listen-Projektion) – beim
+    # Speichern bleibt der Kommentar in der DB dann unverändert. Nur bei True
+    # wird bant_comment geschrieben (None leert ihn).
+    bant_comment_loaded: bool = field(default=True, repr=False, compare=False)
+
+
+class OpportunitySummary(NamedTuple):
+    """
+    Schlanke Listen-Sicht auf eine Opportunity (z. B. für Übersichten).
+
+    Enthält nur die Spalten, die List-Views tatsächlich brauchen –
+    kein vollständiges Opportunity-UDM.
+    """
+
+    leadlane_demo_id: UUID
+    leadlane_sub_company_id: UUID            # DB: leadlane_account_id
+    leadlane_contact_id: UUID
+    demo_date: Optional[datetime]
+    demo_status: Optional[str]
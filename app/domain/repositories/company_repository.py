@@ -1,7 +1,7 @@
 # app/domain/repositories/company_repository.py
 from __future__ import annotations
 
-from typing import Optional, Sequence, Mapping, Any, List, Dict
+from typing import Optional, Sequence, Mapping, Any, List, Dict, AsyncIterator
 from uuid import UUID
 
 from app.domain.models.company import Company
@@ -60,6 +60,21 @@ class CompanyRepository:
         )
         return [self._row_to_company(row, tenant_id=tenant_id) for row in rows]
 
+    async def stream_for_tenant(
+        self,
+        tenant_id: UUID,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Company]:
+        """
+        Wie list_for_tenant, aber ohne LIMIT/OFFSET über einen Cursor:
+        Speicherbedarf O(batch_size) statt O(N) – für Full-Scans (z.B. Sync).
+        """
+        async for row in self._db.stream(
+            _SELECT_ALL_COMPANIES_FOR_TENANT_SQL,
+            {"tenant_id": str(tenant_id)},
+            batch_size=batch_size,
+        ):
+            yield self._row_to_company(row, tenant_id=tenant_id)
 
     async def save(self, company: Company) -> Company:
         """
@@ -70,32 +85,44 @@ class CompanyRepository:
         Zentraldaten (central_database_sub_company) werden typischerweise
         nicht von diesem Pfad geschrieben.
         """
-        await self._db.execute(
+        await self._db.execute(_UPSERT_TMPL_SUB_COMPANY_SQL, self._save_params(company))
+        return company
+
+    async def save_many(self, companies: Sequence[Company]) -> None:
+        """
+        Wie save für mehrere Companies – alle in einer Transaktion
+        (ein Commit/WAL-Flush statt einem pro Company). Schlägt eine fehl,
+        wird keine gespeichert.
+        """
+        await self._db.execute_many(
             _UPSERT_TMPL_SUB_COMPANY_SQL,
-            {
-                "leadlane_sub_company_id": str(company.leadlane_sub_company_id),
-                "leadlane_parent_company_id": str(company.leadlane_parent_company_id),
-                "lifecycle_phase": company.lifecycle_phase,
-                "loss_reason": company.loss_reason,
-                "contacts_backlog": company.contacts_backlog,
-                "contacts_total": company.contacts_total,
-                "contacts_active": company.contacts_active,
-                "contacts_validation": company.contacts_validation,
-                "date_last_lusha_contact_search": company.date_last_lusha_contact_search,
-                "company_name": company.company_name,
-                "business_description": company.business_description,
-                "url": company.url,
-                "country_region": company.country_region,
-                "responsible_sdr_id": (
-                    str(company.responsible_sdr_id)
-                    if company.responsible_sdr_id
-                    else None
-                ),
-                "created_by": company.created_by,
-                "modified_by": company.modified_by,
-            },
+            [self._save_params(company) for company in companies],
         )
-        return company
+
+    @staticmethod
+    def _save_params(company: Company) -> Dict[str, Any]:
+        return {
+            "leadlane_sub_company_id": str(company.leadlane_sub_company_id),
+            "leadlane_parent_company_id": str(company.leadlane_parent_company_id),
+            "lifecycle_phase": company.lifecycle_phase,
+            "loss_reason": company.loss_reason,
+            "contacts_backlog": company.contacts_backlog,
+            "contacts_total": company.contacts_total,
+            "contacts_active": company.contacts_active,
+            "contacts_validation": company.contacts_validation,
+            "date_last_lusha_contact_search": company.date_last_lusha_contact_search,
+            "company_name": company.company_name,
+            "business_description": company.business_description,
+            "url": company.url,
+            "country_region": company.country_region,
+            "responsible_sdr_id": (
+                str(company.responsible_sdr_id)
+                if company.responsible_sdr_id
+                else None
+            ),
+            "created_by": company.created_by,
+            "modified_by": company.modified_by,
+        }
 
     # -------------------------------------------------------------------------
     # Row → Domain Mapping
@@ -239,6 +266,29 @@ class CompanyRepository:
 
         return self._row_to_company(row, tenant_id=tenant_id)
 
+    async def get_many_by_ids(
+        self,
+        tenant_id: UUID,
+        leadlane_sub_company_ids: Sequence[UUID],
+    ) -> Dict[UUID, Company]:
+        """
+        Batch-Variante von get_by_id (ein Round-Trip statt N).
+        Ergebnis: leadlane_sub_company_id -> Company; unbekannte IDs fehlen.
+        """
+        if not leadlane_sub_company_ids:
+            return {}
+
+        rows = await self._db.fetch_all(
+            _SELECT_COMPANIES_BY_IDS_SQL,
+            {
+                "leadlane_sub_company_ids": [
+                    str(i) for i in dict.fromkeys(leadlane_sub_company_ids)
+                ],
+            },
+        )
+        companies = (self._row_to_company(row, tenant_id=tenant_id) for row in rows)
+        return {company.leadlane_sub_company_id: company for company in companies}
+
 
 # -------------------------------------------------------------------------
 # SQL-Statements
@@ -358,6 +408,15 @@ _SELECT_COMPANY_BY_ID_SQL = f"""
     WHERE c_sub.leadlane_sub_company_id = :leadlane_sub_company_id
 """
 
+_SELECT_COMPANIES_BY_IDS_SQL = f"""
+    SELECT
+        {_SELECT_BASE_COLUMNS}
+    FROM public.central_database_sub_company AS c_sub
+    JOIN public.tmpl_c_db_sub_company AS t_sub
+      ON c_sub.leadlane_sub_company_id = t_sub.leadlane_sub_company_id
+    WHERE c_sub.leadlane_sub_company_id = ANY(:leadlane_sub_company_ids)
+"""
+
 _SELECT_COMPANIES_FOR_TENANT_SQL = f"""
     SELECT
         {_SELECT_BASE_COLUMNS}
@@ -369,6 +428,16 @@ _SELECT_COMPANIES_FOR_TENANT_SQL = f"""
     LIMIT :limit OFFSET :offset
 """
 
+_SELECT_ALL_COMPANIES_FOR_TENANT_SQL = f"""
+    SELECT
+        {_SELECT_BASE_COLUMNS}
+    FROM public.central_database_sub_company AS c_sub
+    JOIN public.tmpl_c_db_sub_company AS t_sub
+      ON c_sub.leadlane_sub_company_id = t_sub.leadlane_sub_company_id
+    WHERE t_sub.tenant_id = :tenant_id
+    ORDER BY t_sub.created_time DESC
+"""
+
 
 _UPSERT_TMPL_SUB_COMPANY_SQL = """
     INSERT INTO public.tmpl_c_db_sub_company (
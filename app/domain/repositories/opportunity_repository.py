@@ -1,10 +1,10 @@
 # app/domain/repositories/opportunity_repository.py
 from __future__ import annotations
 
-from typing import Optional, Sequence, Mapping, Any
+from typing import Optional, Sequence, Mapping, Any, Dict, List
 from uuid import UUID
 
-from app.domain.models.opportunity import Opportunity
+from app.domain.models.opportunity import Opportunity, OpportunitySummary
 from app.db.database import Database  # dein DB-Wrapper (fetch_one, fetch_all, execute)
 
 
@@ -62,6 +62,9 @@ class OpportunityRepository:
 
         DB:
           - leadlane_account_id
+
+        bant_comment wird hier nicht geladen (None, bant_comment_loaded=False)
+        – vollständige Daten liefert get().
         """
         rows = await self._db.fetch_all(
             _SELECT_OPPORTUNITIES_FOR_ACCOUNT_SQL,
@@ -71,7 +74,39 @@ class OpportunityRepository:
                 "offset": offset,
             },
         )
-        return [self._row_to_opportunity(r, tenant_id=tenant_id) for r in rows]
+        return self._rows_to_opportunities(rows, tenant_id=tenant_id)
+
+    async def list_for_account_summary(
+        self,
+        tenant_id: UUID,
+        leadlane_sub_company_id: UUID,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> Sequence[OpportunitySummary]:
+        """
+        Wie list_for_account, aber nur mit den Spalten für List-Views.
+
+        Lädt 5 statt 17 Spalten und baut leichte OpportunitySummary-Tupel
+        statt vollständiger Opportunity-Objekte.
+        """
+        rows = await self._db.fetch_all(
+            _SELECT_OPPORTUNITIES_FOR_ACCOUNT_SUMMARY_SQL,
+            {
+                "leadlane_account_id": str(leadlane_sub_company_id),
+                "limit": limit,
+                "offset": offset,
+            },
+        )
+        return [
+            OpportunitySummary(
+                leadlane_demo_id=r["leadlane_demo_id"],
+                leadlane_sub_company_id=r["leadlane_account_id"],
+                leadlane_contact_id=r["leadlane_contact_id"],
+                demo_date=r.get("demo_date"),
+                demo_status=r.get("demo_status"),
+            )
+            for r in rows
+        ]
 
     async def save(self, opportunity: Opportunity) -> Opportunity:
         """
@@ -88,33 +123,59 @@ class OpportunityRepository:
         Audit:
           - created_time/last_modified_time kommen aus der DB (DEFAULT/now()).
           - created_by/modified_by kommen aus dem Service (actor).
+
+        bant_comment wird nur geschrieben, wenn er geladen bzw. gesetzt wurde
+        (bant_comment_loaded=True; None leert ihn). Objekte aus
+        list_for_account lassen den gespeicherten Kommentar unverändert.
+
+        No-op-Writes: Ist die Zeile bereits identisch, überspringt das
+        Upsert das UPDATE in der DB (WHERE ... IS DISTINCT FROM) – kein neues
+        Tupel, kein last_modified_time-Bump (idempotente Sync-Schleifen).
         """
         await self._db.execute(
-            _UPSERT_OPPORTUNITY_SQL,
-            {
-                "leadlane_demo_id": str(opportunity.leadlane_demo_id),
-                "leadlane_account_id": str(opportunity.leadlane_sub_company_id),
-                "leadlane_contact_id": str(opportunity.leadlane_contact_id),
-                "responsible_sdr_id": (
-                    str(opportunity.responsible_sdr_id)
-                    if opportunity.responsible_sdr_id
-                    else None
-                ),
-                "demo_date": opportunity.demo_date,
-                "demo_invite_sent_at": opportunity.demo_invite_sent_at,
-                "demo_preperation": opportunity.demo_preparation,
-                "demo_status": opportunity.demo_status,
-                "bant_budget": opportunity.bant_budget,
-                "bant_authority": opportunity.bant_authority,
-                "bant_need": opportunity.bant_need,
-                "bant_timing": opportunity.bant_timing,
-                "bant_comment": opportunity.bant_comment,
-                "created_by": opportunity.created_by,
-                "modified_by": opportunity.modified_by,
-            },
+            _UPSERT_OPPORTUNITY_SQL, self._opportunity_to_params(opportunity)
         )
         return opportunity
 
+    async def save_many(self, opportunities: Sequence[Opportunity]) -> None:
+        """
+        Upsert mehrerer Opportunities in einer Transaktion
+        (gleiche Semantik wie save, aber nur ein Connection-Acquire).
+        """
+        await self._db.execute_many(
+            _UPSERT_OPPORTUNITY_SQL,
+            [self._opportunity_to_params(o) for o in opportunities],
+        )
+
+    # -------------------------------------------------------------------------
+    # Domain → SQL-Parameter
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _opportunity_to_params(opportunity: Opportunity) -> Dict[str, Any]:
+        return {
+            "leadlane_demo_id": str(opportunity.leadlane_demo_id),
+            "leadlane_account_id": str(opportunity.leadlane_sub_company_id),
+            "leadlane_contact_id": str(opportunity.leadlane_contact_id),
+            "responsible_sdr_id": (
+                str(opportunity.responsible_sdr_id)
+                if opportunity.responsible_sdr_id
+                else None
+            ),
+            "demo_date": opportunity.demo_date,
+            "demo_invite_sent_at": opportunity.demo_invite_sent_at,
+            "demo_preperation": opportunity.demo_preparation,
+            "demo_status": opportunity.demo_status,
+            "bant_budget": opportunity.bant_budget,
+            "bant_authority": opportunity.bant_authority,
+            "bant_need": opportunity.bant_need,
+            "bant_timing": opportunity.bant_timing,
+            "bant_comment": opportunity.bant_comment,
+            "bant_comment_loaded": opportunity.bant_comment_loaded,
+            "created_by": opportunity.created_by,
+            "modified_by": opportunity.modified_by,
+        }
+
     # -------------------------------------------------------------------------
     # Row → Domain Mapping
     # -------------------------------------------------------------------------
@@ -150,8 +211,47 @@ class OpportunityRepository:
             last_modified_time=row.get("last_modified_time"),
             created_by=row.get("created_by"),
             modified_by=row.get("modified_by"),
+            bant_comment_loaded="bant_comment" in row,
         )
 
+    @staticmethod
+    def _rows_to_opportunities(
+        rows: Sequence[Mapping[str, Any]],
+        tenant_id: UUID,
+    ) -> List[Opportunity]:
+        """
+        Batch-Variante von _row_to_opportunity für Listen (Hot Path beim Sync).
+
+        Gleiches Mapping, aber positional statt per Keyword und mit lokal
+        gebundenen Lookups – spart pro Zeile den Keyword-Abgleich im
+        dataclass-__init__. Reihenfolge = Felddefinition in Opportunity.
+        """
+        new = Opportunity
+        return [
+            new(
+                tenant_id,
+                row["leadlane_demo_id"],
+                row["leadlane_account_id"],
+                row["leadlane_contact_id"],
+                row.get("responsible_sdr_id"),
+                row.get("demo_date"),
+                row.get("demo_invite_sent_at"),
+                row.get("demo_preperation"),
+                row.get("demo_status"),
+                row.get("bant_budget", "unknown"),
+                row.get("bant_authority", "unknown"),
+                row.get("bant_need", "unknown"),
+                row.get("bant_timing", "unknown"),
+                row.get("bant_comment"),
+                row.get("created_time"),
+                row.get("last_modified_time"),
+                row.get("created_by"),
+                row.get("modified_by"),
+                "bant_comment" in row,
+            )
+            for row in rows
+        ]
+
 
 # -------------------------------------------------------------------------
 # SQL-Statements
@@ -180,6 +280,7 @@ _SELECT_OPPORTUNITY_BY_ID_SQL = """
     WHERE leadlane_demo_id = :leadlane_demo_id
 """
 
+# Listen-Projektion: ohne bant_comment (langer Freitext, nur in der Detailansicht)
 _SELECT_OPPORTUNITIES_FOR_ACCOUNT_SQL = """
     SELECT
         leadlane_demo_id,
@@ -194,7 +295,6 @@ _SELECT_OPPORTUNITIES_FOR_ACCOUNT_SQL = """
         bant_authority,
         bant_need,
         bant_timing,
-        bant_comment,
         created_time,
         last_modified_time,
         created_by,
@@ -205,6 +305,19 @@ _SELECT_OPPORTUNITIES_FOR_ACCOUNT_SQL = """
     LIMIT :limit OFFSET :offset
 """
 
+_SELECT_OPPORTUNITIES_FOR_ACCOUNT_SUMMARY_SQL = """
+    SELECT
+        leadlane_demo_id,
+        leadlane_account_id,
+        leadlane_contact_id,
+        demo_date,
+        demo_status
+    FROM public.tmpl_demo_manager
+    WHERE leadlane_account_id = :leadlane_account_id
+    ORDER BY created_time DESC
+    LIMIT :limit OFFSET :offset
+"""
+
 _UPSERT_OPPORTUNITY_SQL = """
     INSERT INTO public.tmpl_demo_manager (
         leadlane_demo_id,
@@ -253,7 +366,45 @@ _UPSERT_OPPORTUNITY_SQL = """
         bant_authority = EXCLUDED.bant_authority,
         bant_need = EXCLUDED.bant_need,
         bant_timing = EXCLUDED.bant_timing,
-        bant_comment = EXCLUDED.bant_comment,
+        -- nicht geladen (Listen-Projektion) → bestehenden Kommentar behalten;
+        -- geladen + NULL leert ihn
+        bant_comment = CASE
+            WHEN CAST(:bant_comment_loaded AS boolean) THEN EXCLUDED.bant_comment
+            ELSE public.tmpl_demo_manager.bant_comment
+        END,
         last_modified_time = now(),
         modified_by = EXCLUDED.modified_by
+    -- No-op-Writes überspringen: nur updaten, wenn sich etwas ändert
+    WHERE (
+        public.tmpl_demo_manager.leadlane_account_id,
+        public.tmpl_demo_manager.leadlane_contact_id,
+        public.tmpl_demo_manager.responsible_sdr_id,
+        public.tmpl_demo_manager.demo_date,
+        public.tmpl_demo_manager.demo_invite_sent_at,
+        public.tmpl_demo_manager.demo_preperation,
+        public.tmpl_demo_manager.demo_status,
+        public.tmpl_demo_manager.bant_budget,
+        public.tmpl_demo_manager.bant_authority,
+        public.tmpl_demo_manager.bant_need,
+        public.tmpl_demo_manager.bant_timing,
+        public.tmpl_demo_manager.bant_comment,
+        public.tmpl_demo_manager.modified_by
+    ) IS DISTINCT FROM (
+        EXCLUDED.leadlane_account_id,
+        EXCLUDED.leadlane_contact_id,
+        EXCLUDED.responsible_sdr_id,
+        EXCLUDED.demo_date,
+        EXCLUDED.demo_invite_sent_at,
+        EXCLUDED.demo_preperation,
+        EXCLUDED.demo_status,
+        EXCLUDED.bant_budget,
+        EXCLUDED.bant_authority,
+        EXCLUDED.bant_need,
+        EXCLUDED.bant_timing,
+        CASE
+            WHEN CAST(:bant_comment_loaded AS boolean) THEN EXCLUDED.bant_comment
+            ELSE public.tmpl_demo_manager.bant_comment
+        END,
+        EXCLUDED.modified_by
+    )
 """
@@ -2,10 +2,14 @@
 
 from .company_service import CompanyService
 from .contact_service import ContactService
-from .opportunity_service import OpportunityService
+from .opportunity_service import AccountBundle, OpportunityService
+from .list_cache import TenantListCache, tenant_list_cache
 
 __all__ = [
+    "AccountBundle",
     "CompanyService",
     "ContactService",
     "OpportunityService",
+    "TenantListCache",
+    "tenant_list_cache",
 ]
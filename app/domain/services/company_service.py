@@ -1,13 +1,14 @@
 # app/domain/services/company_service.py
 from __future__ import annotations
 
-from typing import Optional, Sequence
+from typing import AsyncIterator, Optional, Sequence
 from uuid import UUID
 
 from app.domain.models.company import Company
 from app.domain.repositories.company_repository import CompanyRepository
 from app.domain.events.event_bus import event_bus
 from app.domain.events.company_events import CompanyUpdatedEvent
+from app.domain.services.list_cache import tenant_list_cache
 
 
 class CompanyService:
@@ -40,7 +41,31 @@ class CompanyService:
         limit: int = 100,
         offset: int = 0,
     ) -> Sequence[Company]:
-        return await self._companies.list_for_tenant(tenant_id, limit=limit, offset=offset)
+        # Nur die erste Seite wird gecacht (Dashboard); Invalidierung in save_company.
+        if offset == 0:
+            cached = tenant_list_cache.get(tenant_id, "company", limit)
+            if cached is not None:
+                # gleicher Typ wie ohne Cache (list) – der Aufrufer bekommt eine Kopie
+                return list(cached)
+
+        companies = await self._companies.list_for_tenant(tenant_id, limit=limit, offset=offset)
+
+        if offset == 0:
+            tenant_list_cache.set(tenant_id, "company", limit, companies)
+        return companies
+
+    def stream_companies_for_tenant(
+        self,
+        tenant_id: UUID,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Company]:
+        """
+        Alle Companies eines Tenants als Stream (Cursor statt Seiten):
+
+            async for company in service.stream_companies_for_tenant(tenant_id):
+                ...
+        """
+        return self._companies.stream_for_tenant(tenant_id, batch_size=batch_size)
 
     # ------------------------------------------------------------------ #
     # Writes
@@ -70,6 +95,7 @@ class CompanyService:
 
         # 1) Speichern
         saved = await self._companies.save(company)
+        tenant_list_cache.invalidate(saved.tenant_id, "company")  # type: ignore[arg-type]
 
         # 2) Domain-Event feuern (asynchron im Hintergrund)
         event = CompanyUpdatedEvent(
@@ -0,0 +1,66 @@
+# app/domain/services/list_cache.py
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+from uuid import UUID
+
+
+class TenantListCache:
+    """
+    Kleiner In-Process-Cache für die erste Seite der Tenant-Listen
+    (Dashboard-Loads), mit Tag-Invalidierung pro (tenant_id, entity).
+
+    - get/set arbeiten auf (tenant_id, entity, page_key)
+    - invalidate(tenant_id, entity) verwirft alle Seiten/Methoden dieses Tags
+      auf einmal – wird von den save_*-Methoden der Services aufgerufen.
+    - Einträge laufen nach ttl_seconds ab (Schutz gegen Writes, die nicht
+      über die Services laufen).
+    - Listen werden als Tupel abgelegt – kein Aufrufer kann die gecachte
+      Liste für alle anderen verändern. Services geben bei Treffern
+      list(...) zurück, damit Hit und Miss denselben Typ liefern.
+
+    Der Cache ist pro Prozess; mehrere Worker halten jeweils ihren eigenen.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_tags: int = 10_000) -> None:
+        self._ttl = ttl_seconds
+        self._max_tags = max_tags
+        # (tenant_id, entity) -> {page_key: (expires_at, items)}
+        self._entries: Dict[Tuple[UUID, str], Dict[Hashable, Tuple[float, Tuple[Any, ...]]]] = {}
+
+    def get(self, tenant_id: UUID, entity: str, page_key: Hashable) -> Optional[Tuple[Any, ...]]:
+        pages = self._entries.get((tenant_id, entity))
+        if not pages:
+            return None
+
+        entry = pages.get(page_key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del pages[page_key]
+            return None
+        return value
+
+    def set(self, tenant_id: UUID, entity: str, page_key: Hashable, value: Sequence[Any]) -> None:
+        tag = (tenant_id, entity)
+        if tag not in self._entries and len(self._entries) >= self._max_tags:
+            # Grob begrenzen: ältesten Tag (Einfügereihenfolge) verwerfen.
+            self._entries.pop(next(iter(self._entries)))
+
+        self._entries.setdefault(tag, {})[page_key] = (
+            time.monotonic() + self._ttl,
+            tuple(value),
+        )
+
+    def invalidate(self, tenant_id: UUID, entity: str) -> None:
+        self._entries.pop((tenant_id, entity), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Globale Instanz, analog zu event_bus
+tenant_list_cache = TenantListCache()
@@ -1,12 +1,43 @@
 # app/domain/services/opportunity_service.py
 from __future__ import annotations
 
-from typing import Optional, Sequence
+import asyncio
+import logging
+import weakref
+from typing import Dict, List, Literal, NamedTuple, Optional, Sequence, Set, Tuple, Union
 from uuid import UUID
 
-from app.domain.models.opportunity import Opportunity
+from app.domain.models.company import Company
+from app.domain.models.contact import Contact
+from app.domain.models.opportunity import Opportunity, OpportunitySummary
+from app.domain.repositories.company_repository import CompanyRepository
+from app.domain.repositories.contact_repository import ContactRepository
 from app.domain.repositories.opportunity_repository import OpportunityRepository
 
+logger = logging.getLogger(__name__)
+
+# Services mit aktivem Write-Combining – flush_pending_opportunity_writes()
+# schreibt deren Puffer beim App-Shutdown
+_coalescing_services: "weakref.WeakSet[OpportunityService]" = weakref.WeakSet()
+
+
+async def flush_pending_opportunity_writes() -> None:
+    """
+    Schreibt alle gepufferten Opportunities (App-Shutdown).
+    """
+    for service in list(_coalescing_services):
+        await service.close()
+
+
+class AccountBundle(NamedTuple):
+    """
+    Company + Contacts + Opportunities eines Accounts (z.B. für den CRM-Sync).
+    """
+
+    company: Optional[Company]
+    contacts: Sequence[Contact]
+    opportunities: Sequence[Opportunity]
+
 
 class OpportunityService:
     """
@@ -16,10 +47,35 @@ class OpportunityService:
       - Kapselt OpportunityRepository
       - Setzt Audit-Felder
       - Bietet einfache Query-Methoden
+      - Bündelt optional kurz aufeinanderfolgende Writes derselben
+        Opportunity (Write-Combining, Fenster: coalesce_window_ms > 0,
+        z. B. für CRM-Syncs; Standard 0 = jeder Write sofort)
+
+    Gepufferte Writes schreibt close() bzw. beim App-Shutdown
+    flush_pending_opportunity_writes().
     """
 
-    def __init__(self, opportunities: OpportunityRepository) -> None:
+    def __init__(
+        self,
+        opportunities: OpportunityRepository,
+        *,
+        companies: Optional[CompanyRepository] = None,
+        contacts: Optional[ContactRepository] = None,
+        coalesce_window_ms: int = 0,
+    ) -> None:
         self._opportunities = opportunities
+        # optional – nur für bundle_for_account benötigt
+        self._companies = companies
+        self._contacts = contacts
+        self._coalesce_seconds = coalesce_window_ms / 1000.0
+
+        # leadlane_demo_id -> (letzter Stand, Future für alle Wartenden)
+        self._pending: Dict[UUID, Tuple[Opportunity, "asyncio.Future[Opportunity]"]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # laufende Flush-Tasks (Referenz halten, sonst kann der GC sie einsammeln)
+        self._flush_tasks: Set["asyncio.Task[None]"] = set()
+        if self._coalesce_seconds > 0:
+            _coalescing_services.add(self)
 
     # ------------------------------------------------------------------ #
     # Reads
@@ -48,11 +104,55 @@ class OpportunityService:
         leadlane_account_id: UUID,
         limit: int = 100,
         offset: int = 0,
-    ) -> Sequence[Opportunity]:
-        return await self._opportunities.list_for_company(
+        projection: Literal["full", "summary"] = "full",
+    ) -> Union[Sequence[Opportunity], Sequence[OpportunitySummary]]:
+        """
+        Listet Opportunities eines Accounts.
+
+        projection="summary" lädt nur die Spalten für List-Views
+        (OpportunitySummary) statt des vollständigen UDM.
+        """
+        if projection == "summary":
+            return await self._opportunities.list_for_account_summary(
+                tenant_id, leadlane_account_id, limit=limit, offset=offset
+            )
+        return await self._opportunities.list_for_account(
             tenant_id, leadlane_account_id, limit=limit, offset=offset
         )
 
+    async def bundle_for_account(
+        self,
+        tenant_id: UUID,
+        leadlane_account_id: UUID,
+        limit: int = 100,
+    ) -> AccountBundle:
+        """
+        Lädt Company, Contacts und Opportunities eines Accounts parallel.
+
+        Jeder Repository-Call holt sich eine eigene Pool-Connection, die drei
+        Queries laufen also wirklich gleichzeitig (Wall-Time ≈ langsamste
+        Query statt Summe aller drei).
+        """
+        if self._companies is None or self._contacts is None:
+            raise RuntimeError(
+                "bundle_for_account benötigt companies- und contacts-Repository."
+            )
+
+        company, contacts, opportunities = await asyncio.gather(
+            self._companies.get(tenant_id, leadlane_account_id),
+            self._contacts.list_for_company(
+                tenant_id, leadlane_account_id, limit=limit
+            ),
+            self._opportunities.list_for_account(
+                tenant_id, leadlane_account_id, limit=limit
+            ),
+        )
+        return AccountBundle(
+            company=company,
+            contacts=contacts,
+            opportunities=opportunities,
+        )
+
     # ------------------------------------------------------------------ #
     # Writes
     # ------------------------------------------------------------------ #
@@ -61,9 +161,17 @@ class OpportunityService:
         self,
         opportunity: Opportunity,
         actor: Optional[str] = None,
+        *,
+        sync_write: bool = False,
     ) -> Opportunity:
         """
         Persistiert eine Opportunity/Demo (Upsert in tmpl_demo_manager).
+
+        Writes auf dieselbe leadlane_demo_id innerhalb von coalesce_window_ms
+        werden zu einem Upsert zusammengefasst (der letzte Stand gewinnt);
+        alle Aufrufer warten auf denselben Flush.
+
+        sync_write=True (oder coalesce_window_ms=0) schreibt sofort.
         """
         if opportunity.tenant_id is None:
             raise ValueError(
@@ -75,4 +183,82 @@ class OpportunityService:
             opportunity.created_by = actor or "system_sync"
         opportunity.modified_by = actor or "system_sync"
 
-        return await self._opportunities.save(opportunity)
+        if sync_write or self._coalesce_seconds <= 0:
+            return await self._opportunities.save(opportunity)
+
+        loop = asyncio.get_running_loop()
+
+        pending = self._pending.get(opportunity.leadlane_demo_id)
+        if pending is not None:
+            previous, future = pending
+            # created_by des ersten Writes im Fenster beibehalten
+            if previous.created_by is not None:
+                opportunity.created_by = previous.created_by
+        else:
+            future = loop.create_future()
+
+        self._pending[opportunity.leadlane_demo_id] = (opportunity, future)
+
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(
+                self._coalesce_seconds, self._start_flush_task
+            )
+
+        # shield: Abbruch eines Aufrufers darf den gemeinsamen Flush nicht abbrechen
+        return await asyncio.shield(future)
+
+    async def close(self) -> None:
+        """
+        Schreibt gepufferte Opportunities sofort (statt nach Ablauf des
+        Fensters) und wartet auf bereits laufende Flushes.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        await self._flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+    def _start_flush_task(self) -> None:
+        task = asyncio.get_running_loop().create_task(self._flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self) -> None:
+        """
+        Schreibt alle gepufferten Opportunities in einem Batch.
+        """
+        batch = self._pending
+        self._pending = {}
+        self._flush_handle = None
+
+        if not batch:
+            return
+
+        entries: List[Tuple[Opportunity, "asyncio.Future[Opportunity]"]] = list(
+            batch.values()
+        )
+        try:
+            await self._opportunities.save_many([opp for opp, _ in entries])
+        except Exception:
+            logger.exception(
+                "Fehler beim gebündelten Speichern von %d Opportunities – "
+                "speichere einzeln",
+                len(entries),
+            )
+        else:
+            for opp, future in entries:
+                if not future.done():
+                    future.set_result(opp)
+            return
+
+        # Fallback: einzeln speichern, damit ein fehlerhafter Datensatz nur
+        # seinen eigenen Aufrufer trifft
+        for opp, future in entries:
+            try:
+                saved = await self._opportunities.save(opp)
+            except Exception as exc:
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(saved)
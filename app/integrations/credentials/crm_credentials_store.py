@@ -1,12 +1,15 @@
 # app/integrations/credentials/crm_credentials_store.py
 from __future__ import annotations
 
+import functools
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, Awaitable, Callable, List, Mapping, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
 from uuid import UUID
 
 from app.db.database import Database
+from app.integrations.crm.crm_client_cache import crm_client_cache
 from app.integrations.crm.crm_types import CRMSystem
 
 
@@ -35,8 +38,15 @@ class CRMTokenRefreshError(CRMConnectionError):
         self.crm_system = crm_system
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CRMConnectionInfo:
+    """
+    Unveränderlicher Snapshot einer CRM-Verbindung (eine Zeile aus crm_connections).
+
+    slots=True: kein __dict__ pro Instanz – wird pro DB-Zeile erzeugt.
+    frozen=True: Änderungen (z. B. nach Refresh) erzeugen eine neue Instanz.
+    """
+
     tenant_id: UUID
     crm_system: CRMSystem
 
@@ -64,6 +74,62 @@ class CRMConnectionInfo:
         return self.expires_at <= now + timedelta(seconds=skew_seconds)
 
 
+class ConnectedSystemsCache:
+    """
+    Kurzlebiger In-Process-Snapshot von list_connected_systems pro Tenant
+    (Sync-Listener fragt das pro Domain-Event ab).
+
+    - Einträge laufen nach ttl_seconds ab (Änderungen anderer Worker)
+    - upsert_credentials / disable_credentials invalidieren den Tenant sofort
+
+    Der Cache ist pro Prozess; mehrere Worker halten jeweils ihren eigenen.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 10_000) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        # tenant_id -> (expires_at, systems)
+        self._entries: Dict[UUID, Tuple[float, Tuple[CRMSystem, ...]]] = {}
+
+    def get(self, tenant_id: UUID | str) -> Optional[Tuple[CRMSystem, ...]]:
+        key = _as_tenant_key(tenant_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, systems = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return systems
+
+    def set(self, tenant_id: UUID | str, systems: List[CRMSystem]) -> None:
+        key = _as_tenant_key(tenant_id)
+        if key not in self._entries and len(self._entries) >= self._max_entries:
+            # Grob begrenzen: ältesten Eintrag (Einfügereihenfolge) verwerfen.
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self._ttl, tuple(systems))
+
+    def invalidate(self, tenant_id: UUID | str) -> None:
+        self._entries.pop(_as_tenant_key(tenant_id), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def _as_tenant_key(tenant_id: UUID | str) -> UUID:
+    return tenant_id if isinstance(tenant_id, UUID) else _parse_tenant_id(str(tenant_id))
+
+
+@functools.lru_cache(maxsize=2048)
+def _parse_tenant_id(value: str) -> UUID:
+    return UUID(value)
+
+
+# Globale Instanz, analog zu tenant_list_cache (Stores werden pro Request gebaut)
+connected_systems_cache = ConnectedSystemsCache()
+
+
 class CRMCredentialsStore:
     """
     Kapselt alle Zugriffe auf die CRM-Credentials-Tabelle.
@@ -97,7 +163,7 @@ class CRMCredentialsStore:
     def _row_to_connection_info(row: Mapping[str, Any]) -> CRMConnectionInfo:
         return CRMConnectionInfo(
             tenant_id=row["tenant_id"],
-            crm_system=CRMSystem(row["crm_system"]),
+            crm_system=CRMSystem.parse(row["crm_system"]),
             access_token=row.get("access_token"),
             refresh_token=row.get("refresh_token"),
             expires_at=row.get("expires_at"),
@@ -114,11 +180,18 @@ class CRMCredentialsStore:
     # Basis: einfache Credentials holen (ohne Refresh)
     # ------------------------------------------------------------------
 
-    async def get_credentials(
+    async def _fetch_credentials_row(
         self,
         tenant_id: UUID,
         crm_system: CRMSystem | str,
-    ) -> Optional[CRMConnectionInfo]:
+    ) -> Optional[Mapping[str, Any]]:
+        """
+        Lädt die Roh-Zeile aus crm_connections.
+
+        Zusätzlich berechnet die DB `is_expired_now` (gleicher 60s-Puffer wie
+        CRMConnectionInfo.is_expired), damit der Hot-Path keine
+        datetime-Arithmetik in Python braucht.
+        """
         query = """
             SELECT
                 tenant_id,
@@ -132,7 +205,11 @@ class CRMCredentialsStore:
                 created_time,
                 last_modified_time,
                 created_by,
-                modified_by
+                modified_by,
+                (
+                    expires_at IS NOT NULL
+                    AND expires_at <= now() + interval '60 seconds'
+                ) AS is_expired_now
             FROM crm_connections
             WHERE tenant_id = :tenant_id
               AND crm_system = :crm_system
@@ -142,7 +219,14 @@ class CRMCredentialsStore:
             "tenant_id": tenant_id,
             "crm_system": crm_system.value if isinstance(crm_system, CRMSystem) else crm_system,
         }
-        row = await self._db.fetch_one(query, params)
+        return await self._db.fetch_one(query, params)
+
+    async def get_credentials(
+        self,
+        tenant_id: UUID,
+        crm_system: CRMSystem | str,
+    ) -> Optional[CRMConnectionInfo]:
+        row = await self._fetch_credentials_row(tenant_id, crm_system)
         if not row:
             return None
         return self._row_to_connection_info(row)
@@ -161,21 +245,25 @@ class CRMCredentialsStore:
         Holt aktive Credentials. Falls abgelaufen:
           - wenn refresh_fn vorhanden: versucht Refresh + Persist
           - sonst: wirft CRMTokenExpiredError
+
+        Der Ablauf-Check kommt aus SQL (`is_expired_now`);
+        CRMConnectionInfo.is_expired bleibt für Offline-/Test-Nutzung.
         """
         system = crm_system.value if isinstance(crm_system, CRMSystem) else crm_system
 
-        info = await self.get_credentials(tenant_id, crm_system)
-        if info is None or not info.is_enabled:
-            raise CRMNotConnectedError(tenant_id=tenant_id, crm_system=CRMSystem(system))
+        row = await self._fetch_credentials_row(tenant_id, crm_system)
+        if not row or not row.get("is_enabled", True):
+            raise CRMNotConnectedError(tenant_id=tenant_id, crm_system=CRMSystem.parse(system))
 
-        if not info.is_expired():
+        info = self._row_to_connection_info(row)
+        if not row.get("is_expired_now"):
             return info
 
         # abgelaufen
         if refresh_fn is None:
             raise CRMTokenExpiredError(
                 tenant_id=tenant_id,
-                crm_system=CRMSystem(system),
+                crm_system=CRMSystem.parse(system),
                 message="No refresh_fn provided.",
             )
 
@@ -184,7 +272,7 @@ class CRMCredentialsStore:
         except Exception as exc:
             raise CRMTokenRefreshError(
                 tenant_id=tenant_id,
-                crm_system=CRMSystem(system),
+                crm_system=CRMSystem.parse(system),
                 message=str(exc),
             ) from exc
 
@@ -197,46 +285,6 @@ class CRMCredentialsStore:
     # ------------------------------------------------------------------
 
     async def upsert_credentials(self, info: CRMConnectionInfo) -> None:
-        query = """
-            INSERT INTO crm_connections (
-                tenant_id,
-                crm_system,
-                access_token,
-                refresh_token,
-                expires_at,
-                token_type,
-                scope,
-                is_enabled,
-                created_time,
-                last_modified_time,
-                created_by,
-                modified_by
-            )
-            VALUES (
-                :tenant_id,
-                :crm_system,
-                :access_token,
-                :refresh_token,
-                :expires_at,
-                :token_type,
-                :scope,
-                :is_enabled,
-                :created_time,
-                :last_modified_time,
-                :created_by,
-                :modified_by
-            )
-            ON CONFLICT (tenant_id, crm_system)
-            DO UPDATE SET
-                access_token = EXCLUDED.access_token,
-                refresh_token = EXCLUDED.refresh_token,
-                expires_at = EXCLUDED.expires_at,
-                token_type = EXCLUDED.token_type,
-                scope = EXCLUDED.scope,
-                is_enabled = EXCLUDED.is_enabled,
-                last_modified_time = EXCLUDED.last_modified_time,
-                modified_by = EXCLUDED.modified_by
-        """
         params = {
             "tenant_id": info.tenant_id,
             "crm_system": info.crm_system.value if isinstance(info.crm_system, CRMSystem) else info.crm_system,
@@ -246,12 +294,16 @@ class CRMCredentialsStore:
             "token_type": info.token_type,
             "scope": info.scope,
             "is_enabled": info.is_enabled,
-            "created_time": info.created_time or datetime.now(timezone.utc),
-            "last_modified_time": info.last_modified_time or datetime.now(timezone.utc),
+            # None → DB-Default now() (siehe COALESCE im SQL)
+            "created_time": info.created_time,
+            "last_modified_time": info.last_modified_time,
             "created_by": info.created_by,
             "modified_by": info.modified_by,
         }
-        await self._db.execute(query, params)
+        await self._db.execute(_UPSERT_CREDENTIALS_SQL, params)
+        connected_systems_cache.invalidate(info.tenant_id)
+        # gecachter Client hält Token/Portal der alten Verbindung
+        crm_client_cache.invalidate(info.tenant_id)
 
     async def disable_credentials(
         self,
@@ -271,6 +323,8 @@ class CRMCredentialsStore:
             "crm_system": crm_system.value if isinstance(crm_system, CRMSystem) else crm_system,
         }
         await self._db.execute(query, params)
+        connected_systems_cache.invalidate(tenant_id)
+        crm_client_cache.invalidate(tenant_id)
 
     async def list_connections_for_tenant(self, tenant_id: UUID) -> List[CRMConnectionInfo]:
         query = """
@@ -298,9 +352,64 @@ class CRMCredentialsStore:
         Liefert alle CRM-Systeme zurück, für die der Tenant eine
         aktive (is_enabled) Verbindung hat.
         """
-        connections = await self.list_connections_for_tenant(tenant_id)
-        systems: List[CRMSystem] = []
-        for conn in connections:
-            if conn.is_enabled and conn.crm_system not in systems:
-                systems.append(conn.crm_system)
-        return systems
+        # Filter direkt im SQL → bedient von idx_crm_connections_active
+        # (partieller Index, siehe ideas.txt), ohne Tokens mitzuladen.
+        rows = await self._db.fetch_all(
+            _SELECT_CONNECTED_SYSTEMS_SQL,
+            {"tenant_id": tenant_id},
+        )
+        return [CRMSystem.parse(row["crm_system"]) for row in rows]
+
+
+# ----------------------------------------------------------------------
+# SQL-Statements
+# ----------------------------------------------------------------------
+
+_UPSERT_CREDENTIALS_SQL = """
+    INSERT INTO crm_connections (
+        tenant_id,
+        crm_system,
+        access_token,
+        refresh_token,
+        expires_at,
+        token_type,
+        scope,
+        is_enabled,
+        created_time,
+        last_modified_time,
+        created_by,
+        modified_by
+    )
+    VALUES (
+        :tenant_id,
+        :crm_system,
+        :access_token,
+        :refresh_token,
+        :expires_at,
+        :token_type,
+        :scope,
+        :is_enabled,
+        COALESCE(:created_time, now()),
+        COALESCE(:last_modified_time, now()),
+        :created_by,
+        :modified_by
+    )
+    ON CONFLICT (tenant_id, crm_system)
+    DO UPDATE SET
+        access_token = EXCLUDED.access_token,
+        refresh_token = EXCLUDED.refresh_token,
+        expires_at = EXCLUDED.expires_at,
+        token_type = EXCLUDED.token_type,
+        scope = EXCLUDED.scope,
+        is_enabled = EXCLUDED.is_enabled,
+        last_modified_time = EXCLUDED.last_modified_time,
+        modified_by = EXCLUDED.modified_by
+"""
+
+_SELECT_CONNECTED_SYSTEMS_SQL = """
+    SELECT DISTINCT crm_system
+    FROM crm_connections
+    WHERE tenant_id = :tenant_id
+      AND is_enabled
+    ORDER BY crm_system
+"""
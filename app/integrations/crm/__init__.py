@@ -28,8 +28,10 @@ from .crm_client import CRMClient
 # Factory
 from .crm_client_factory import (
     create_crm_client,
+    get_crm_client,
     register_crm_client,
     get_registered_systems,
+    freeze_registry,
     CRMClientConfig,
 )
 
@@ -38,6 +40,9 @@ from .hubspot import HubSpotCRMClient
 from .salesforce import SalesforceCRMClient
 from .sap_b1 import SAPB1CRMClient
 
+# Alle Clients sind registriert → Registry ab hier read-only
+freeze_registry()
+
 __all__ = [
     # Core Types
     "CRMSystem",
@@ -53,8 +58,10 @@ __all__ = [
 
     # Factory
     "create_crm_client",
+    "get_crm_client",
     "register_crm_client",
     "get_registered_systems",
+    "freeze_registry",
     "CRMClientConfig",
 
     # Concrete CRM client classes
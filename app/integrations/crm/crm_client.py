@@ -1,8 +1,9 @@
 # app/integrations/crm/crm_client.py
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Awaitable, Callable, List, Optional, Sequence, TypeVar
 from uuid import UUID
 
 from .crm_types import (
@@ -12,8 +13,11 @@ from .crm_types import (
     CRMDealPayload,
     CRMActivityPayload,
     CRMSyncResult,
+    CRMSyncError,
 )
 
+_P = TypeVar("_P")
+
 
 class CRMClient(ABC):
     """
@@ -25,8 +29,10 @@ class CRMClient(ABC):
       Das passiert eine Ebene darüber im Mapping/Sync-Service.
     """
 
-    def __init__(self, tenant_id: UUID) -> None:
+    def __init__(self, tenant_id: UUID, *, bulk_concurrency: int = 10) -> None:
         self._tenant_id = tenant_id
+        # max. gleichzeitige Einzel-Calls in den Default-Bulk-Methoden
+        self._bulk_concurrency = max(1, bulk_concurrency)
 
     @property
     @abstractmethod
@@ -118,28 +124,71 @@ class CRMClient(ABC):
         payloads: List[CRMCompanyPayload],
     ) -> List[CRMSyncResult]:
         """
-        Default-Implementierung über Einzel-Calls.
-        Konkrete Clients können das mit echten Bulk-APIs überschreiben.
+        Default-Implementierung über Einzel-Calls (parallel, begrenzt durch
+        bulk_concurrency). Konkrete Clients können das mit echten Bulk-APIs
+        überschreiben.
         """
-        results: List[CRMSyncResult] = []
-        for p in payloads:
-            results.append(await self.upsert_company(p))
-        return results
+        return await self._run_bulk(
+            payloads,
+            self.upsert_company,
+            crm_object_type="company",
+            leadlane_id_of=lambda p: p.leadlane_sub_company_id or p.central_sub_company_id,
+        )
 
     async def upsert_contacts_bulk(
         self,
         payloads: List[CRMContactPayload],
     ) -> List[CRMSyncResult]:
-        results: List[CRMSyncResult] = []
-        for p in payloads:
-            results.append(await self.upsert_contact(p))
-        return results
+        return await self._run_bulk(
+            payloads,
+            self.upsert_contact,
+            crm_object_type="contact",
+            leadlane_id_of=lambda p: p.leadlane_contact_id,
+        )
 
     async def upsert_deals_bulk(
         self,
         payloads: List[CRMDealPayload],
     ) -> List[CRMSyncResult]:
-        results: List[CRMSyncResult] = []
-        for p in payloads:
-            results.append(await self.upsert_deal(p))
-        return results
+        return await self._run_bulk(
+            payloads,
+            self.upsert_deal,
+            crm_object_type="deal",
+            leadlane_id_of=lambda p: p.leadlane_demo_id or p.leadlane_account_id,
+        )
+
+    async def _run_bulk(
+        self,
+        payloads: Sequence[_P],
+        call: Callable[[_P], Awaitable[CRMSyncResult]],
+        *,
+        crm_object_type: str,
+        leadlane_id_of: Callable[[_P], Optional[str]],
+    ) -> List[CRMSyncResult]:
+        """
+        Führt call(payload) für alle Payloads mit max. bulk_concurrency
+        gleichzeitigen Requests aus. Ergebnisse in Reihenfolge der Payloads;
+        Exceptions werden zu CRMSyncResult(success=False).
+        """
+        semaphore = asyncio.Semaphore(self._bulk_concurrency)
+
+        async def _one(payload: _P) -> CRMSyncResult:
+            async with semaphore:
+                try:
+                    return await call(payload)
+                except Exception as exc:
+                    return CRMSyncResult(
+                        success=False,
+                        crm_system=self.system,
+                        crm_object_type=crm_object_type,
+                        crm_id=None,
+                        leadlane_id=leadlane_id_of(payload),
+                        errors=[
+                            CRMSyncError(
+                                code="bulk_item_failed",
+                                message=str(exc) or exc.__class__.__name__,
+                            )
+                        ],
+                    )
+
+        return list(await asyncio.gather(*(_one(p) for p in payloads)))
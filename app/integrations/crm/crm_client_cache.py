@@ -0,0 +1,90 @@
+# app/integrations/crm/crm_client_cache.py
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+from uuid import UUID
+
+from app.integrations.crm.crm_types import CRMSystem
+from app.integrations.mapping.crm_field_mappings_repository import mappings_version
+
+if TYPE_CHECKING:  # nur Annotation – crm_client importiert die Client-Module
+    from app.integrations.crm.crm_client import CRMClient
+
+
+class CRMClientCache:
+    """
+    Kurzlebiger In-Process-Cache für CRM-Clients pro (Tenant, CRM-System).
+
+    Ein Client hält Token-/Header-Cache, Mapping-Cache und Pacing-Zustand;
+    wird er pro Sync-Aufruf neu gebaut, geht das alles verloren (jeder Sync
+    fragt das Token erneut beim Store an). Mit dem Cache teilen sich
+    aufeinanderfolgende Syncs eines Tenants denselben Client.
+
+    - Einträge laufen nach ttl_seconds ab, LRU-begrenzt auf max_entries
+    - invalidate(tenant_id) bei Änderungen an der Verbindung
+      (CRMCredentialsStore.upsert_credentials / disable_credentials,
+      NOTIFY-Listener)
+    - Einträge aus einer älteren mappings_version() (Mapping-Änderung über
+      das Repository in diesem Prozess) werden neu gebaut
+
+    Der gecachte Client behält credentials_store/mapping_engine des ersten
+    Aufrufers – beide kapseln nur die prozessweite Database und die globalen
+    Caches, sind also austauschbar.
+
+    Eigenes Modul (statt crm_client_factory), damit der Credentials-Store
+    den Cache ohne Import-Zyklus invalidieren kann.
+
+    Der Cache ist pro Prozess; mehrere Worker halten jeweils ihren eigenen.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 1_000) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        # (tenant_id, crm_system) -> (expires_at, mappings_version, client),
+        # älteste Nutzung vorn
+        self._entries: OrderedDict[
+            Tuple[str, CRMSystem], Tuple[float, int, "CRMClient"]
+        ] = OrderedDict()
+
+    def get_or_create(
+        self,
+        tenant_id: UUID | str,
+        crm_system: CRMSystem,
+        create: Callable[[], "CRMClient"],
+    ) -> "CRMClient":
+        key = (str(tenant_id), crm_system)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        version = mappings_version()
+        if entry is not None and entry[0] > now and entry[1] == version:
+            self._entries.move_to_end(key)
+            return entry[2]
+
+        client = create()
+        self._entries[key] = (now + self._ttl, version, client)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return client
+
+    def invalidate(
+        self,
+        tenant_id: UUID | str,
+        crm_system: Optional[CRMSystem] = None,
+    ) -> None:
+        tenant_key = str(tenant_id)
+        for key in [
+            key
+            for key in self._entries
+            if key[0] == tenant_key and (crm_system is None or key[1] == crm_system)
+        ]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Globale Instanz, analog zu connected_systems_cache (Services werden pro Request gebaut)
+crm_client_cache = CRMClientCache()
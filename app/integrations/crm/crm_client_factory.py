@@ -2,13 +2,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Mapping
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional
 from uuid import UUID
 
 from app.integrations.crm.crm_client import CRMClient
+from app.integrations.crm.crm_client_cache import crm_client_cache
 from app.integrations.crm.crm_types import CRMSystem
 from app.integrations.credentials.crm_credentials_store import CRMCredentialsStore
 from app.integrations.crm.hubspot.hubspot_client import HubSpotClient
+from app.integrations.crm.hubspot.http import get_shared_client
 from app.integrations.mapping import CRMFieldMappingEngine
 
 
@@ -17,13 +20,20 @@ class CRMClientConfig:
     """Lightweight config object used by some CRM client factories.
 
     In this simplified setup we only really need tenant_id and a credentials mapping.
+    credentials_store/mapping_engine are set by create_crm_client for clients
+    that load their credentials themselves (HubSpot).
     """
     tenant_id: UUID
     credentials: Mapping[str, Any]
+    credentials_store: Optional[CRMCredentialsStore] = None
+    mapping_engine: Optional[CRMFieldMappingEngine] = None
 
 
 # Internal registry: CRMSystem -> factory(CRMClientConfig) -> CRMClient
-_CRM_REGISTRY: Dict[CRMSystem, Callable[[CRMClientConfig], CRMClient]] = {}
+# Wird beim Import von app.integrations.crm befüllt und danach per
+# freeze_registry() in ein read-only Mapping umgewandelt.
+_CRM_REGISTRY: Mapping[CRMSystem, Callable[[CRMClientConfig], CRMClient]] = {}
+_FROZEN = False
 
 
 def register_crm_client(system: CRMSystem, factory: Callable[[CRMClientConfig], CRMClient]) -> None:
@@ -32,12 +42,25 @@ def register_crm_client(system: CRMSystem, factory: Callable[[CRMClientConfig],
     They call register_crm_client(CRMSystem.X, factory). We keep a small
     registry so imports succeed, even if we don't actively use all systems.
     """
-    _CRM_REGISTRY[system] = factory
+    if _FROZEN:
+        raise RuntimeError(
+            f"CRM client registry is frozen; cannot register {system!r} after startup."
+        )
+    _CRM_REGISTRY[system] = factory  # type: ignore[index]
+
+
+def freeze_registry() -> None:
+    """Make the registry read-only (called once at the end of app.integrations.crm)."""
+    global _CRM_REGISTRY, _FROZEN
+    if _FROZEN:
+        return
+    _CRM_REGISTRY = MappingProxyType(dict(_CRM_REGISTRY))
+    _FROZEN = True
 
 
-def get_registered_systems() -> Dict[CRMSystem, Callable[[CRMClientConfig], CRMClient]]:
-    """Return a copy of the internal registry (mainly for debugging)."""
-    return dict(_CRM_REGISTRY)
+def get_registered_systems() -> Mapping[CRMSystem, Callable[[CRMClientConfig], CRMClient]]:
+    """Return the registry (read-only once frozen; mainly for debugging)."""
+    return _CRM_REGISTRY if _FROZEN else MappingProxyType(dict(_CRM_REGISTRY))
 
 
 def create_crm_client(
@@ -49,21 +72,50 @@ def create_crm_client(
 ) -> CRMClient:
     """Return a CRM-specific client for the given tenant.
 
-    For now we only actively implement HubSpot here. Other systems may still
-    register factories via `register_crm_client`, but they are optional.
+    All systems (including HubSpot) are resolved via the registry.
     """
-    if crm_system == CRMSystem.HUBSPOT:
-        return HubSpotClient(
+    factory = _CRM_REGISTRY.get(crm_system)
+    if factory is None:
+        raise NotImplementedError(f"CRM client for system '{crm_system}' is not implemented yet.")
+
+    # Salesforce/SAP: credentials_store is not integrated yet (empty credentials)
+    config = CRMClientConfig(
+        tenant_id=tenant_id,
+        credentials={},
+        credentials_store=credentials_store,
+        mapping_engine=mapping_engine,
+    )
+    return factory(config)
+
+
+def _hubspot_factory(config: CRMClientConfig) -> CRMClient:
+    assert config.credentials_store is not None and config.mapping_engine is not None
+    return HubSpotClient(  # type: ignore[return-value]
+        tenant_id=config.tenant_id,
+        credentials_store=config.credentials_store,
+        mapping_engine=config.mapping_engine,
+        http_client=get_shared_client(),
+    )
+
+
+register_crm_client(CRMSystem.HUBSPOT, _hubspot_factory)
+
+
+def get_crm_client(
+    *,
+    crm_system: CRMSystem,
+    tenant_id: UUID,
+    credentials_store: CRMCredentialsStore,
+    mapping_engine: CRMFieldMappingEngine,
+) -> CRMClient:
+    """Like create_crm_client, but reuses a cached client for (tenant, system)."""
+    return crm_client_cache.get_or_create(
+        tenant_id,
+        crm_system,
+        lambda: create_crm_client(
+            crm_system=crm_system,
             tenant_id=tenant_id,
             credentials_store=credentials_store,
             mapping_engine=mapping_engine,
-        )
-
-    # If a factory for the given system was registered, try to use it
-    factory = _CRM_REGISTRY.get(crm_system)
-    if factory is not None:
-        # Minimal config: we don't yet integrate credentials_store for these systems
-        config = CRMClientConfig(tenant_id=tenant_id, credentials={})
-        return factory(config)
-
-    raise NotImplementedError(f"CRM client for system '{crm_system}' is not implemented yet.")
+        ),
+    )
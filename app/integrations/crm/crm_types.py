@@ -1,20 +1,81 @@
 # app/integrations/crm/crm_types.py
 from __future__ import annotations
 
+from dataclasses import dataclass, field, fields
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Type
 
 from pydantic import BaseModel, Field
 
 
+def _known_fields(cls: Type[Any], data: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Filtert data auf die Felder der Dataclass (unbekannte Keys werden wie
+    bei Pydantic ignoriert).
+    """
+    names = {f.name for f in fields(cls)}
+    return {k: v for k, v in data.items() if k in names}
+
+
+def _opt_int(value: Any) -> Optional[int]:
+    return None if value is None or value == "" else int(value)
+
+
+def _opt_float(value: Any) -> Optional[float]:
+    return None if value is None or value == "" else float(value)
+
+
+# Gemeinsamer, unveränderlicher Default für payload.properties – die meisten
+# Payloads haben keine Custom-Properties, daher kein leeres dict pro Objekt.
+_EMPTY_PROPS: Mapping[str, Any] = MappingProxyType({})
+
+
+def _empty_properties() -> Mapping[str, Any]:
+    return _EMPTY_PROPS
+
+
+class _PropertiesMixin:
+    """
+    Copy-on-write für properties: erst beim ersten Schreiben wird ein
+    eigenes dict angelegt.
+    """
+
+    __slots__ = ()
+
+    properties: Mapping[str, Any]
+
+    def set_property(self, key: str, value: Any) -> None:
+        if self.properties is _EMPTY_PROPS:
+            self.properties = {}
+        self.properties[key] = value  # type: ignore[index]
+
+
 class CRMSystem(str, Enum):
     HUBSPOT = "hubspot"
     SALESFORCE = "salesforce"
     PIPEDRIVE = "pipedrive"
     SAP_B1 = "sap_b1"
 
-
-class CRMCompanyPayload(BaseModel):
+    @classmethod
+    def parse(cls, value: Any) -> "CRMSystem":
+        """
+        Wie CRMSystem(value), aber mit direktem Lookup in _value2member_map_
+        (ohne Enum.__call__). Unbekannte Werte → gleicher ValueError wie bisher.
+        """
+        try:
+            return cls._value2member_map_[value]  # type: ignore[return-value]
+        except (KeyError, TypeError):
+            return cls(value)
+
+
+# ---------------------------------------------------------------------------
+# Payloads (intern, pro Sync-Objekt erzeugt → slots-Dataclasses ohne
+# Pydantic-Validierung; from_dict für Daten aus externen Quellen)
+# ---------------------------------------------------------------------------
+
+@dataclass(slots=True, kw_only=True)
+class CRMCompanyPayload(_PropertiesMixin):
     """
     Company-/Account-Payload auf Basis eurer LeadLane-Feldnamen.
     """
@@ -54,10 +115,21 @@ class CRMCompanyPayload(BaseModel):
     account_summary_gpt: Optional[str] = None
     company_description_leadlane: Optional[str] = None
 
-    properties: Dict[str, Any] = Field(default_factory=dict)
+    properties: Mapping[str, Any] = field(default_factory=_empty_properties)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "CRMCompanyPayload":
+        values = _known_fields(cls, data)
+        for key in ("employees_total", "year_founded"):
+            if key in values:
+                values[key] = _opt_int(values[key])
+        if "sales_eur" in values:
+            values["sales_eur"] = _opt_float(values["sales_eur"])
+        return cls(**values)
 
 
-class CRMContactPayload(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class CRMContactPayload(_PropertiesMixin):
     """
     Contact-Payload auf Basis eurer LeadLane-Feldnamen.
     """
@@ -91,7 +163,11 @@ class CRMContactPayload(BaseModel):
     assignment_reason_chatgpt: Optional[str] = None
     notes: Optional[str] = None
 
-    properties: Dict[str, Any] = Field(default_factory=dict)
+    properties: Mapping[str, Any] = field(default_factory=_empty_properties)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "CRMContactPayload":
+        return cls(**_known_fields(cls, data))
 
 
 class CRMDealStage(BaseModel):
@@ -100,7 +176,8 @@ class CRMDealStage(BaseModel):
     probability: Optional[float] = None
 
 
-class CRMDealPayload(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class CRMDealPayload(_PropertiesMixin):
     leadlane_demo_id: Optional[str] = None
     leadlane_account_id: Optional[str] = None
     leadlane_contact_id: Optional[str] = None
@@ -122,7 +199,11 @@ class CRMDealPayload(BaseModel):
     pipeline_id: Optional[str] = None
     stage_id: Optional[str] = None
 
-    properties: Dict[str, Any] = Field(default_factory=dict)
+    properties: Mapping[str, Any] = field(default_factory=_empty_properties)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "CRMDealPayload":
+        return cls(**_known_fields(cls, data))
 
 
 class CRMActivityType(str, Enum):
@@ -133,9 +214,12 @@ class CRMActivityType(str, Enum):
     NOTE = "note"
 
 
-class CRMActivityPayload(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class CRMActivityPayload(_PropertiesMixin):
     activity_type: CRMActivityType
 
+    # eigene ID der Aktivität (Schlüssel für Activity-Links im CRMSyncService)
+    leadlane_activity_id: Optional[str] = None
     leadlane_sub_company_id: Optional[str] = None
     leadlane_contact_id: Optional[str] = None
     leadlane_demo_id: Optional[str] = None
@@ -147,7 +231,13 @@ class CRMActivityPayload(BaseModel):
     direction: Optional[str] = None
     status: Optional[str] = None
 
-    properties: Dict[str, Any] = Field(default_factory=dict)
+    properties: Mapping[str, Any] = field(default_factory=_empty_properties)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "CRMActivityPayload":
+        values = _known_fields(cls, data)
+        values["activity_type"] = CRMActivityType(values["activity_type"])
+        return cls(**values)
 
 
 class CRMSyncError(BaseModel):
@@ -0,0 +1,47 @@
+# app/integrations/crm/hubspot/http.py
+from __future__ import annotations
+
+from typing import Optional
+
+import httpx
+
+try:  # h2 kommt über httpx[http2] (requirements); ohne h2 Fallback auf HTTP/1.1
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - abhängig von der Umgebung
+    _HTTP2_AVAILABLE = False
+
+
+# Prozessweiter Client für alle HubSpot-API-Calls (alle Tenants teilen sich
+# den Connection-Pool zu api.hubapi.com → keine TLS-Handshakes pro Request).
+# Mit HTTP/2 laufen parallele Requests gemultiplext über eine TLS-Verbindung.
+_SHARED: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """
+    Liefert den gemeinsamen httpx.AsyncClient (lazy erzeugt).
+    """
+    global _SHARED
+    if _SHARED is None or _SHARED.is_closed:
+        _SHARED = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=100,
+                max_connections=200,
+                keepalive_expiry=60,
+            ),
+        )
+    return _SHARED
+
+
+async def close_shared_client() -> None:
+    """
+    Schließt den gemeinsamen Client (App-Shutdown).
+    """
+    global _SHARED
+    if _SHARED is not None:
+        await _SHARED.aclose()
+        _SHARED = None
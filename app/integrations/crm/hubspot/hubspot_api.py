@@ -1,11 +1,47 @@
 # app/integrations/crm/hubspot/hubspot_api.py
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, Mapping
+import asyncio
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Mapping, Sequence
 
 import httpx
 
 from .hubspot_auth import HubSpotCredentials, HubSpotAuthError
+from ..json_codec import decode_body, dumps
+from ..rate_limit import TokenBucket, retry_after_seconds
+from .http import get_shared_client
+
+# Max. Objekte pro Request für die /batch/*-Endpunkte der CRM-v3-API
+HUBSPOT_BATCH_LIMIT = 100
+
+
+def chunked(items: Iterable[Any], size: int = HUBSPOT_BATCH_LIMIT) -> Iterator[List[Any]]:
+    """
+    Zerlegt items in Listen mit max. size Elementen.
+    """
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _as_dict(properties: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Properties unverändert durchreichen, wenn sie schon ein dict sind
+    (werden nur noch von httpx serialisiert) – sonst einmal kopieren.
+    """
+    return properties if isinstance(properties, dict) else dict(properties)
+
+
+# get_deal: nur die benötigten Properties (kommagetrennt, wie in der API-Doku)
+# und keine archivierten Objekte → kleinere Antworten beim Status-Polling.
+_GET_DEAL_PARAMS: Mapping[str, str] = {
+    "properties": "dealname,amount,pipeline,dealstage",
+    "archived": "false",
+}
 
 
 class HubSpotAPIError(RuntimeError):
@@ -38,14 +74,28 @@ class HubSpotAPI:
         base_url: str = "https://api.hubapi.com",
         timeout: float = 10.0,
         client: Optional[httpx.AsyncClient] = None,
+        *,
+        concurrency: int = 10,
+        rate_per_second: float = 10.0,
+        burst: float = 10.0,
     ) -> None:
         self._credentials = credentials
         self._base_url = base_url.rstrip("/")
         self._timeout = timeout
-        self._owns_client = client is None
-        self._client: httpx.AsyncClient = client or httpx.AsyncClient(
-            timeout=self._timeout,
-        )
+
+        # Selbst-Drosselung unter HubSpots Limit (100 Requests / 10 s):
+        # max. concurrency parallele Requests + Token-Bucket für die Rate.
+        self._sem = asyncio.Semaphore(concurrency)
+        self._bucket = TokenBucket(rate=rate_per_second, capacity=burst)
+        # Standard: prozessweiter Client (siehe hubspot/http.py) – gehört
+        # nicht dieser Instanz und wird daher in close() nicht geschlossen.
+        self._owns_client = False
+        self._client: httpx.AsyncClient = client or get_shared_client()
+
+        # Objekt-URLs einmal vorberechnen (pro Call nur noch "/{id}" anhängen)
+        self._companies_url = f"{self._base_url}/crm/v3/objects/companies"
+        self._contacts_url = f"{self._base_url}/crm/v3/objects/contacts"
+        self._deals_url = f"{self._base_url}/crm/v3/objects/deals"
 
     async def close(self) -> None:
         if self._owns_client:
@@ -58,15 +108,16 @@ class HubSpotAPI:
     async def _request(
         self,
         method: str,
-        path: str,
+        path: str = "",
         *,
+        url: Optional[str] = None,
         params: Optional[Mapping[str, Any]] = None,
         json: Optional[Any] = None,
     ) -> Any:
         """
         Interner Helper für HTTP-Requests gegen HubSpot.
 
-        - Fügt Base-URL hinzu
+        - Fügt Base-URL hinzu (oder nutzt eine fertige url)
         - Setzt Auth-Header über HubSpotCredentials
         - Hebt Fehler in eine eigene Exception hoch
         """
@@ -75,42 +126,51 @@ class HubSpotAPI:
             # Für jetzt: konservativ Fehler werfen.
             raise HubSpotAuthError("HubSpot Access Token ist abgelaufen.")
 
-        url = f"{self._base_url}/{path.lstrip('/')}"
-        headers = self._credentials.build_headers()
+        if url is None:
+            url = f"{self._base_url}/{path.lstrip('/')}"
 
-        try:
-            response = await self._client.request(
-                method=method,
-                url=url,
-                headers=headers,
-                params=params,
-                json=json,
+        # Body selbst serialisieren (orjson, falls installiert) statt json=...
+        content: Optional[bytes] = None
+        if json is not None:
+            content = dumps(json)
+            headers = self._credentials.build_headers(
+                extra={"Content-Type": "application/json"}
             )
-        except httpx.HTTPError as exc:
-            raise HubSpotAPIError(
-                f"HTTP-Fehler bei Request an HubSpot: {exc!r}"
-            ) from exc
+        else:
+            headers = self._credentials.build_headers()
 
-        if response.status_code >= 400:
+        async with self._sem:
+            await self._bucket.acquire()
             try:
-                body = response.json()
-            except ValueError:
-                body = response.text
+                response = await self._client.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    content=content,
+                    timeout=self._timeout,
+                )
+            except httpx.HTTPError as exc:
+                raise HubSpotAPIError(
+                    f"HTTP-Fehler bei Request an HubSpot: {exc!r}"
+                ) from exc
+
+            if response.status_code == 429:
+                # Retry-After respektieren, bevor der Fehler hochgeht – so
+                # warten auch die nachfolgenden Requests (Bucket pausiert).
+                retry_after = retry_after_seconds(response)
+                self._bucket.pause(retry_after)
+                await asyncio.sleep(retry_after)
 
+        if response.status_code >= 400:
             raise HubSpotAPIError(
                 message=f"HubSpot antwortet mit Status {response.status_code}",
                 status_code=response.status_code,
-                response_body=body,
+                response_body=decode_body(response),
             )
 
         # Erfolgreicher Fall
-        if response.content:
-            try:
-                return response.json()
-            except ValueError:
-                return response.text
-
-        return None
+        return decode_body(response)
 
     # ----------------------------------------------------------
     # High-Level Convenience-Methoden
@@ -129,14 +189,13 @@ class HubSpotAPI:
           POST /crm/v3/objects/companies
           PATCH /crm/v3/objects/companies/{companyId}
         """
-        payload = {"properties": dict(properties)}
+        payload = {"properties": _as_dict(properties)}
 
         if hubspot_company_id:
-            path = f"/crm/v3/objects/companies/{hubspot_company_id}"
-            return await self._request("PATCH", path, json=payload)
+            url = f"{self._companies_url}/{hubspot_company_id}"
+            return await self._request("PATCH", url=url, json=payload)
 
-        path = "/crm/v3/objects/companies"
-        return await self._request("POST", path, json=payload)
+        return await self._request("POST", url=self._companies_url, json=payload)
 
     async def upsert_contact(
         self,
@@ -148,14 +207,13 @@ class HubSpotAPI:
 
         In der Realität muss man hier evtl. deduplizieren (email, etc.).
         """
-        payload = {"properties": dict(properties)}
+        payload = {"properties": _as_dict(properties)}
 
         if hubspot_contact_id:
-            path = f"/crm/v3/objects/contacts/{hubspot_contact_id}"
-            return await self._request("PATCH", path, json=payload)
+            url = f"{self._contacts_url}/{hubspot_contact_id}"
+            return await self._request("PATCH", url=url, json=payload)
 
-        path = "/crm/v3/objects/contacts"
-        return await self._request("POST", path, json=payload)
+        return await self._request("POST", url=self._contacts_url, json=payload)
 
     async def upsert_deal(
         self,
@@ -168,24 +226,79 @@ class HubSpotAPI:
 
         associations kann z.B. companies/contacts enthalten.
         """
-        payload: Dict[str, Any] = {"properties": dict(properties)}
+        payload: Dict[str, Any] = {"properties": _as_dict(properties)}
         if associations:
             payload["associations"] = associations
 
         if hubspot_deal_id:
-            path = f"/crm/v3/objects/deals/{hubspot_deal_id}"
-            return await self._request("PATCH", path, json=payload)
+            url = f"{self._deals_url}/{hubspot_deal_id}"
+            return await self._request("PATCH", url=url, json=payload)
 
-        path = "/crm/v3/objects/deals"
-        return await self._request("POST", path, json=payload)
+        return await self._request("POST", url=self._deals_url, json=payload)
 
     async def get_deal(self, hubspot_deal_id: str) -> Any:
         """
         Holt einen Deal aus HubSpot.
         """
-        path = f"/crm/v3/objects/deals/{hubspot_deal_id}"
-        params = {"properties": ["dealname", "amount", "pipeline", "dealstage"]}
-        return await self._request("GET", path, params=params)
+        url = f"{self._deals_url}/{hubspot_deal_id}"
+        return await self._request("GET", url=url, params=_GET_DEAL_PARAMS)
+
+    # ----------------------------------------------------------
+    # Batch-Upserts (/crm/v3/objects/{type}/batch/upsert)
+    # ----------------------------------------------------------
+
+    async def batch_upsert(
+        self,
+        object_type: str,
+        inputs: Sequence[Mapping[str, Any]],
+        id_property: str,
+    ) -> List[Dict[str, Any]]:
+        """
+        Upsert vieler Objekte über die Batch-API (max. 100 pro Request).
+
+        inputs: [{"id": <Wert von id_property>, "properties": {...}}, ...]
+        Liefert die gesammelten "results" aller Chunks.
+        """
+        path = f"/crm/v3/objects/{object_type}/batch/upsert"
+        results: List[Dict[str, Any]] = []
+
+        for chunk in chunked(inputs):
+            body = {
+                "inputs": [
+                    {
+                        "idProperty": id_property,
+                        "id": item["id"],
+                        "properties": _as_dict(item["properties"]),
+                    }
+                    for item in chunk
+                ]
+            }
+            data = await self._request("POST", path, json=body)
+            if isinstance(data, dict):
+                results.extend(data.get("results") or [])
+
+        return results
+
+    async def batch_upsert_companies(
+        self,
+        inputs: Sequence[Mapping[str, Any]],
+        id_property: str = "leadlane_sub_company_id",
+    ) -> List[Dict[str, Any]]:
+        return await self.batch_upsert("companies", inputs, id_property)
+
+    async def batch_upsert_contacts(
+        self,
+        inputs: Sequence[Mapping[str, Any]],
+        id_property: str = "leadlane_contact_id",
+    ) -> List[Dict[str, Any]]:
+        return await self.batch_upsert("contacts", inputs, id_property)
+
+    async def batch_upsert_deals(
+        self,
+        inputs: Sequence[Mapping[str, Any]],
+        id_property: str = "leadlane_demo_id",
+    ) -> List[Dict[str, Any]]:
+        return await self.batch_upsert("deals", inputs, id_property)
 
     # Weitere Methoden (Activities, Engagements, Calls, Meetings, ...) können
     # später hier ergänzt werden.
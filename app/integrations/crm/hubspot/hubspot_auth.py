@@ -1,27 +1,19 @@
 # app/integrations/crm/hubspot/hubspot_auth.py
 from __future__ import annotations
 
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Optional
-from urllib.parse import urlencode
-
-import httpx
-
-from app.config import settings
-from app.integrations.credentials.crm_credentials_store import CRMConnectionInfo
-from app.integrations.crm.crm_types import CRMSystem
-
-from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
-from typing import Optional
-from urllib.parse import urlencode
+from types import MappingProxyType
+from typing import Mapping, Optional
+from urllib.parse import quote_plus, urlencode
 
 import httpx
 
 from app.config import settings
 from app.integrations.credentials.crm_credentials_store import CRMConnectionInfo
 from app.integrations.crm.crm_types import CRMSystem
+from app.integrations.crm.json_codec import ACCEPT_ENCODING
 
 
 HUBSPOT_OAUTH_AUTHORIZE_URL = "https://app.hubspot.com/oauth/authorize"
@@ -61,13 +53,52 @@ class HubSpotCredentials:
     """
     connection_info: CRMConnectionInfo
 
+    # Header-Cache: wird nur neu gebaut, wenn sich das Access-Token ändert
+    _cached_headers: Optional[Mapping[str, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _cached_token: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # Ablauf als time.monotonic()-Deadline, einmal pro connection_info berechnet
+    # (CRMConnectionInfo ist frozen → Refresh = neue Instanz = neu berechnen).
+    _expiry_deadline: float = field(
+        default=float("inf"), init=False, repr=False, compare=False
+    )
+    _expiry_source: Optional[CRMConnectionInfo] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def is_expired(self, skew_seconds: int = 60) -> bool:
-        # delegate to CRMConnectionInfo
-        return self.connection_info.is_expired(skew_seconds=skew_seconds)
+        if self._expiry_source is not self.connection_info:
+            self._expiry_deadline = self._compute_expiry_deadline()
+            self._expiry_source = self.connection_info
+        return time.monotonic() + skew_seconds >= self._expiry_deadline
+
+    def _compute_expiry_deadline(self) -> float:
+        expires_at = self.connection_info.expires_at
+        if expires_at is None:
+            return float("inf")
+        remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+        return time.monotonic() + remaining
+
+    def build_headers(self, extra: Optional[dict] = None) -> Mapping[str, str]:
+        """
+        Ohne extra: gecachte, schreibgeschützte Header (kein dict pro Request).
+        Mit extra: neue Kopie inkl. extra.
+        """
+        token = self.connection_info.access_token
+        if self._cached_headers is None or self._cached_token != token:
+            # use the shared header builder in this module
+            self._cached_headers = MappingProxyType(
+                HubSpotOAuthClient.build_headers(self.connection_info)
+            )
+            self._cached_token = token
 
-    def build_headers(self, extra: Optional[dict] = None) -> dict:
-        # use the shared header builder in this module
-        return HubSpotOAuthClient.build_headers(self.connection_info, extra=extra)
+        if extra:
+            return {**self._cached_headers, **extra}
+        return self._cached_headers
 
 
 class HubSpotOAuthClient:
@@ -77,23 +108,47 @@ class HubSpotOAuthClient:
     - Code -> Token
     - Refresh Token
     - Konvertierung der Token-Response in CRMConnectionInfo
+
+    Token-Calls laufen über einen langlebigen httpx.AsyncClient, damit die
+    TLS-Verbindung zu api.hubapi.com zwischen Refreshes wiederverwendet wird.
+    Der Client wird lazy erzeugt und beim Shutdown via close() geschlossen.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, client: Optional[httpx.AsyncClient] = None) -> None:
         self.client_id = settings.hubspot_client_id
         self.client_secret = settings.hubspot_client_secret
         self.redirect_uri = settings.hubspot_redirect_uri
         self.default_scopes = settings.hubspot_scopes
 
+        self._owns_client = client is None
+        self._client: Optional[httpx.AsyncClient] = client
+
+        # Alles außer state ist konstant → Query-String einmal vorberechnen
+        self._auth_url_prefix = f"{HUBSPOT_OAUTH_AUTHORIZE_URL}?" + urlencode(
+            {
+                "client_id": self.client_id,
+                "redirect_uri": self.redirect_uri,
+                "scope": self.default_scopes,
+                "response_type": "code",
+            }
+        )
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     def build_authorization_url(self, state: str) -> str:
-        params = {
-            "client_id": self.client_id,
-            "redirect_uri": self.redirect_uri,
-            "scope": self.default_scopes,
-            "response_type": "code",
-            "state": state,
-        }
-        return f"{HUBSPOT_OAUTH_AUTHORIZE_URL}?{urlencode(params)}"
+        # quote_plus = gleiche Kodierung wie urlencode
+        return f"{self._auth_url_prefix}&state={quote_plus(state, safe='')}"
 
     async def exchange_code_for_tokens(self, code: str) -> HubSpotTokenResponse:
         data = {
@@ -104,8 +159,7 @@ class HubSpotOAuthClient:
             "code": code,
         }
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(HUBSPOT_OAUTH_TOKEN_URL, data=data)
+        resp = await self._get_client().post(HUBSPOT_OAUTH_TOKEN_URL, data=data)
 
         resp.raise_for_status()
         payload = resp.json()
@@ -126,8 +180,7 @@ class HubSpotOAuthClient:
             "refresh_token": refresh_token,
         }
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(HUBSPOT_OAUTH_TOKEN_URL, data=data)
+        resp = await self._get_client().post(HUBSPOT_OAUTH_TOKEN_URL, data=data)
 
         resp.raise_for_status()
         payload = resp.json()
@@ -154,7 +207,7 @@ class HubSpotOAuthClient:
 
         return CRMConnectionInfo(
             tenant_id=tenant_id,
-            crm_system=crm_system if isinstance(crm_system, CRMSystem) else CRMSystem(crm_system),
+            crm_system=CRMSystem.parse(crm_system),
             access_token=token.access_token,
             refresh_token=token.refresh_token,
             expires_at=expires_at,
@@ -175,6 +228,7 @@ class HubSpotOAuthClient:
         headers = {
             "User-Agent": "LeadLane-CRM-Integration/1.0",
             "Accept": "application/json",
+            "Accept-Encoding": ACCEPT_ENCODING,
             "Authorization": f"Bearer {info.access_token}",
         }
 
@@ -1,7 +1,11 @@
 # app/integrations/crm/hubspot/hubspot_client.py
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import asyncio
+import time
+from dataclasses import fields
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
 import httpx
@@ -21,9 +25,37 @@ from app.integrations.crm.crm_types import (
     CRMSyncError,
 )
 from app.integrations.crm.hubspot.hubspot_refresh import refresh_hubspot_connection
+from app.integrations.crm.hubspot.http import get_shared_client
+from app.integrations.crm.json_codec import ACCEPT_ENCODING, JSON_CONTENT_TYPE, dumps, loads
+from app.integrations.crm.rate_limit import bucket_for, retry_after_seconds
+from app.integrations.crm.hubspot.hubspot_api import chunked
 from app.integrations.mapping import CRMFieldMappingEngine
+from app.integrations.mapping.crm_field_mapping_engine import EffectiveFieldMapping
 
 
+# Puffer vor Token-Ablauf, ab dem neu aus dem Store geholt wird
+_TOKEN_SKEW_SECONDS = 60
+
+# Versuche pro Request bei 429 (inkl. des ersten)
+_MAX_ATTEMPTS = 3
+
+# max. Einträge im Mapping-Cache pro Client
+_MAP_CACHE_SIZE = 1024
+
+# HTTP-Status → (Fehlercode, Message-Template) für _handle_http_error
+_HS_AUTH_ERROR = (
+    "hubspot_auth_error",
+    "HubSpot {obj} request failed due to invalid or missing credentials.",
+)
+_HS_ERRORS: Dict[int, Tuple[str, str]] = {
+    401: _HS_AUTH_ERROR,
+    403: _HS_AUTH_ERROR,
+    404: ("hubspot_not_found", "HubSpot {obj} not found."),
+    429: ("hubspot_rate_limited", "HubSpot rate limit exceeded for {obj}."),
+}
+_HS_VALIDATION_ERROR = ("hubspot_validation_error", "HubSpot rejected the {obj} payload.")
+_HS_SERVER_ERROR = ("hubspot_server_error", "HubSpot {obj} request failed with server error.")
+
 
 class HubSpotClientError(RuntimeError):
     pass
@@ -33,44 +65,131 @@ class HubSpotClient:
     """
     HubSpot-Client pro Tenant.
 
-    - Holt bei jedem Request via CRMCredentialsStore.get_active_credentials(...)
-      ein (ggf. refreshed) Access-Token.
+    - Holt das Access-Token via CRMCredentialsStore.get_active_credentials(...)
+      und cached es samt Headern im Prozess, bis es (mit Puffer) abläuft.
+    - Bei 401 wird der Cache verworfen, einmal refreshed und der Request
+      genau einmal wiederholt.
+    - Requests werden pro Tenant über einen Token-Bucket gepaced; 429 wird
+      mit Retry-After/Backoff bis zu _MAX_ATTEMPTS-mal wiederholt.
     - Bietet High-Level-Methoden, die direkt CRMSyncResult liefern.
     """
 
+    # crm_object_type → HubSpot-Objektname in /crm/v3/objects/{...}
+    _UPSERT_PATHS = {"company": "companies", "contact": "contacts", "deal": "deals"}
+
     def __init__(
         self,
         tenant_id: UUID,
         credentials_store: CRMCredentialsStore,
         mapping_engine: CRMFieldMappingEngine,
         base_url: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        *,
+        concurrency: int = 16,
+        include_raw_response: bool = False,
+        rate_per_second: float = 10.0,
+        burst: float = 10.0,
     ) -> None:
         self._tenant_id = tenant_id
         self._credentials_store = credentials_store
         self._mapping_engine = mapping_engine
         self.base_url = (base_url or settings.hubspot_base_url)
-  
+        self._base = self.base_url.rstrip("/")
+        # Pfad-Präfixe je Objekttyp einmal bauen (Upsert hängt nur "/{id}" an)
+        self._obj_prefix = {
+            object_type: f"/crm/v3/objects/{name}"
+            for object_type, name in self._UPSERT_PATHS.items()
+        }
+        # prozessweiter Connection-Pool (hubspot/http.py), nicht pro Request;
+        # ein injizierter Client (z.B. mit httpx.MockTransport) gehört dem Aufrufer.
+        self._http = http_client or get_shared_client()
+        # HubSpot-Antworten nur auf Wunsch in CRMSyncResult.raw_response halten –
+        # bei großen Syncs sonst O(Summe aller Response-Größen) im Speicher.
+        # Fehler-Bodies stehen unabhängig davon in CRMSyncError.details.
+        self._include_raw = include_raw_response
+        # Mapping-Ergebnisse für wertgleiche Payloads (Retries/Resyncs innerhalb
+        # der Lebensdauer dieses Clients), FIFO-begrenzt auf _MAP_CACHE_SIZE;
+        # pro Eintrag das EffectiveFieldMapping, aus dem er entstanden ist
+        self._map_cache: Dict[Tuple[Any, ...], Tuple[EffectiveFieldMapping, Dict[str, Any]]] = {}
+        # max. parallele HTTP-Calls dieses Tenants (Fan-out via upsert_many)
+        self._sem = asyncio.Semaphore(concurrency)
+        # Pacing unter HubSpots Limit (100 Requests / 10 s), geteilt pro Tenant
+        self._bucket = bucket_for(
+            (tenant_id, CRMSystem.HUBSPOT), rate=rate_per_second, capacity=burst
+        )
+
+        # Token-/Header-Cache (spart den Store-Lookup pro HubSpot-Call)
+        self._cached_info: Optional[CRMConnectionInfo] = None
+        self._cached_headers: Optional[Dict[str, str]] = None
+        # gleiche Header + Content-Type für Requests mit Body
+        self._cached_json_headers: Optional[Dict[str, str]] = None
+        # time.monotonic()-Deadline (inkl. Puffer) für _cached_info
+        self._token_deadline = 0.0
+
+    async def close(self) -> None:
+        """
+        No-op: der Client ist entweder geteilt (Shutdown via
+        close_shared_client im Lifespan) oder gehört dem Aufrufer.
+        """
+        return None
+
     # ------------------------------------------------------------------
     # Intern: Credentials + Header
     # ------------------------------------------------------------------
 
-    async def _get_connection(self) -> CRMConnectionInfo:
-        return await self._credentials_store.get_active_credentials(
+    async def _get_connection(self, *, force_refresh: bool = False) -> CRMConnectionInfo:
+        info = self._cached_info
+        if not force_refresh and info is not None and time.monotonic() < self._token_deadline:
+            return info
+
+        info = await self._credentials_store.get_active_credentials(
             tenant_id=self._tenant_id,
             crm_system=CRMSystem.HUBSPOT,
             refresh_fn=refresh_hubspot_connection,
         )
 
-    async def _build_headers(self) -> Dict[str, str]:
-        info = await self._get_connection()
-        if not info.access_token:
-            raise HubSpotClientError("No HubSpot access token available.")
+        if force_refresh and info.access_token == getattr(self._cached_info, "access_token", None):
+            # Store hält das Token noch für gültig, HubSpot nicht (401) → explizit refreshen
+            info = await refresh_hubspot_connection(info)
+            await self._credentials_store.upsert_credentials(info)
 
-        return {
-            "User-Agent": "LeadLane-CRM-Integration/1.0",
-            "Accept": "application/json",
-            "Authorization": f"Bearer {info.access_token}",
-        }
+        self._cached_info = info
+        self._token_deadline = _monotonic_deadline(info)
+        self._invalidate_token()
+        return info
+
+    def _invalidate_token(self) -> None:
+        self._cached_headers = None
+        self._cached_json_headers = None
+
+    async def _build_headers(
+        self,
+        *,
+        force_refresh: bool = False,
+        with_body: bool = False,
+    ) -> Dict[str, str]:
+        """
+        Liefert die gecachten Header-Dicts per Referenz (nicht verändern!);
+        neu gebaut wird nur bei Token-Wechsel.
+        """
+        if (
+            force_refresh
+            or self._cached_headers is None
+            or time.monotonic() >= self._token_deadline
+        ):
+            info = await self._get_connection(force_refresh=force_refresh)
+            if not info.access_token:
+                raise HubSpotClientError("No HubSpot access token available.")
+
+            self._cached_headers = {
+                "User-Agent": "LeadLane-CRM-Integration/1.0",
+                "Accept": "application/json",
+                "Accept-Encoding": ACCEPT_ENCODING,
+                "Authorization": f"Bearer {info.access_token}",
+            }
+            self._cached_json_headers = {**self._cached_headers, **JSON_CONTENT_TYPE}
+
+        return self._cached_json_headers if with_body else self._cached_headers
 
     # ------------------------------------------------------------------
     # Generischer Request
@@ -85,18 +204,58 @@ class HubSpotClient:
         json_body: Optional[Any] = None,
         timeout: float = 10.0,
     ) -> httpx.Response:
-        url = f"{self.base_url.rstrip('/')}/{path.lstrip('/')}"
-        headers = await self._build_headers()
+        url = self._base + path if path.startswith("/") else f"{self._base}/{path}"
+        method = method.upper()
+        async with self._sem:
+            return await self._send(method, url, params=params, json_body=json_body, timeout=timeout)
 
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            resp = await client.request(
-                method=method.upper(),
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]],
+        json_body: Optional[Any],
+        timeout: float,
+    ) -> httpx.Response:
+        """
+        Ein Request inkl. Pacing (Token-Bucket pro Tenant), 429-Retry mit
+        Retry-After/Backoff (max. _MAX_ATTEMPTS Versuche) und einmaligem
+        Token-Refresh bei 401.
+        """
+        # Body einmal selbst serialisieren (msgspec/orjson, falls installiert)
+        content = dumps(json_body) if json_body is not None else None
+
+        refreshed = False
+        attempt = 0
+        while True:
+            attempt += 1
+            headers = await self._build_headers(with_body=content is not None)
+            await self._bucket.acquire()
+            resp = await self._http.request(
+                method=method,
                 url=url,
                 headers=headers,
                 params=params,
-                json=json_body,
+                content=content,
+                timeout=timeout,
             )
-        return resp
+
+            if resp.status_code == 401 and not refreshed:
+                # Token vom Server abgelehnt (z.B. widerrufen) → einmal refreshen + wiederholen
+                refreshed = True
+                self._invalidate_token()
+                await self._build_headers(force_refresh=True)
+                continue
+
+            if resp.status_code == 429 and attempt < _MAX_ATTEMPTS:
+                # Bucket pausieren, damit auch parallele Requests warten
+                delay = max(retry_after_seconds(resp, default=1.0), 2 ** (attempt - 1))
+                self._bucket.pause(delay)
+                await asyncio.sleep(delay)
+                continue
+
+            return resp
 
     async def _post_json(
         self,
@@ -107,7 +266,7 @@ class HubSpotClient:
     ) -> Dict[str, Any]:
         resp = await self._request("POST", path, json_body=json_body, timeout=timeout)
         resp.raise_for_status()
-        return resp.json()
+        return loads(resp.content)
 
     # ------------------------------------------------------------------
     # High-Level-Methoden
@@ -123,25 +282,14 @@ class HubSpotClient:
         resp = exc.response
         status = resp.status_code
         try:
-            payload_json = resp.json()
+            payload_json = loads(resp.content)
         except Exception:
             payload_json = {"body": resp.text}
 
-        if status in (401, 403):
-            code = "hubspot_auth_error"
-            message = f"HubSpot {crm_object_type} request failed due to invalid or missing credentials."
-        elif status == 404:
-            code = "hubspot_not_found"
-            message = f"HubSpot {crm_object_type} not found."
-        elif status == 429:
-            code = "hubspot_rate_limited"
-            message = f"HubSpot rate limit exceeded for {crm_object_type}."
-        elif 400 <= status < 500:
-            code = "hubspot_validation_error"
-            message = f"HubSpot rejected the {crm_object_type} payload."
-        else:
-            code = "hubspot_server_error"
-            message = f"HubSpot {crm_object_type} request failed with server error."
+        code, template = _HS_ERRORS.get(status) or (
+            _HS_VALIDATION_ERROR if 400 <= status < 500 else _HS_SERVER_ERROR
+        )
+        message = template.format(obj=crm_object_type)
 
         error = CRMSyncError(
             code=code,
@@ -159,154 +307,462 @@ class HubSpotClient:
             crm_id=None,
             leadlane_id=leadlane_id,
             errors=[error],
-            raw_response=payload_json,
+            raw_response=payload_json if self._include_raw else None,
+        )
+
+    async def upsert_company(
+        self,
+        payload: CRMCompanyPayload,
+        existing_crm_id: Optional[str] = None,
+    ) -> CRMSyncResult:
+        return await self._upsert_object(
+            "company",
+            payload,
+            payload.leadlane_sub_company_id or payload.central_sub_company_id,
+            existing_crm_id,
+        )
+
+    async def upsert_contact(
+        self,
+        payload: CRMContactPayload,
+        existing_crm_id: Optional[str] = None,
+    ) -> CRMSyncResult:
+        return await self._upsert_object(
+            "contact",
+            payload,
+            payload.leadlane_contact_id,
+            existing_crm_id,
         )
 
-        async def upsert_company(
-            self,
-            payload: CRMCompanyPayload,
-            existing_crm_id: Optional[str] = None,
-        ) -> CRMSyncResult:
-            leadlane_id = payload.leadlane_sub_company_id or payload.central_sub_company_id
+    async def upsert_deal(
+        self,
+        payload: CRMDealPayload,
+        existing_crm_id: Optional[str] = None,
+    ) -> CRMSyncResult:
+        return await self._upsert_object(
+            "deal",
+            payload,
+            payload.leadlane_demo_id or payload.leadlane_account_id,
+            existing_crm_id,
+        )
 
-            # NEU: Properties via Mapping Engine bauen
-            properties = await self._mapping_engine.map_udm_to_crm_properties(
-                tenant_id=self._tenant_id,
+    async def _upsert_object(
+        self,
+        object_type: str,
+        payload: Any,
+        leadlane_id: Optional[str],
+        existing_crm_id: Optional[str],
+    ) -> CRMSyncResult:
+        """
+        Gemeinsamer Ablauf für upsert_company/contact/deal:
+        Mapping → PATCH (bekannte ID) bzw. POST → CRMSyncResult.
+        """
+        properties = await self._map_properties(object_type, payload)
+        body = {"properties": properties}
+        path = self._obj_prefix[object_type]
+
+        try:
+            if existing_crm_id:
+                resp = await self._request("PATCH", f"{path}/{existing_crm_id}", json_body=body)
+                resp.raise_for_status()
+                payload_json = loads(resp.content)
+                crm_id = existing_crm_id
+            else:
+                payload_json = await self._post_json(path, json_body=body)
+                crm_id = str(payload_json.get("id")) if payload_json.get("id") else None
+
+            return CRMSyncResult(
+                success=True,
                 crm_system=CRMSystem.HUBSPOT,
-                object_type="company",
-                udm_object=payload,
-                extra_fields=payload.properties,
+                crm_object_type=object_type,
+                crm_id=crm_id,
+                leadlane_id=leadlane_id,
+                errors=[],
+                raw_response=payload_json if self._include_raw else None,
             )
-            body = {"properties": properties}
 
-            try:
-                if existing_crm_id:
-                    path = f"/crm/v3/objects/companies/{existing_crm_id}"
-                    resp = await self._request("PATCH", path, json_body=body)
-                    resp.raise_for_status()
-                    payload_json = resp.json()
-                    crm_id = existing_crm_id
-                else:
-                    payload_json = await self._post_json(
-                        "/crm/v3/objects/companies",
-                        json_body=body,
-                    )
-                    crm_id = str(payload_json.get("id")) if payload_json.get("id") else None
+        except httpx.HTTPStatusError as exc:
+            return self._handle_http_error(
+                exc,
+                crm_object_type=object_type,
+                leadlane_id=leadlane_id,
+            )
+
+    # ------------------------------------------------------------------
+    # Paralleler Fan-out über Einzel-Calls
+    # ------------------------------------------------------------------
+
+    async def upsert_many(
+        self,
+        items: Sequence[Tuple[Any, Optional[str]]],
+    ) -> List[CRMSyncResult]:
+        """
+        Führt (payload, existing_crm_id)-Paare parallel aus – Company-, Contact-
+        und Deal-Payloads gemischt. Die Parallelität begrenzt self._sem in
+        _request. Ergebnisse in Reihenfolge der items; Exceptions werden zu
+        CRMSyncResult(success=False).
+        """
+        results = await asyncio.gather(
+            *(self._upsert_dispatch(payload, existing_crm_id) for payload, existing_crm_id in items),
+            return_exceptions=True,
+        )
 
-                return CRMSyncResult(
-                    success=True,
+        out: List[CRMSyncResult] = []
+        for (payload, _), result in zip(items, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result  # CancelledError & Co. nicht schlucken
+                object_type, leadlane_id = _describe_payload(payload)
+                result = CRMSyncResult(
+                    success=False,
                     crm_system=CRMSystem.HUBSPOT,
-                    crm_object_type="company",
-                    crm_id=crm_id,
+                    crm_object_type=object_type,
+                    crm_id=None,
                     leadlane_id=leadlane_id,
-                    errors=[],
-                    raw_response=payload_json,
+                    errors=[
+                        CRMSyncError(
+                            code="bulk_item_failed",
+                            message=str(result) or result.__class__.__name__,
+                        )
+                    ],
                 )
+            out.append(result)
+        return out
 
-            except httpx.HTTPStatusError as exc:
-                return self._handle_http_error(
-                    exc,
-                    crm_object_type="company",
-                    leadlane_id=leadlane_id,
-                )
+    def _upsert_dispatch(
+        self,
+        payload: Any,
+        existing_crm_id: Optional[str],
+    ) -> Awaitable[CRMSyncResult]:
+        if isinstance(payload, CRMCompanyPayload):
+            return self.upsert_company(payload, existing_crm_id)
+        if isinstance(payload, CRMContactPayload):
+            return self.upsert_contact(payload, existing_crm_id)
+        if isinstance(payload, CRMDealPayload):
+            return self.upsert_deal(payload, existing_crm_id)
+        raise TypeError(f"Unsupported payload type: {type(payload).__name__}")
 
+    # ------------------------------------------------------------------
+    # Bulk über die native Batch-API (/batch/upsert, max. 100 pro Request)
+    # ------------------------------------------------------------------
 
-        async def upsert_contact(
-            self,
-            payload: CRMContactPayload,
-            existing_crm_id: Optional[str] = None,
-        ) -> CRMSyncResult:
-            leadlane_id = payload.leadlane_contact_id
+    async def upsert_companies_bulk(
+        self,
+        payloads: List[CRMCompanyPayload],
+    ) -> List[CRMSyncResult]:
+        return await self._batch_upsert(
+            payloads,
+            hubspot_object="companies",
+            crm_object_type="company",
+            id_property="leadlane_sub_company_id",
+            leadlane_id_of=lambda p: p.leadlane_sub_company_id or p.central_sub_company_id,
+        )
 
-            properties = await self._mapping_engine.map_udm_to_crm_properties(
-                tenant_id=self._tenant_id,
-                crm_system=CRMSystem.HUBSPOT,
-                object_type="contact",
-                udm_object=payload,
-                extra_fields=payload.properties,
-            )
-            body = {"properties": properties}
+    async def upsert_contacts_bulk(
+        self,
+        payloads: List[CRMContactPayload],
+    ) -> List[CRMSyncResult]:
+        return await self._batch_upsert(
+            payloads,
+            hubspot_object="contacts",
+            crm_object_type="contact",
+            id_property="leadlane_contact_id",
+            leadlane_id_of=lambda p: p.leadlane_contact_id,
+        )
 
-            try:
-                if existing_crm_id:
-                    path = f"/crm/v3/objects/contacts/{existing_crm_id}"
-                    resp = await self._request("PATCH", path, json_body=body)
-                    resp.raise_for_status()
-                    payload_json = resp.json()
-                    crm_id = existing_crm_id
-                else:
-                    payload_json = await self._post_json(
-                        "/crm/v3/objects/contacts",
-                        json_body=body,
-                    )
-                    crm_id = str(payload_json.get("id")) if payload_json.get("id") else None
+    async def upsert_deals_bulk(
+        self,
+        payloads: List[CRMDealPayload],
+    ) -> List[CRMSyncResult]:
+        return await self._batch_upsert(
+            payloads,
+            hubspot_object="deals",
+            crm_object_type="deal",
+            id_property="leadlane_demo_id",
+            leadlane_id_of=lambda p: p.leadlane_demo_id,
+        )
 
-                return CRMSyncResult(
-                    success=True,
+    async def _batch_upsert(
+        self,
+        payloads: Sequence[Any],
+        *,
+        hubspot_object: str,
+        crm_object_type: str,
+        id_property: str,
+        leadlane_id_of: Callable[[Any], Optional[str]],
+    ) -> List[CRMSyncResult]:
+        """
+        Upsert über POST /crm/v3/objects/{hubspot_object}/batch/upsert.
+
+        HubSpot dedupliziert über id_property (eindeutige Custom-Property mit
+        der LeadLane-ID). Payloads ohne LeadLane-ID können so nicht upserted
+        werden und bekommen ein Fehler-Result. Ergebnisse in Payload-Reihenfolge.
+        """
+        results: List[Optional[CRMSyncResult]] = [None] * len(payloads)
+
+        indexed: List[Tuple[int, str, Any]] = []
+        for i, p in enumerate(payloads):
+            leadlane_id = leadlane_id_of(p)
+            if not leadlane_id:
+                results[i] = CRMSyncResult(
+                    success=False,
                     crm_system=CRMSystem.HUBSPOT,
-                    crm_object_type="contact",
-                    crm_id=crm_id,
-                    leadlane_id=leadlane_id,
-                    errors=[],
-                    raw_response=payload_json,
+                    crm_object_type=crm_object_type,
+                    crm_id=None,
+                    leadlane_id=None,
+                    errors=[
+                        CRMSyncError(
+                            code="hubspot_missing_id_property",
+                            message=f"Batch-Upsert braucht {id_property}.",
+                        )
+                    ],
                 )
+            else:
+                indexed.append((i, leadlane_id, p))
 
+        all_properties = await self._map_properties_many(
+            [p for _, _, p in indexed],
+            crm_object_type=crm_object_type,
+        )
+
+        entries = [
+            (i, leadlane_id, {**props, id_property: leadlane_id})
+            for (i, leadlane_id, _), props in zip(indexed, all_properties)
+        ]
+
+        path = f"/crm/v3/objects/{hubspot_object}/batch/upsert"
+        for chunk in chunked(entries):
+            body = {
+                "inputs": [
+                    {"idProperty": id_property, "id": leadlane_id, "properties": props}
+                    for _, leadlane_id, props in chunk
+                ]
+            }
+            try:
+                data = await self._post_json(path, json_body=body)
             except httpx.HTTPStatusError as exc:
-                return self._handle_http_error(
-                    exc,
-                    crm_object_type="contact",
+                for i, leadlane_id, _ in chunk:
+                    results[i] = self._handle_http_error(
+                        exc,
+                        crm_object_type=crm_object_type,
+                        leadlane_id=leadlane_id,
+                    )
+                continue
+
+            returned = data.get("results") or []
+            by_leadlane_id = {
+                str((r.get("properties") or {}).get(id_property)): r for r in returned
+            }
+            for pos, (i, leadlane_id, _) in enumerate(chunk):
+                item = by_leadlane_id.get(str(leadlane_id))
+                if item is None and len(returned) == len(chunk):
+                    item = returned[pos]  # Fallback: HubSpot liefert i.d.R. in Input-Reihenfolge
+
+                results[i] = self._batch_item_result(
+                    item,
+                    data,
+                    crm_object_type=crm_object_type,
                     leadlane_id=leadlane_id,
                 )
 
-                
-        async def upsert_deal(
-            self,
-            payload: CRMDealPayload,
-            existing_crm_id: Optional[str] = None,
-        ) -> CRMSyncResult:
-            leadlane_id = payload.leadlane_demo_id or payload.leadlane_account_id
+        return [r for r in results if r is not None]
+
+    # ------------------------------------------------------------------
+    # Batch über bekannte HubSpot-IDs (/batch/create + /batch/update)
+    # ------------------------------------------------------------------
+
+    async def upsert_companies_batch(
+        self,
+        payloads: List[CRMCompanyPayload],
+        existing_ids: Dict[str, str],
+    ) -> List[CRMSyncResult]:
+        """
+        existing_ids: LeadLane-ID -> HubSpot-ID (z.B. aus dem Mapping-Repo).
+        Payloads mit bekannter ID gehen an batch/update, der Rest an batch/create.
+        """
+        return await self._batch_create_update(
+            payloads,
+            existing_ids,
+            hubspot_object="companies",
+            crm_object_type="company",
+            leadlane_id_of=lambda p: p.leadlane_sub_company_id or p.central_sub_company_id,
+        )
 
-            properties = await self._mapping_engine.map_udm_to_crm_properties(
-                tenant_id=self._tenant_id,
+    async def upsert_contacts_batch(
+        self,
+        payloads: List[CRMContactPayload],
+        existing_ids: Dict[str, str],
+    ) -> List[CRMSyncResult]:
+        return await self._batch_create_update(
+            payloads,
+            existing_ids,
+            hubspot_object="contacts",
+            crm_object_type="contact",
+            leadlane_id_of=lambda p: p.leadlane_contact_id,
+        )
+
+    async def upsert_deals_batch(
+        self,
+        payloads: List[CRMDealPayload],
+        existing_ids: Dict[str, str],
+    ) -> List[CRMSyncResult]:
+        return await self._batch_create_update(
+            payloads,
+            existing_ids,
+            hubspot_object="deals",
+            crm_object_type="deal",
+            leadlane_id_of=lambda p: p.leadlane_demo_id or p.leadlane_account_id,
+        )
+
+    async def _batch_create_update(
+        self,
+        payloads: Sequence[Any],
+        existing_ids: Dict[str, str],
+        *,
+        hubspot_object: str,
+        crm_object_type: str,
+        leadlane_id_of: Callable[[Any], Optional[str]],
+    ) -> List[CRMSyncResult]:
+        """
+        Wie _batch_upsert, braucht aber keine eindeutige ID-Property in HubSpot:
+        Updates laufen über die bekannte HubSpot-ID, Creates über batch/create.
+        Ergebnisse in Payload-Reihenfolge.
+        """
+        results: List[Optional[CRMSyncResult]] = [None] * len(payloads)
+
+        all_properties = await self._map_properties_many(
+            payloads, crm_object_type=crm_object_type
+        )
+
+        creates: List[Tuple[int, Optional[str], Dict[str, Any]]] = []
+        updates: List[Tuple[int, Optional[str], Dict[str, Any]]] = []
+        for i, (p, props) in enumerate(zip(payloads, all_properties)):
+            leadlane_id = leadlane_id_of(p)
+            crm_id = existing_ids.get(leadlane_id) if leadlane_id else None
+            if crm_id:
+                updates.append((i, leadlane_id, {"id": crm_id, "properties": props}))
+            else:
+                creates.append((i, leadlane_id, {"properties": props}))
+
+        base = f"/crm/v3/objects/{hubspot_object}/batch"
+        for action, entries in (("create", creates), ("update", updates)):
+            for chunk in chunked(entries):
+                try:
+                    data = await self._post_json(
+                        f"{base}/{action}",
+                        json_body={"inputs": [inp for _, _, inp in chunk]},
+                    )
+                except httpx.HTTPStatusError as exc:
+                    for i, leadlane_id, _ in chunk:
+                        results[i] = self._handle_http_error(
+                            exc,
+                            crm_object_type=crm_object_type,
+                            leadlane_id=leadlane_id,
+                        )
+                    continue
+
+                returned = data.get("results") or []
+                by_id = {str(r.get("id")): r for r in returned}
+                for pos, (i, leadlane_id, inp) in enumerate(chunk):
+                    if action == "update":
+                        item = by_id.get(str(inp["id"]))
+                    else:
+                        # batch/create liefert keine LeadLane-ID zurück → Input-Reihenfolge
+                        item = returned[pos] if len(returned) == len(chunk) else None
+
+                    results[i] = self._batch_item_result(
+                        item,
+                        data,
+                        crm_object_type=crm_object_type,
+                        leadlane_id=leadlane_id,
+                    )
+
+        return [r for r in results if r is not None]
+
+    def _batch_item_result(
+        self,
+        item: Optional[Dict[str, Any]],
+        data: Dict[str, Any],
+        *,
+        crm_object_type: str,
+        leadlane_id: Optional[str],
+    ) -> CRMSyncResult:
+        if item is None:
+            return CRMSyncResult(
+                success=False,
                 crm_system=CRMSystem.HUBSPOT,
-                object_type="deal",
-                udm_object=payload,
-                extra_fields=payload.properties,
+                crm_object_type=crm_object_type,
+                crm_id=None,
+                leadlane_id=leadlane_id,
+                errors=[
+                    CRMSyncError(
+                        code="hubspot_batch_item_missing",
+                        message=f"HubSpot batch response enthält kein Ergebnis für {leadlane_id}.",
+                        details={"errors": data.get("errors")},
+                    )
+                ],
+                raw_response=data if self._include_raw else None,
             )
-            body = {"properties": properties}
 
-            try:
-                if existing_crm_id:
-                    path = f"/crm/v3/objects/deals/{existing_crm_id}"
-                    resp = await self._request("PATCH", path, json_body=body)
-                    resp.raise_for_status()
-                    payload_json = resp.json()
-                    crm_id = existing_crm_id
-                else:
-                    payload_json = await self._post_json(
-                        "/crm/v3/objects/deals",
-                        json_body=body,
-                    )
-                    crm_id = str(payload_json.get("id")) if payload_json.get("id") else None
+        return CRMSyncResult(
+            success=True,
+            crm_system=CRMSystem.HUBSPOT,
+            crm_object_type=crm_object_type,
+            crm_id=str(item["id"]) if item.get("id") else None,
+            leadlane_id=leadlane_id,
+            errors=[],
+            raw_response=item if self._include_raw else None,
+        )
 
-                return CRMSyncResult(
-                    success=True,
-                    crm_system=CRMSystem.HUBSPOT,
-                    crm_object_type="deal",
-                    crm_id=crm_id,
-                    leadlane_id=leadlane_id,
-                    errors=[],
-                    raw_response=payload_json,
-                )
+    async def _map_properties(self, object_type: str, payload: Any) -> Dict[str, Any]:
+        """
+        map_udm_to_crm_properties mit Cache; das gelieferte dict wird geteilt
+        und darf nicht verändert werden.
+
+        Ein Treffer gilt nur, solange die Engine noch dasselbe Mapping-Objekt
+        liefert – nach einer Mapping-Änderung (Version, NOTIFY, TTL) lädt
+        der EffectiveMappingCache ein neues, der Client lebt aber weiter
+        (CRMClientCache).
+        """
+        mapping = await self._mapping_engine.get_effective_mapping(
+            tenant_id=self._tenant_id,
+            crm_system=CRMSystem.HUBSPOT,
+            object_type=object_type,
+        )
+        key = _payload_cache_key(object_type, payload)
+        if key is not None:
+            cached = self._map_cache.get(key)
+            if cached is not None and cached[0] is mapping:
+                return cached[1]
 
-            except httpx.HTTPStatusError as exc:
-                return self._handle_http_error(
-                    exc,
-                    crm_object_type="deal",
-                    leadlane_id=leadlane_id,
-                )
+        properties = await self._mapping_engine.map_udm_to_crm_properties(
+            tenant_id=self._tenant_id,
+            crm_system=CRMSystem.HUBSPOT,
+            object_type=object_type,
+            udm_object=payload,
+            extra_fields=payload.properties,
+        )
 
+        if key is not None:
+            if key not in self._map_cache and len(self._map_cache) >= _MAP_CACHE_SIZE:
+                self._map_cache.pop(next(iter(self._map_cache)))
+            self._map_cache[key] = (mapping, properties)
+        return properties
 
+    async def _map_properties_many(
+        self,
+        payloads: Sequence[Any],
+        *,
+        crm_object_type: str,
+    ) -> List[Dict[str, Any]]:
+        """
+        Mapping aller Payloads parallel (Mapping-Engine ist async/DB-gestützt).
+        """
+        return list(
+            await asyncio.gather(
+                *(self._map_properties(crm_object_type, p) for p in payloads)
+            )
+        )
 
     async def create_activity(self, payload: CRMActivityPayload) -> CRMSyncResult:
         leadlane_id = (
@@ -333,12 +789,12 @@ class HubSpotClient:
                 crm_id=crm_id,
                 leadlane_id=leadlane_id,
                 errors=[],
-                raw_response=data,
+                raw_response=data if self._include_raw else None,
             )
         except httpx.HTTPStatusError as exc:
             resp = exc.response
             try:
-                payload_json = resp.json()
+                payload_json = loads(resp.content)
             except Exception:
                 payload_json = {"body": resp.text}
 
@@ -357,5 +813,53 @@ class HubSpotClient:
                 crm_id=None,
                 leadlane_id=leadlane_id,
                 errors=[error],
-                raw_response=payload_json,
+                raw_response=payload_json if self._include_raw else None,
             )
+
+
+def _describe_payload(payload: Any) -> Tuple[str, Optional[str]]:
+    """
+    (crm_object_type, leadlane_id) für Fehler-Results im Fan-out.
+    """
+    if isinstance(payload, CRMCompanyPayload):
+        return "company", payload.leadlane_sub_company_id or payload.central_sub_company_id
+    if isinstance(payload, CRMContactPayload):
+        return "contact", payload.leadlane_contact_id
+    if isinstance(payload, CRMDealPayload):
+        return "deal", payload.leadlane_demo_id or payload.leadlane_account_id
+    return "unknown", None
+
+
+def _monotonic_deadline(info: CRMConnectionInfo) -> float:
+    """
+    Ablauf von info (abzgl. _TOKEN_SKEW_SECONDS) als time.monotonic()-Wert;
+    ohne expires_at unbegrenzt (401 löst dann den Refresh aus).
+    """
+    if info.expires_at is None:
+        return float("inf")
+    remaining = (info.expires_at - datetime.now(timezone.utc)).total_seconds()
+    return time.monotonic() + remaining - _TOKEN_SKEW_SECONDS
+
+
+def _payload_cache_key(object_type: str, payload: Any) -> Optional[Tuple[Any, ...]]:
+    """
+    Schlüssel aus allen Feldwerten + properties (Vergleich per Gleichheit,
+    nicht nur per Hash); None, wenn etwas nicht hashbar ist → nicht cachen.
+    Jeder Wert geht mit seinem Typ ein: True == 1 == 1.0 haben denselben
+    Hash, würden sonst also dasselbe (falsche) Mapping treffen.
+    """
+    values = tuple(
+        (type(value), value)
+        for value in (
+            getattr(payload, f.name) for f in fields(payload) if f.name != "properties"
+        )
+    )
+    try:
+        properties = frozenset(
+            (name, type(value), value) for name, value in payload.properties.items()
+        )
+        key = (object_type, values, properties)
+        hash(key)
+    except TypeError:
+        return None
+    return key
@@ -0,0 +1,93 @@
+# app/integrations/crm/json_codec.py
+from __future__ import annotations
+
+import json as _stdlib_json
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Optional
+from uuid import UUID
+
+try:  # optional: orjson ist beim (De-)Serialisieren großer Batch-Payloads deutlich schneller
+    import orjson
+except ImportError:  # pragma: no cover - abhängig von der Umgebung
+    orjson = None  # type: ignore[assignment]
+
+try:  # optional: brotli (httpx[brotli]) – httpx dekodiert br dann transparent
+    import brotli  # noqa: F401
+
+    _BROTLI_AVAILABLE = True
+except ImportError:  # pragma: no cover - abhängig von der Umgebung
+    _BROTLI_AVAILABLE = False
+
+if TYPE_CHECKING:  # nur Annotation (decode_body) – kein Import-Zwang für Aufrufer
+    import httpx
+
+
+def _default(obj: Any) -> Any:
+    """
+    Typen aus dem Domain-Modell, die kein Encoder einheitlich kann:
+    Decimal (z.B. Company.sales_eur) → Zahl, UUID → String.
+    """
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+try:  # optional: msgspec-Encoder (wiederverwendeter Puffer) für verschachtelte Batch-Bodies
+    import msgspec
+
+    # decimal_format="number": Decimal als Zahl wie bei orjson/stdlib (_default)
+    _MSGSPEC_ENCODER: Optional["msgspec.json.Encoder"] = msgspec.json.Encoder(
+        enc_hook=_default, decimal_format="number"
+    )
+except ImportError:  # pragma: no cover - abhängig von der Umgebung
+    _MSGSPEC_ENCODER = None
+
+
+# Für Requests mit selbst serialisiertem Body (content=dumps(...))
+JSON_CONTENT_TYPE = {"Content-Type": "application/json"}
+
+# Komprimierte Antworten anfordern; br nur, wenn httpx es auch dekodieren kann
+ACCEPT_ENCODING = "gzip, br" if _BROTLI_AVAILABLE else "gzip"
+
+
+def dumps(data: Any) -> bytes:
+    """
+    Reihenfolge: msgspec (ein Encoder für alle Calls) → orjson → stdlib json.
+    Decimal und UUID werden in allen drei Fällen gleich kodiert (_default).
+    """
+    if _MSGSPEC_ENCODER is not None:
+        return _MSGSPEC_ENCODER.encode(data)
+    if orjson is not None:
+        return orjson.dumps(data, default=_default)
+    return _stdlib_json.dumps(data, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def loads(content: bytes) -> Any:
+    """
+    Wirft ValueError bei ungültigem JSON (orjson.JSONDecodeError ist eine
+    Unterklasse davon).
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return _stdlib_json.loads(content)
+
+
+def decode_body(response: httpx.Response) -> Any:
+    """
+    Dekodiert den Body anhand des Content-Type statt per Parse-Versuch:
+    JSON → Python-Objekt, sonst Text (None bei leerem Body).
+
+    Ungültiges JSON trotz JSON-Content-Type (z. B. abgeschnittene Fehler-
+    Antworten von Proxies) fällt auf den Text zurück, damit der Aufrufer
+    den eigentlichen HTTP-Fehler statt eines ValueError sieht.
+    """
+    if not response.content:
+        return None
+    if "json" in response.headers.get("content-type", ""):
+        try:
+            return loads(response.content)
+        except ValueError:
+            return response.text
+    return response.text
@@ -0,0 +1,69 @@
+# app/integrations/crm/rate_limit.py
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Dict, Hashable
+
+import httpx
+
+
+class TokenBucket:
+    """
+    Einfacher Token-Bucket für clientseitiges Rate-Limiting.
+
+    rate:     Tokens pro Sekunde (Nachfüllrate)
+    capacity: max. Burst
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Leert den Bucket und verschiebt das Nachfüllen um seconds
+        (z.B. nach einem 429 mit Retry-After).
+        """
+        self._tokens = 0.0
+        self._updated = max(self._updated, time.monotonic() + seconds)
+
+
+# Ein Bucket pro Schlüssel (z.B. (tenant_id, CRMSystem)), prozessweit –
+# Clients werden pro Sync neu gebaut, das Limit gilt aber pro Account.
+_BUCKETS: Dict[Hashable, TokenBucket] = {}
+
+
+def bucket_for(key: Hashable, rate: float, capacity: float) -> TokenBucket:
+    """
+    Liefert den gemeinsamen TokenBucket für key (lazy erzeugt).
+    """
+    bucket = _BUCKETS.get(key)
+    if bucket is None:
+        bucket = _BUCKETS[key] = TokenBucket(rate=rate, capacity=capacity)
+    return bucket
+
+
+def retry_after_seconds(response: httpx.Response, default: float = 10.0) -> float:
+    """
+    Retry-After-Header in Sekunden (nur die Sekunden-Variante), sonst default.
+    """
+    try:
+        return max(0.0, float(response.headers.get("retry-after", default)))
+    except ValueError:
+        return default
@@ -1,13 +1,21 @@
 # app/integrations/crm/salesforce/salesforce_api.py
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, Mapping
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Mapping
 
 import httpx
 
+from ..json_codec import dumps, loads
+from ..rate_limit import bucket_for, retry_after_seconds
+from .http import get_shared_client
 from .salesforce_auth import SalesforceCredentials, SalesforceAuthError
 
 
+# Versuche pro Request bei 429 (inkl. des ersten)
+_MAX_ATTEMPTS = 3
+
+
 class SalesforceAPIError(RuntimeError):
     """
     Fehler bei der Kommunikation mit der Salesforce REST API.
@@ -32,12 +40,24 @@ class SalesforceAPI:
     Diese Klasse kennt KEINE LeadLane-spezifischen Payloads.
     """
 
+    # Upsert-Art → sObject-Pfad (relativ zu services/data/vXX.0)
+    _SOBJ_PATHS = {
+        "account": "sobjects/Account",
+        "contact": "sobjects/Contact",
+        "opportunity": "sobjects/Opportunity",
+    }
+
     def __init__(
         self,
         credentials: SalesforceCredentials,
         api_version: str = "v59.0",  # Version bei Bedarf anpassbar
         timeout: float = 10.0,
         client: Optional[httpx.AsyncClient] = None,
+        *,
+        concurrency: int = 16,
+        refresh_cb: Optional[Callable[[], Awaitable[bool]]] = None,
+        rate_per_second: float = 25.0,
+        burst: float = 25.0,
     ) -> None:
         if not credentials.instance_url:
             raise SalesforceAuthError("Salesforce instance_url ist nicht gesetzt.")
@@ -48,12 +68,24 @@ class SalesforceAPI:
 
         base = credentials.instance_url.rstrip("/")
         self._base_url = f"{base}/services/data/{self._api_version}"
+        self._token_url = f"{base}/services/oauth2/token"
+
+        # Refresh-Hook (SalesforceCRMClient.refresh_auth): bei 401 einmal
+        # aufrufen und den Request wiederholen
+        self._refresh_cb = refresh_cb
 
-        self._owns_client = client is None
-        self._client: httpx.AsyncClient = client or httpx.AsyncClient(
-            timeout=self._timeout,
+        # max. parallele Requests (Fan-out über upsert_*)
+        self._sem = asyncio.Semaphore(concurrency)
+        # Pacing pro Salesforce-Org (instance_url), prozessweit geteilt
+        self._bucket = bucket_for(
+            ("salesforce", base), rate=rate_per_second, capacity=burst
         )
 
+        # Standard: prozessweiter Client (siehe salesforce/http.py, HTTP/2 falls
+        # verfügbar) – gehört nicht dieser Instanz, close() schließt ihn nicht.
+        self._owns_client = False
+        self._client: httpx.AsyncClient = client or get_shared_client()
+
     async def close(self) -> None:
         if self._owns_client:
             await self._client.aclose()
@@ -72,30 +104,56 @@ class SalesforceAPI:
     ) -> Any:
         """
         Interner Helper für HTTP-Requests gegen Salesforce.
+
+        Optimistisch: kein Ablauf-Check vor dem Request; ein 401 löst genau
+        einen Refresh (refresh_cb) + Wiederholung aus.
         """
-        if self._credentials.is_expired():
-            # Später könnte hier ein Refresh-Flow implementiert werden.
-            raise SalesforceAuthError("Salesforce access_token ist abgelaufen.")
+        # Ohne Token/instance_url scheitert der Call sicher → vor Semaphore und
+        # Token-Bucket abbrechen, statt Budget für andere Requests zu blockieren
+        self._credentials.require_valid_for_request()
 
+        refreshed = False
         url = f"{self._base_url}/{path.lstrip('/')}"
-        headers = self._credentials.build_headers()
+        content = dumps(json) if json is not None else None
 
-        try:
-            response = await self._client.request(
-                method=method,
-                url=url,
-                headers=headers,
-                params=params,
-                json=json,
-            )
-        except httpx.HTTPError as exc:
-            raise SalesforceAPIError(
-                f"HTTP-Fehler bei Request an Salesforce: {exc!r}"
-            ) from exc
+        async with self._sem:
+            attempt = 0
+            while attempt < _MAX_ATTEMPTS:
+                attempt += 1
+                # gecacht pro Access-Token, enthält bereits Content-Type: application/json
+                headers = self._credentials.build_headers()
+                await self._bucket.acquire()
+                try:
+                    response = await self._client.request(
+                        method=method,
+                        url=url,
+                        headers=headers,
+                        params=params,
+                        content=content,
+                        timeout=self._timeout,
+                    )
+                except httpx.HTTPError as exc:
+                    raise SalesforceAPIError(
+                        f"HTTP-Fehler bei Request an Salesforce: {exc!r}"
+                    ) from exc
+
+                if response.status_code == 401 and not refreshed and self._refresh_cb is not None:
+                    # Session serverseitig beendet → einmal refreshen + wiederholen
+                    await self._refresh_or_raise()
+                    refreshed = True
+                    attempt -= 1
+                    continue
+
+                if response.status_code != 429 or attempt == _MAX_ATTEMPTS:
+                    break
+
+                delay = max(retry_after_seconds(response, default=1.0), 2 ** (attempt - 1))
+                self._bucket.pause(delay)
+                await asyncio.sleep(delay)
 
         if response.status_code >= 400:
             try:
-                body = response.json()
+                body = loads(response.content)
             except ValueError:
                 body = response.text
 
@@ -107,12 +165,50 @@ class SalesforceAPI:
 
         if response.content:
             try:
-                return response.json()
+                return loads(response.content)
             except ValueError:
                 return response.text
 
         return None
 
+    async def _refresh_or_raise(self) -> None:
+        if self._refresh_cb is None or not await self._refresh_cb():
+            raise SalesforceAuthError("Salesforce access_token ist abgelaufen.")
+
+    async def refresh_access_token(
+        self,
+        client_id: str,
+        client_secret: str,
+    ) -> Dict[str, Any]:
+        """
+        OAuth Refresh-Token-Flow gegen {instance_url}/services/oauth2/token.
+        Liefert die Token-Response (access_token, instance_url, issued_at, ...).
+        """
+        if not self._credentials.refresh_token:
+            raise SalesforceAuthError("Salesforce refresh_token fehlt.")
+
+        try:
+            response = await self._client.post(
+                self._token_url,
+                data={
+                    "grant_type": "refresh_token",
+                    "refresh_token": self._credentials.refresh_token,
+                    "client_id": client_id,
+                    "client_secret": client_secret,
+                },
+            )
+        except httpx.HTTPError as exc:
+            raise SalesforceAuthError(
+                f"HTTP-Fehler beim Salesforce Token-Refresh: {exc!r}"
+            ) from exc
+
+        if response.status_code >= 400:
+            raise SalesforceAuthError(
+                f"Salesforce Token-Refresh fehlgeschlagen (Status {response.status_code})."
+            )
+
+        return loads(response.content)
+
     # ----------------------------------------------------------
     # High-Level Convenience-Methoden (Accounts, Contacts, Opportunities)
     # ----------------------------------------------------------
@@ -128,9 +224,7 @@ class SalesforceAPI:
         - POST /sobjects/Account
         - PATCH /sobjects/Account/{Id}
         """
-        path = "sobjects/Account" + (f"/{sf_account_id}" if sf_account_id else "")
-        method = "PATCH" if sf_account_id else "POST"
-        return await self._request(method, path, json=data)
+        return await self._upsert_sobject("account", data, sf_account_id)
 
     async def upsert_contact(
         self,
@@ -140,9 +234,7 @@ class SalesforceAPI:
         """
         Vereinfachter Upsert für Contacts.
         """
-        path = "sobjects/Contact" + (f"/{sf_contact_id}" if sf_contact_id else "")
-        method = "PATCH" if sf_contact_id else "POST"
-        return await self._request(method, path, json=data)
+        return await self._upsert_sobject("contact", data, sf_contact_id)
 
     async def upsert_opportunity(
         self,
@@ -152,13 +244,25 @@ class SalesforceAPI:
         """
         Vereinfachter Upsert für Opportunities.
         """
-        path = "sobjects/Opportunity" + (f"/{sf_opportunity_id}" if sf_opportunity_id else "")
-        method = "PATCH" if sf_opportunity_id else "POST"
-        return await self._request(method, path, json=data)
+        return await self._upsert_sobject("opportunity", data, sf_opportunity_id)
+
+    async def _upsert_sobject(
+        self,
+        kind: str,
+        data: Mapping[str, Any],
+        sf_id: Optional[str],
+    ) -> Any:
+        """
+        PATCH sobjects/<Type>/{Id} bei bekannter ID, sonst POST sobjects/<Type>.
+        """
+        prefix = self._SOBJ_PATHS[kind]
+        if sf_id:
+            return await self._request("PATCH", f"{prefix}/{sf_id}", json=data)
+        return await self._request("POST", prefix, json=data)
 
     async def get_opportunity(self, sf_opportunity_id: str) -> Any:
         """
         Holt eine Opportunity aus Salesforce.
         """
-        path = f"sobjects/Opportunity/{sf_opportunity_id}"
+        path = f"{self._SOBJ_PATHS['opportunity']}/{sf_opportunity_id}"
         return await self._request("GET", path)
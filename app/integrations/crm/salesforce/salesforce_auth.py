@@ -1,10 +1,13 @@
 # app/integrations/crm/salesforce/salesforce_auth.py
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from typing import Mapping, Optional, Any, Dict
 
+from ..json_codec import ACCEPT_ENCODING
+
 
 class SalesforceAuthError(RuntimeError):
     """
@@ -30,6 +33,23 @@ class SalesforceCredentials:
     instance_url: Optional[str] = None
     expires_at: Optional[datetime] = None
 
+    # expires_at als Epoch-Sekunden, einmal pro expires_at-Wert berechnet
+    # (refresh_auth setzt expires_at neu → wird dann neu berechnet).
+    _expires_at_epoch: float = field(
+        default=float("inf"), init=False, repr=False, compare=False
+    )
+    _expires_source: Optional[datetime] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # Header-Cache: wird nur neu gebaut, wenn sich das Access-Token ändert
+    _cached_headers: Optional[Dict[str, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _cached_token: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     @classmethod
     def from_mapping(cls, data: Mapping[str, Any]) -> "SalesforceCredentials":
         """
@@ -67,12 +87,17 @@ class SalesforceCredentials:
         Prüft, ob das Access Token abgelaufen ist – mit etwas Zeitpuffer.
         Wenn kein expires_at gesetzt ist, gehen wir von "nicht abgelaufen" aus.
         """
-        if not self.expires_at:
+        expires_at = self.expires_at
+        if expires_at is None:
             return False
 
-        now = datetime.now(timezone.utc)
-        skew = timedelta(seconds=skew_seconds)
-        return now + skew >= self.expires_at
+        if expires_at is not self._expires_source:
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            self._expires_at_epoch = expires_at.timestamp()
+            self._expires_source = self.expires_at
+
+        return time.time() + skew_seconds >= self._expires_at_epoch
 
     def require_valid_for_request(self) -> None:
         """
@@ -89,16 +114,20 @@ class SalesforceCredentials:
     ) -> Dict[str, str]:
         """
         Baut HTTP-Header für einen Request an Salesforce.
-        """
-        self.require_valid_for_request()
 
-        headers: Dict[str, str] = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
+        Ohne extra: gecachtes dict (per Referenz, nicht verändern!).
+        Mit extra: neue Kopie inkl. extra.
+        """
+        if self._cached_headers is None or self._cached_token is not self.access_token:
+            self.require_valid_for_request()
+            self._cached_headers = {
+                "Authorization": f"Bearer {self.access_token}",
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+                "Accept-Encoding": ACCEPT_ENCODING,
+            }
+            self._cached_token = self.access_token
 
         if extra:
-            headers.update(extra)
-
-        return headers
+            return {**self._cached_headers, **extra}
+        return self._cached_headers
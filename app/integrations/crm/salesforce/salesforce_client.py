@@ -1,9 +1,18 @@
 # app/integrations/crm/salesforce/salesforce_client.py
 from __future__ import annotations
 
+import asyncio
+import logging
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
 from typing import Any, Mapping, Optional, Dict
 from uuid import UUID
 
+import httpx
+
+from app.config import settings
+from app.integrations.credentials.crm_credentials_store import CRMCredentialsStore
+
 from ..crm_client import CRMClient
 from ..crm_types import (
     CRMSystem,
@@ -18,8 +27,11 @@ from ..crm_client_factory import (
     CRMClientConfig,
     register_crm_client,
 )
-from .salesforce_auth import SalesforceCredentials
+from .salesforce_auth import SalesforceCredentials, SalesforceAuthError
 from .salesforce_api import SalesforceAPI
+from .http import get_shared_client
+
+logger = logging.getLogger(__name__)
 
 
 class SalesforceCRMClient(CRMClient):
@@ -30,14 +42,31 @@ class SalesforceCRMClient(CRMClient):
     zurückgeben. Später kann hier SalesforceAPI + Mapping eingebaut werden.
     """
 
-    def __init__(self, tenant_id: UUID, credentials: Mapping[str, Any]) -> None:
+    def __init__(
+        self,
+        tenant_id: UUID,
+        credentials: Mapping[str, Any],
+        http_client: Optional[httpx.AsyncClient] = None,
+        credentials_store: Optional[CRMCredentialsStore] = None,
+    ) -> None:
         super().__init__(tenant_id)
 
+        # persistiert refreshte Tokens (ohne Store: nur in-memory)
+        self._credentials_store = credentials_store
+
         self._credentials_raw: Dict[str, Any] = dict(credentials)
         self._credentials = SalesforceCredentials.from_mapping(credentials)
 
+        # parallele 401/Ablauf-Fälle teilen sich einen Refresh
+        self._refresh_lock = asyncio.Lock()
+
         # API-Client (aktuell ungenutzt, aber vorbereitet)
-        self._api = SalesforceAPI(self._credentials)
+        # http_client: i.d.R. der prozessweite Pool aus salesforce/http.py
+        self._api = SalesforceAPI(
+            self._credentials,
+            client=http_client or get_shared_client(),
+            refresh_cb=self.refresh_auth,
+        )
 
     # ------------------------------------------------------------------
     # CRMClient Interface
@@ -56,13 +85,89 @@ class SalesforceCRMClient(CRMClient):
 
     async def refresh_auth(self) -> bool:
         """
-        Placeholder für OAuth-Refresh-Flow gegen Salesforce.
+        OAuth-Refresh über das refresh_token (Connected App aus den Settings).
+        Aktualisiert die Credentials in-place; SalesforceAPI baut die Header
+        beim nächsten Request anhand des neuen Tokens neu. Mit
+        credentials_store wird das neue Token (und ein rotiertes
+        refresh_token) zusätzlich gespeichert.
 
-        TODO:
-        - refresh_token nutzen, um neues access_token zu holen
-        - Credentials aktualisieren
+        Gibt False zurück, wenn kein Refresh möglich ist oder er fehlschlägt.
+        """
+        if not (
+            self._credentials.refresh_token
+            and settings.salesforce_client_id
+            and settings.salesforce_client_secret
+        ):
+            return False
+
+        token_before = self._credentials.access_token
+        async with self._refresh_lock:
+            if self._credentials.access_token != token_before:
+                # anderer Request hat inzwischen refreshed
+                return True
+
+            try:
+                payload = await self._api.refresh_access_token(
+                    client_id=settings.salesforce_client_id,
+                    client_secret=settings.salesforce_client_secret,
+                )
+            except SalesforceAuthError:
+                return False
+
+            access_token = payload.get("access_token")
+            if not access_token:
+                return False
+
+            self._credentials.access_token = access_token
+            # Salesforce liefert i.d.R. kein expires_in (Session-Timeout der Org)
+            # → ohne Angabe kein Ablauf-Check, ein 401 löst den nächsten Refresh aus.
+            expires_in = payload.get("expires_in")
+            self._credentials.expires_at = (
+                datetime.now(timezone.utc) + timedelta(seconds=int(expires_in))
+                if expires_in
+                else None
+            )
+            self._credentials_raw["access_token"] = access_token
+            self._credentials_raw["expires_at"] = self._credentials.expires_at
+            refresh_token = payload.get("refresh_token")
+            if refresh_token:
+                self._credentials.refresh_token = refresh_token
+                self._credentials_raw["refresh_token"] = refresh_token
+
+            await self._persist_tokens()
+            return True
+
+    async def _persist_tokens(self) -> None:
         """
-        return False
+        Schreibt die refreshten Tokens in crm_connections; sonst lädt der
+        nächste Client (TTL im CRMClientCache, Neustart) das alte Token und
+        zahlt erneut 401 + Refresh. Fehler werden nur geloggt – das Token im
+        Speicher ist gültig.
+        """
+        if self._credentials_store is None:
+            return
+        try:
+            info = await self._credentials_store.get_credentials(
+                self._tenant_id, CRMSystem.SALESFORCE
+            )
+            if info is None:
+                return
+            await self._credentials_store.upsert_credentials(
+                replace(
+                    info,
+                    access_token=self._credentials.access_token,
+                    refresh_token=self._credentials.refresh_token or info.refresh_token,
+                    expires_at=self._credentials.expires_at,
+                    last_modified_time=datetime.now(timezone.utc),
+                    modified_by="system_refresh",
+                )
+            )
+        except Exception:  # noqa: BLE001 - Refresh selbst war erfolgreich
+            logger.warning(
+                "Persisting refreshed Salesforce tokens failed: tenant_id=%s",
+                self._tenant_id,
+                exc_info=True,
+            )
 
     # ------------------------------------------------------------------
     # Company / Account
@@ -176,6 +281,8 @@ def _salesforce_factory(config: CRMClientConfig) -> CRMClient:
     return SalesforceCRMClient(
         tenant_id=config.tenant_id,
         credentials=config.credentials,
+        http_client=get_shared_client(),
+        credentials_store=config.credentials_store,
     )
 
 
@@ -0,0 +1,48 @@
+# app/integrations/crm/sap_b1/http.py
+from __future__ import annotations
+
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:  # httpx (+ h2/anyio/certifi) erst beim ersten SAP-Call laden
+    import httpx
+
+# h2 kommt über httpx[http2] (requirements); ohne h2 Fallback auf HTTP/1.1.
+# find_spec prüft nur die Verfügbarkeit, ohne h2 zu importieren.
+_HTTP2_AVAILABLE = find_spec("h2") is not None
+
+
+# Prozessweiter Client für alle SAP-B1-Service-Layer-Calls. Tenants auf
+# demselben SAP-Server teilen sich Keep-Alive-Verbindungen (httpx poolt pro
+# Host innerhalb eines Clients).
+_SHARED: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """
+    Liefert den gemeinsamen httpx.AsyncClient (lazy erzeugt).
+    """
+    global _SHARED
+    if _SHARED is None or _SHARED.is_closed:
+        import httpx
+
+        _SHARED = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=64,
+                max_connections=128,
+                keepalive_expiry=60,
+            ),
+        )
+    return _SHARED
+
+
+async def close_shared_client() -> None:
+    """
+    Schließt den gemeinsamen Client (App-Shutdown).
+    """
+    global _SHARED
+    if _SHARED is not None:
+        await _SHARED.aclose()
+        _SHARED = None
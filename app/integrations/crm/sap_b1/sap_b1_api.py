@@ -1,12 +1,19 @@
 # app/integrations/crm/sap_b1/sap_b1_api.py
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, Mapping
-
-import httpx
+import asyncio
+import re
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Mapping, Sequence, Tuple
+from urllib.parse import quote, urlsplit
+from uuid import uuid4
+from weakref import WeakValueDictionary
 
+from ..json_codec import dumps, loads
 from .sap_b1_auth import SAPB1Credentials, SAPB1AuthError
 
+if TYPE_CHECKING:  # nur für Annotationen – httpx wird erst beim ersten API-Objekt geladen
+    import httpx
+
 
 class SAPB1APIError(RuntimeError):
     """
@@ -24,6 +31,17 @@ class SAPB1APIError(RuntimeError):
         self.response_body = response_body
 
 
+# Max. Operationen pro $batch-Request (Service Layer verarbeitet sie seriell;
+# zu große Batches laufen in Timeouts)
+SAP_B1_BATCH_LIMIT = 100
+
+# Eine Batch-Operation: (HTTP-Methode, Pfad relativ zu /b1s/v1, JSON-Body oder None)
+BatchOperation = Tuple[str, str, Optional[Mapping[str, Any]]]
+
+_BOUNDARY_RE = re.compile(rb'boundary="?([^";\s]+)"?', re.IGNORECASE)
+_STATUS_RE = re.compile(rb"^HTTP/\d(?:\.\d)?\s+(\d{3})")
+
+
 class SAPB1API:
     """
     Dünner Wrapper um die SAP B1 Service Layer API (OData / REST).
@@ -46,16 +64,31 @@ class SAPB1API:
 
         base = credentials.base_url.rstrip("/")
         self._base_url = f"{base}/b1s/v1"
+        # absoluter Pfad für die Request-Zeilen in $batch (z.B. "/b1s/v1")
+        self._service_root = urlsplit(self._base_url).path.rstrip("/")
+        # Collection-URLs einmal bauen; Keys werden pro Call nur noch angehängt
+        self._bp_coll = f"{self._base_url}/BusinessPartners"
+        self._ce_coll = f"{self._base_url}/ContactEmployees"
+        self._so_coll = f"{self._base_url}/SalesOpportunities"
+        self._batch_url = f"{self._base_url}/$batch"
 
-        self._owns_client = client is None
-        self._client: httpx.AsyncClient = client or httpx.AsyncClient(
-            timeout=self._timeout,
-        )
+        # Standard: prozessweiter Client (siehe sap_b1/http.py) – gehört
+        # nicht dieser Instanz und wird daher in close() nicht geschlossen.
+        # Import erst hier: Tenants ohne SAP B1 laden den HTTP-Stack nicht.
+        if client is None:
+            from .http import get_shared_client
+
+            client = get_shared_client()
+        self._owns_client = False
+        self._client: httpx.AsyncClient = client
 
     async def close(self) -> None:
         if self._owns_client:
             await self._client.aclose()
 
+    def _bp_url(self, bp_code: str) -> str:
+        return f"{self._bp_coll}({_odata_string_key(bp_code)})"
+
     # ----------------------------------------------------------
     # Low-Level Request Helper
     # ----------------------------------------------------------
@@ -63,20 +96,24 @@ class SAPB1API:
     async def _request(
         self,
         method: str,
-        path: str,
+        url: str,
         *,
         params: Optional[Mapping[str, Any]] = None,
         json: Optional[Any] = None,
     ) -> Any:
         """
         Interner Helper für HTTP-Requests gegen die SAP B1 Service Layer API.
+        url ist bereits absolut (siehe _bp_coll/_bp_url & Co. in __init__).
         """
         if self._credentials.is_expired():
             # Später könnte hier ein automatischer Re-Login stattfinden.
             raise SAPB1AuthError("SAP B1 Session ist abgelaufen.")
 
-        url = f"{self._base_url}/{path.lstrip('/')}"
-        headers = self._credentials.build_headers()
+        headers = self._credentials.build_headers()  # enthält Content-Type: application/json
+        # Body selbst serialisieren (msgspec/orjson, falls installiert) statt json=...
+        content = dumps(json) if json is not None else None
+
+        import httpx  # lazy (nach dem ersten Aufruf nur ein sys.modules-Lookup)
 
         try:
             response = await self._client.request(
@@ -84,7 +121,8 @@ class SAPB1API:
                 url=url,
                 headers=headers,
                 params=params,
-                json=json,
+                content=content,
+                timeout=self._timeout,
             )
         except httpx.HTTPError as exc:
             raise SAPB1APIError(
@@ -93,7 +131,7 @@ class SAPB1API:
 
         if response.status_code >= 400:
             try:
-                body = response.json()
+                body = loads(response.content)
             except ValueError:
                 body = response.text
 
@@ -105,12 +143,170 @@ class SAPB1API:
 
         if response.content:
             try:
-                return response.json()
+                return loads(response.content)
             except ValueError:
                 return response.text
 
         return None
 
+    # ----------------------------------------------------------
+    # OData $batch
+    # ----------------------------------------------------------
+
+    async def batch_upsert(self, operations: Sequence[BatchOperation]) -> List[Any]:
+        """
+        Führt viele Schreib-Operationen über POST /$batch aus (max.
+        SAP_B1_BATCH_LIMIT pro Request).
+
+        Die Service Layer erlaubt nur eine Änderung pro Changeset → jede
+        Operation bekommt ihr eigenes Changeset, alle in einem Batch.
+
+        Ergebnisse in Reihenfolge der operations: dekodierter Body (oder None)
+        bei Erfolg, SAPB1APIError-Instanz bei Fehlern der einzelnen Operation
+        (wie asyncio.gather(..., return_exceptions=True)).
+        """
+        results: List[Any] = []
+        for start in range(0, len(operations), SAP_B1_BATCH_LIMIT):
+            results.extend(
+                await self._send_batch(operations[start:start + SAP_B1_BATCH_LIMIT])
+            )
+        return results
+
+    async def batch_upsert_business_partners(
+        self,
+        items: Sequence[Tuple[Mapping[str, Any], Optional[str]]],
+    ) -> List[Any]:
+        """
+        (data, bp_code)-Paare wie bei upsert_business_partner, gesammelt
+        in $batch-Requests.
+        """
+        return await self.batch_upsert(
+            [
+                ("PATCH" if bp_code else "POST", _business_partner_path(bp_code), data)
+                for data, bp_code in items
+            ]
+        )
+
+    async def _send_batch(self, operations: Sequence[BatchOperation]) -> List[Any]:
+        if self._credentials.is_expired():
+            raise SAPB1AuthError("SAP B1 Session ist abgelaufen.")
+
+        boundary = f"batch_{uuid4().hex}"
+        headers = self._credentials.build_headers(
+            extra={"Content-Type": f"multipart/mixed; boundary={boundary}"}
+        )
+
+        import httpx  # lazy, s. _request
+
+        try:
+            response = await self._client.post(
+                self._batch_url,
+                headers=headers,
+                content=self._build_batch_body(boundary, operations),
+                timeout=self._timeout,
+            )
+        except httpx.HTTPError as exc:
+            raise SAPB1APIError(
+                f"HTTP-Fehler bei Batch-Request an SAP B1: {exc!r}"
+            ) from exc
+
+        if response.status_code >= 400:
+            try:
+                body = loads(response.content)
+            except ValueError:
+                body = response.text
+
+            raise SAPB1APIError(
+                message=f"SAP B1 antwortet auf $batch mit Status {response.status_code}",
+                status_code=response.status_code,
+                response_body=body,
+            )
+
+        parts = _parse_batch_response(
+            response.headers.get("content-type", "").encode("latin-1"),
+            response.content,
+        )
+        if len(parts) != len(operations):
+            raise SAPB1APIError(
+                message=(
+                    f"SAP B1 $batch lieferte {len(parts)} Antworten "
+                    f"für {len(operations)} Operationen"
+                ),
+                status_code=response.status_code,
+                response_body=response.text,
+            )
+
+        results: List[Any] = []
+        for status, body in parts:
+            if status >= 400:
+                results.append(
+                    SAPB1APIError(
+                        message=f"SAP B1 antwortet mit Status {status}",
+                        status_code=status,
+                        response_body=body,
+                    )
+                )
+            else:
+                results.append(body)
+        return results
+
+    def _build_batch_body(
+        self,
+        boundary: str,
+        operations: Sequence[BatchOperation],
+    ) -> bytes:
+        chunks: List[bytes] = []
+        for method, path, data in operations:
+            changeset = f"changeset_{uuid4().hex}"
+            request_head = f"{method.upper()} {self._service_root}/{path.lstrip('/')} HTTP/1.1\r\n"
+            if data is not None:
+                request_head += "Content-Type: application/json\r\n"
+            chunks.append(
+                (
+                    f"--{boundary}\r\n"
+                    f"Content-Type: multipart/mixed; boundary={changeset}\r\n\r\n"
+                    f"--{changeset}\r\n"
+                    "Content-Type: application/http\r\n"
+                    "Content-Transfer-Encoding: binary\r\n\r\n"
+                    f"{request_head}\r\n"
+                ).encode("utf-8")
+            )
+            if data is not None:
+                chunks.append(dumps(data))
+            chunks.append(f"\r\n--{changeset}--\r\n".encode("utf-8"))
+        chunks.append(f"--{boundary}--\r\n".encode("utf-8"))
+        return b"".join(chunks)
+
+    # ----------------------------------------------------------
+    # Parallele Einzel-Calls
+    # ----------------------------------------------------------
+
+    async def gather_upserts(
+        self,
+        ops: Sequence[Callable[[], Awaitable[Any]]],
+        max_concurrency: int = 8,
+    ) -> List[Any]:
+        """
+        Führt Einzel-Calls (z.B. lambda: api.upsert_opportunity(...) oder
+        get_opportunity) überlappend aus, max. max_concurrency gleichzeitig.
+        Die Requests laufen über den gemeinsamen Client (sap_b1/http.py) –
+        mit HTTP/2 gemultiplext über eine Verbindung, sonst über den
+        Keep-Alive-Pool → Gesamtlatenz ~max statt Summe der Einzel-Calls.
+
+        Für reine Schreib-Operationen ist batch_upsert (ein $batch-Request)
+        meist günstiger; gather_upserts ist für Reads und gemischte Calls.
+
+        Ergebnisse in Reihenfolge der ops; Fehler werden als Exception-Instanz
+        zurückgegeben (return_exceptions=True).
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _run(op: Callable[[], Awaitable[Any]]) -> Any:
+            async with semaphore:
+                return await op()
+
+        return list(await asyncio.gather(*(_run(op) for op in ops), return_exceptions=True))
+
     # ----------------------------------------------------------
     # High-Level Convenience-Methoden
     # (BusinessPartner, ContactEmployee, SalesOpportunities)
@@ -129,13 +325,8 @@ class SAPB1API:
           PATCH  /BusinessPartners('<CardCode>')
         """
         if bp_code:
-            path = f"BusinessPartners('{bp_code}')"
-            method = "PATCH"
-        else:
-            path = "BusinessPartners"
-            method = "POST"
-
-        return await self._request(method, path, json=data)
+            return await self._request("PATCH", self._bp_url(bp_code), json=data)
+        return await self._request("POST", self._bp_coll, json=data)
 
     async def upsert_contact_person(
         self,
@@ -147,13 +338,10 @@ class SAPB1API:
         Je nach Setup braucht man hier u.U. andere Schlüssel.
         """
         if contact_code is not None:
-            path = f"ContactEmployees({contact_code})"
-            method = "PATCH"
-        else:
-            path = "ContactEmployees"
-            method = "POST"
-
-        return await self._request(method, path, json=data)
+            return await self._request(
+                "PATCH", f"{self._ce_coll}({int(contact_code)})", json=data
+            )
+        return await self._request("POST", self._ce_coll, json=data)
 
     async def upsert_opportunity(
         self,
@@ -164,17 +352,92 @@ class SAPB1API:
         Vereinfachter Upsert für SalesOpportunities.
         """
         if op_id is not None:
-            path = f"SalesOpportunities({op_id})"
-            method = "PATCH"
-        else:
-            path = "SalesOpportunities"
-            method = "POST"
-
-        return await self._request(method, path, json=data)
+            return await self._request(
+                "PATCH", f"{self._so_coll}({int(op_id)})", json=data
+            )
+        return await self._request("POST", self._so_coll, json=data)
 
     async def get_opportunity(self, op_id: int) -> Any:
         """
         Holt eine SalesOpportunity.
         """
-        path = f"SalesOpportunities({op_id})"
-        return await self._request("GET", path)
+        return await self._request("GET", f"{self._so_coll}({int(op_id)})")
+
+
+# SAPB1API-Instanzen pro SAP-Session; leben nur so lange, wie ein
+# SAPB1CRMClient sie referenziert.
+_API_CACHE: "WeakValueDictionary[Tuple[Optional[str], Optional[str], Optional[str]], SAPB1API]" = (
+    WeakValueDictionary()
+)
+
+
+def get_or_create_api(credentials: SAPB1Credentials) -> SAPB1API:
+    """
+    Liefert eine geteilte SAPB1API für (base_url, company_db, session_id).
+    """
+    key = (credentials.base_url, credentials.company_db, credentials.session_id)
+    api = _API_CACHE.get(key)
+    if api is None:
+        api = SAPB1API(credentials)
+        _API_CACHE[key] = api
+    return api
+
+
+def _business_partner_path(bp_code: Optional[str]) -> str:
+    return f"BusinessPartners({_odata_string_key(bp_code)})" if bp_code else "BusinessPartners"
+
+
+def _odata_string_key(value: str) -> str:
+    """
+    OData-String-Key für die URL: ' im Literal verdoppeln, dann
+    prozentkodieren (CardCodes dürfen ', /, Leerzeichen, ... enthalten).
+    """
+    return quote("'" + value.replace("'", "''") + "'", safe="'")
+
+
+# ----------------------------------------------------------------------
+# $batch-Antwort (multipart/mixed, Changesets verschachtelt) zerlegen
+# ----------------------------------------------------------------------
+
+
+def _parse_batch_response(content_type: bytes, payload: bytes) -> List[Tuple[int, Any]]:
+    """
+    Liefert (Status, Body) je Operation in Antwort-Reihenfolge; ein Changeset
+    (multipart/mixed) wird rekursiv aufgelöst.
+    """
+    match = _BOUNDARY_RE.search(content_type)
+    if not match:
+        return []
+
+    results: List[Tuple[int, Any]] = []
+    for part in _split_multipart(payload, match.group(1)):
+        part_headers, _, part_body = part.partition(b"\r\n\r\n")
+        if b"multipart/mixed" in part_headers.lower():
+            results.extend(_parse_batch_response(part_headers, part_body))
+        else:
+            results.append(_parse_http_response(part_body))
+    return results
+
+
+def _split_multipart(payload: bytes, boundary: bytes) -> List[bytes]:
+    delimiter = b"--" + boundary
+    parts: List[bytes] = []
+    for raw in payload.split(delimiter)[1:]:  # [0] = Preamble
+        if raw.startswith(b"--"):  # Schluss-Delimiter
+            break
+        parts.append(raw.strip(b"\r\n"))
+    return parts
+
+
+def _parse_http_response(raw: bytes) -> Tuple[int, Any]:
+    head, _, body = raw.partition(b"\r\n\r\n")
+    match = _STATUS_RE.match(head)
+    status = int(match.group(1)) if match else 500
+
+    body = body.strip()
+    if not body:
+        return status, None
+    try:
+        return status, loads(body)
+    except ValueError:
+        return status, body.decode("utf-8", errors="replace")
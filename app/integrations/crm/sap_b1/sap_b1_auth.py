@@ -1,9 +1,11 @@
 # app/integrations/crm/sap_b1/sap_b1_auth.py
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
-from typing import Mapping, Optional, Any, Dict
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Mapping, Optional, Any, Tuple
 
 
 class SAPB1AuthError(RuntimeError):
@@ -13,11 +15,14 @@ class SAPB1AuthError(RuntimeError):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class SAPB1Credentials:
     """
     Typisierte Repräsentation der SAP Business One (Service Layer) Credentials.
 
+    slots=True: kein __dict__ pro Instanz (eine Instanz pro Tenant). Nicht
+    frozen, da Header-/Ablauf-Cache und Session-Felder mutiert werden.
+
     Typischer Service-Layer-Flow:
       - base_url: z.B. https://sap-server:50000
       - company_db: Name der Company-DB
@@ -36,6 +41,23 @@ class SAPB1Credentials:
     username: Optional[str] = None
     password: Optional[str] = None
 
+    # Header-Template (schreibgeschützt, per Referenz an httpx) – wird nur neu
+    # gebaut (und validiert), wenn sich session_id oder company_db ändern.
+    _headers_template: Optional[Mapping[str, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _headers_key: Optional[Tuple[Optional[str], Optional[str]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # Ablauf als time.monotonic()-Deadline, einmal pro expires_at-Wert berechnet
+    _expiry_deadline: Optional[float] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _expiry_source: Optional[datetime] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     @classmethod
     def from_mapping(cls, data: Mapping[str, Any]) -> "SAPB1Credentials":
         """
@@ -77,12 +99,16 @@ class SAPB1Credentials:
         Prüft, ob die Session abgelaufen ist – mit etwas Zeitpuffer.
         Wenn kein expires_at gesetzt ist, gehen wir von "nicht abgelaufen" aus.
         """
-        if not self.expires_at:
+        expires_at = self.expires_at
+        if expires_at is None:
             return False
 
-        now = datetime.now(timezone.utc)
-        skew = timedelta(seconds=skew_seconds)
-        return now + skew >= self.expires_at
+        if self._expiry_deadline is None or self._expiry_source is not expires_at:
+            remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+            self._expiry_deadline = time.monotonic() + remaining
+            self._expiry_source = expires_at
+
+        return time.monotonic() + skew_seconds >= self._expiry_deadline
 
     def require_valid_for_request(self) -> None:
         """
@@ -100,20 +126,26 @@ class SAPB1Credentials:
     def build_headers(
         self,
         extra: Optional[Mapping[str, str]] = None,
-    ) -> Dict[str, str]:
+    ) -> Mapping[str, str]:
         """
         Baut HTTP-Header für einen Request an die SAP B1 Service Layer API.
-        """
-        self.require_valid_for_request()
 
-        headers: Dict[str, str] = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            # Service Layer nutzt B1SESSION Cookie
-            "Cookie": f"B1SESSION={self.session_id}; CompanyDB={self.company_db}",
-        }
+        Ohne extra: gecachtes, schreibgeschütztes Template.
+        Mit extra: neue Kopie inkl. extra.
+        """
+        key = (self.session_id, self.company_db)
+        if self._headers_template is None or self._headers_key != key:
+            self.require_valid_for_request()
+            self._headers_template = MappingProxyType(
+                {
+                    "Content-Type": "application/json",
+                    "Accept": "application/json",
+                    # Service Layer nutzt B1SESSION Cookie
+                    "Cookie": f"B1SESSION={self.session_id}; CompanyDB={self.company_db}",
+                }
+            )
+            self._headers_key = key
 
         if extra:
-            headers.update(extra)
-
-        return headers
+            return {**self._headers_template, **extra}
+        return self._headers_template
@@ -1,7 +1,8 @@
 # app/integrations/crm/sap_b1/sap_b1_client.py
 from __future__ import annotations
 
-from typing import Any, Mapping, Optional, Dict
+from functools import cached_property
+from typing import Any, Dict, Mapping, Optional
 from uuid import UUID
 
 from ..crm_client import CRMClient
@@ -19,7 +20,7 @@ from ..crm_client_factory import (
     register_crm_client,
 )
 from .sap_b1_auth import SAPB1Credentials
-from .sap_b1_api import SAPB1API
+from .sap_b1_api import SAPB1API, get_or_create_api
 
 
 class SAPB1CRMClient(CRMClient):
@@ -35,11 +36,19 @@ class SAPB1CRMClient(CRMClient):
     def __init__(self, tenant_id: UUID, credentials: Mapping[str, Any]) -> None:
         super().__init__(tenant_id)
 
-        self._credentials_raw: Dict[str, Any] = dict(credentials)
+        # Nur die typisierte Form behalten – keine Kopie des Roh-Mappings pro Tenant
         self._credentials = SAPB1Credentials.from_mapping(credentials)
 
-        # API-Client (aktuell ungenutzt, aber vorbereitet)
-        self._api = SAPB1API(self._credentials)
+        # Stub-Fehler pro code einmal bauen (details sind pro Tenant konstant)
+        self._not_implemented_errors: Dict[str, CRMSyncError] = {}
+
+    @cached_property
+    def _api(self) -> SAPB1API:
+        """
+        API-Client (aktuell ungenutzt, aber vorbereitet) – erst beim ersten
+        Zugriff gebaut und mit anderen Clients derselben SAP-Session geteilt.
+        """
+        return get_or_create_api(self._credentials)
 
     # ------------------------------------------------------------------
     # CRMClient Interface
@@ -149,21 +158,24 @@ class SAPB1CRMClient(CRMClient):
         code: str,
         message: str,
     ) -> CRMSyncResult:
+        error = self._not_implemented_errors.get(code)
+        if error is None:
+            error = CRMSyncError(
+                code=code,
+                message=message,
+                details={
+                    "tenant_id": str(self._tenant_id),
+                },
+            )
+            self._not_implemented_errors[code] = error
+
         return CRMSyncResult(
             success=False,
-            crm_system=self.system,
+            crm_system=CRMSystem.SAP_B1,
             crm_object_type=crm_object_type,
             crm_id=None,
             leadlane_id=leadlane_id,
-            errors=[
-                CRMSyncError(
-                    code=code,
-                    message=message,
-                    details={
-                        "tenant_id": str(self._tenant_id),
-                    },
-                )
-            ],
+            errors=[error],
             raw_response=None,
         )
 
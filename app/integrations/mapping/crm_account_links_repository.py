@@ -1,20 +1,164 @@
 # app/integrations/crm/mapping/crm_account_links_repository.py
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional, List
+import functools
+from dataclasses import dataclass, replace
+from datetime import datetime
+from operator import itemgetter
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 from uuid import UUID
 
 from app.integrations.crm.crm_types import CRMSystem
 from app.db.database import Database
+from app.integrations.mapping.link_bulk_upsert import bulk_upsert_link_rows, bulk_upsert_sql
+from app.integrations.mapping.link_cache import LinkLookupCache
 
+# (leadlane_id, crm_id) aus einer Row – Key-Lookups laufen in C
+_ROW_IDS = itemgetter("leadlane_sub_company_id", "crm_account_id")
 
-@dataclass
+
+def _row_ids(row: Mapping[str, Any]) -> Tuple[str, str]:
+    # (leadlane_id, crm_id) immer als str: bei uuid-Spalten liefert asyncpg
+    # UUID-Objekte, Aufrufer und _link_cache arbeiten mit str-IDs
+    leadlane_id, crm_id = _ROW_IDS(row)
+    return str(leadlane_id), str(crm_id)
+
+
+@dataclass(slots=True, frozen=True)
 class CRMAccountLink:
     tenant_id: UUID
     crm_system: CRMSystem
     leadlane_sub_company_id: str
     crm_account_id: str
+    # occurredAt des zuletzt verarbeiteten CRM-Webhook-Events (naive UTC);
+    # nur von get_many_by_crm_ids geladen, sonst None
+    last_event_at: Optional[datetime] = None
+
+    @property
+    def leadlane_sub_company_uuid(self) -> UUID:
+        """
+        leadlane_sub_company_id als UUID (z.B. für CompanyRepository). Das
+        Parsen ist pro ID einmal gecacht – Links kommen größtenteils aus
+        _link_cache und werden pro Webhook-Event erneut aufgelöst.
+        """
+        return _parse_uuid(self.leadlane_sub_company_id)
+
+
+@functools.lru_cache(maxsize=50_000)
+def _parse_uuid(value: str) -> UUID:
+    return UUID(value)
+
+
+# Prozessweit (Repositories werden pro Request gebaut), analog tenant_list_cache
+_link_cache: LinkLookupCache[CRMAccountLink] = LinkLookupCache(ttl_seconds=300.0)
+
+
+def _cache_link(tenant_id: UUID, crm_system: CRMSystem, link: CRMAccountLink) -> None:
+    """
+    _link_cache.put, aber ein bekanntes last_event_at des gecachten Links
+    (gleiche CRM-ID) bleibt erhalten – Links aus Upsert/Lookup-Pfaden laden
+    es nicht und würden den Out-of-order-Schutz im Webhook sonst aushebeln.
+    """
+    if link.last_event_at is None:
+        cached = _link_cache.get_by_leadlane(tenant_id, crm_system, link.leadlane_sub_company_id)
+        if (
+            cached is not None
+            and cached.last_event_at is not None
+            and cached.crm_account_id == link.crm_account_id
+        ):
+            link = replace(link, last_event_at=cached.last_event_at)
+    _link_cache.put(tenant_id, crm_system, link.leadlane_sub_company_id, link.crm_account_id, link)
+
+
+# ---------------------------------------------------------------------------
+# SQL (Modul-Konstanten: einmal gebaut, stabiler Key für den Query-Compile-
+# Cache in Database und den Statement-Cache von asyncpg)
+# ---------------------------------------------------------------------------
+
+_SQL_UPSERT = """
+    INSERT INTO tmpl_c_db_crm_account_links (
+        tenant_id,
+        crm_system,
+        leadlane_sub_company_id,
+        crm_account_id
+    )
+    VALUES (:tenant_id, :crm_system, :leadlane_sub_company_id, :crm_account_id)
+    ON CONFLICT (tenant_id, crm_system, leadlane_sub_company_id)
+    DO UPDATE SET crm_account_id = EXCLUDED.crm_account_id
+    RETURNING tenant_id, crm_system, leadlane_sub_company_id, crm_account_id;
+"""
+
+_SQL_UPSERT_NO_RETURNING = """
+    INSERT INTO tmpl_c_db_crm_account_links (
+        tenant_id,
+        crm_system,
+        leadlane_sub_company_id,
+        crm_account_id
+    )
+    VALUES (:tenant_id, :crm_system, :leadlane_sub_company_id, :crm_account_id)
+    ON CONFLICT (tenant_id, crm_system, leadlane_sub_company_id)
+    DO UPDATE SET crm_account_id = EXCLUDED.crm_account_id
+    WHERE tmpl_c_db_crm_account_links.crm_account_id IS DISTINCT FROM EXCLUDED.crm_account_id;
+"""
+
+_SQL_GET_BY_LEADLANE_ID = """
+    SELECT tenant_id, crm_system, leadlane_sub_company_id, crm_account_id
+    FROM tmpl_c_db_crm_account_links
+    WHERE tenant_id = :tenant_id
+      AND crm_system = :crm_system
+      AND leadlane_sub_company_id = :leadlane_sub_company_id;
+"""
+
+_SQL_GET_BY_CRM_ID = """
+    SELECT tenant_id, crm_system, leadlane_sub_company_id, crm_account_id
+    FROM tmpl_c_db_crm_account_links
+    WHERE tenant_id = :tenant_id
+      AND crm_system = :crm_system
+      AND crm_account_id = :crm_account_id;
+"""
+
+_SQL_GET_MANY_BY_LEADLANE_IDS = """
+    SELECT tenant_id, crm_system, leadlane_sub_company_id, crm_account_id
+    FROM tmpl_c_db_crm_account_links
+    WHERE tenant_id = :tenant_id
+      AND crm_system = :crm_system
+      AND leadlane_sub_company_id = ANY(:ids);
+"""
+
+_SQL_GET_MANY_BY_CRM_IDS = """
+    SELECT tenant_id, crm_system, leadlane_sub_company_id, crm_account_id, last_event_at
+    FROM tmpl_c_db_crm_account_links
+    WHERE tenant_id = :tenant_id
+      AND crm_system = :crm_system
+      AND crm_account_id = ANY(:ids);
+"""
+
+# Nur vorwärts: ein älteres Event setzt last_event_at nie zurück
+_SQL_UPDATE_LAST_EVENT_AT_MANY = """
+    UPDATE tmpl_c_db_crm_account_links AS l
+    SET last_event_at = u.last_event_at
+    FROM unnest(
+        CAST(:crm_account_ids AS text[]),
+        CAST(:last_event_ats AS timestamp[])
+    ) AS u(crm_account_id, last_event_at)
+    WHERE l.tenant_id = :tenant_id
+      AND l.crm_system = :crm_system
+      AND l.crm_account_id = u.crm_account_id
+      AND (l.last_event_at IS NULL OR l.last_event_at < u.last_event_at);
+"""
+
+_SQL_LIST_FOR_TENANT_AND_SYSTEM = """
+    SELECT tenant_id, crm_system, leadlane_sub_company_id, crm_account_id
+    FROM tmpl_c_db_crm_account_links
+    WHERE tenant_id = :tenant_id
+      AND crm_system = :crm_system
+    ORDER BY leadlane_sub_company_id
+    LIMIT :limit OFFSET :offset;
+"""
+
+_SQL_BULK_UPSERT = bulk_upsert_sql(
+    "tmpl_c_db_crm_account_links", "leadlane_sub_company_id", "crm_account_id"
+)
 
 
 class CRMAccountLinksRepository:
@@ -24,6 +168,26 @@ class CRMAccountLinksRepository:
 
     def __init__(self, db: Database) -> None:
         self._db = db
+        # asyncpg bindet UUIDs nativ (16 Byte binär) – str() nur für andere
+        # Database-Implementierungen nötig.
+        self._bind_uuid_native = isinstance(db, Database)
+
+    def _tenant_param(self, tenant_id: UUID) -> Any:
+        if self._bind_uuid_native:
+            return tenant_id
+        return self._tenant_str(tenant_id)
+
+    # Param-Binding: Enum-.value und UUID.__str__ (hexlify) einmal pro Wert
+    # statt bei jedem Query.
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def _sys_value(crm_system: CRMSystem) -> str:
+        return crm_system.value
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _tenant_str(tenant_id: UUID) -> str:
+        return str(tenant_id)
 
     async def upsert_link(
         self,
@@ -35,33 +199,78 @@ class CRMAccountLinksRepository:
         """
         Speichert oder aktualisiert den Link zwischen LeadLane-Company und CRM-Account.
         """
-        query = """
-        INSERT INTO tmpl_c_db_crm_account_links (
-            tenant_id,
-            crm_system,
-            leadlane_sub_company_id,
-            crm_account_id
+        row = await self._db.fetch_one(
+            _SQL_UPSERT,
+            {
+                "tenant_id": self._tenant_param(tenant_id),
+                "crm_system": self._sys_value(crm_system),
+                "leadlane_sub_company_id": leadlane_sub_company_id,
+                "crm_account_id": crm_account_id,
+            },
+        )
+        link = CRMAccountLink(
+            tenant_id=tenant_id,
+            crm_system=crm_system,
+            leadlane_sub_company_id=str(row["leadlane_sub_company_id"]),
+            crm_account_id=str(row["crm_account_id"]),
         )
-        VALUES (:tenant_id, :crm_system, :leadlane_sub_company_id, :crm_account_id)
-        ON CONFLICT (tenant_id, crm_system, leadlane_sub_company_id)
-        DO UPDATE SET crm_account_id = EXCLUDED.crm_account_id
-        RETURNING tenant_id, crm_system, leadlane_sub_company_id, crm_account_id;
+        _cache_link(tenant_id, crm_system, link)
+        return link
+
+    async def upsert_link_fire_and_forget(
+        self,
+        tenant_id: UUID,
+        crm_system: CRMSystem,
+        leadlane_sub_company_id: str,
+        crm_account_id: str,
+    ) -> CRMAccountLink:
         """
-        row = await self._db.fetch_one(
-            query,
+        Wie upsert_link, aber ohne RETURNING (execute statt fetch_one).
+        Der Link wird lokal aus den Eingaben gebaut – die sind maßgeblich.
+        Unveränderte Links (gleiche CRM-ID) schreibt die DB nicht erneut
+        (kein neues Tupel/WAL, siehe WHERE im ON CONFLICT).
+        """
+        await self._db.execute(
+            _SQL_UPSERT_NO_RETURNING,
             {
-                "tenant_id": str(tenant_id),
-                "crm_system": crm_system.value,
+                "tenant_id": self._tenant_param(tenant_id),
+                "crm_system": self._sys_value(crm_system),
                 "leadlane_sub_company_id": leadlane_sub_company_id,
                 "crm_account_id": crm_account_id,
             },
         )
-        return CRMAccountLink(
+        link = CRMAccountLink(
             tenant_id=tenant_id,
             crm_system=crm_system,
-            leadlane_sub_company_id=row["leadlane_sub_company_id"],
-            crm_account_id=row["crm_account_id"],
+            leadlane_sub_company_id=leadlane_sub_company_id,
+            crm_account_id=crm_account_id,
+        )
+        _cache_link(tenant_id, crm_system, link)
+        return link
+
+    async def bulk_upsert_links(
+        self,
+        tenant_id: UUID,
+        crm_system: CRMSystem,
+        pairs: Sequence[Tuple[str, str]],
+    ) -> List[CRMAccountLink]:
+        """
+        Multi-Row-Variante von upsert_link: pairs = [(leadlane_sub_company_id, crm_account_id), ...].
+        Ein Statement (unnest) für alle Links statt ein Round-Trip pro Link;
+        doppelte leadlane_sub_company_id fasst bulk_upsert_link_rows zusammen
+        (letzter gewinnt).
+        """
+        rows = await bulk_upsert_link_rows(
+            self._db,
+            _SQL_BULK_UPSERT,
+            tenant_id=self._tenant_param(tenant_id),
+            crm_system=self._sys_value(crm_system),
+            pairs=pairs,
         )
+        links = [CRMAccountLink(tenant_id, crm_system, *_row_ids(row)) for row in rows]
+        for link in links:
+            _cache_link(tenant_id, crm_system, link)
+        return links
 
     async def get_by_leadlane_id(
         self,
@@ -69,30 +278,32 @@ class CRMAccountLinksRepository:
         crm_system: CRMSystem,
         leadlane_sub_company_id: str,
     ) -> Optional[CRMAccountLink]:
-        query = """
-        SELECT tenant_id, crm_system, leadlane_sub_company_id, crm_account_id
-        FROM tmpl_c_db_crm_account_links
-        WHERE tenant_id = :tenant_id
-          AND crm_system = :crm_system
-          AND leadlane_sub_company_id = :leadlane_sub_company_id;
         """
+        Treffer kommen bis zu 5 Minuten aus dem Prozess-Cache (_link_cache).
+        """
+        cached = _link_cache.get_by_leadlane(tenant_id, crm_system, leadlane_sub_company_id)
+        if cached is not None:
+            return cached
+
         row = await self._db.fetch_one(
-            query,
+            _SQL_GET_BY_LEADLANE_ID,
             {
-                "tenant_id": str(tenant_id),
-                "crm_system": crm_system.value,
+                "tenant_id": self._tenant_param(tenant_id),
+                "crm_system": self._sys_value(crm_system),
                 "leadlane_sub_company_id": leadlane_sub_company_id,
             },
         )
         if not row:
             return None
 
-        return CRMAccountLink(
+        link = CRMAccountLink(
             tenant_id=tenant_id,
             crm_system=crm_system,
-            leadlane_sub_company_id=row["leadlane_sub_company_id"],
-            crm_account_id=row["crm_account_id"],
+            leadlane_sub_company_id=str(row["leadlane_sub_company_id"]),
+            crm_account_id=str(row["crm_account_id"]),
         )
+        _cache_link(tenant_id, crm_system, link)
+        return link
 
     async def get_by_crm_id(
         self,
@@ -100,30 +311,156 @@ class CRMAccountLinksRepository:
         crm_system: CRMSystem,
         crm_account_id: str,
     ) -> Optional[CRMAccountLink]:
-        query = """
-        SELECT tenant_id, crm_system, leadlane_sub_company_id, crm_account_id
-        FROM tmpl_c_db_crm_account_links
-        WHERE tenant_id = :tenant_id
-          AND crm_system = :crm_system
-          AND crm_account_id = :crm_account_id;
         """
+        Treffer kommen bis zu 5 Minuten aus dem Prozess-Cache (_link_cache).
+        """
+        cached = _link_cache.get_by_crm(tenant_id, crm_system, crm_account_id)
+        if cached is not None:
+            return cached
+
         row = await self._db.fetch_one(
-            query,
+            _SQL_GET_BY_CRM_ID,
             {
-                "tenant_id": str(tenant_id),
-                "crm_system": crm_system.value,
+                "tenant_id": self._tenant_param(tenant_id),
+                "crm_system": self._sys_value(crm_system),
                 "crm_account_id": crm_account_id,
             },
         )
         if not row:
             return None
 
-        return CRMAccountLink(
+        link = CRMAccountLink(
             tenant_id=tenant_id,
             crm_system=crm_system,
-            leadlane_sub_company_id=row["leadlane_sub_company_id"],
-            crm_account_id=row["crm_account_id"],
+            leadlane_sub_company_id=str(row["leadlane_sub_company_id"]),
+            crm_account_id=str(row["crm_account_id"]),
+        )
+        _cache_link(tenant_id, crm_system, link)
+        return link
+
+    async def get_many_by_leadlane_ids(
+        self,
+        tenant_id: UUID,
+        crm_system: CRMSystem,
+        leadlane_sub_company_ids: Sequence[str],
+    ) -> Dict[str, CRMAccountLink]:
+        """
+        Batch-Variante von get_by_leadlane_id (ein Round-Trip statt N).
+        Ergebnis: leadlane_sub_company_id -> Link; IDs ohne Link fehlen im dict.
+        Wie get_by_leadlane_id zuerst aus _link_cache, nur Misses aus der DB.
+        """
+        found: Dict[str, CRMAccountLink] = {}
+        missing: List[str] = []
+        for leadlane_id in dict.fromkeys(leadlane_sub_company_ids):
+            cached = _link_cache.get_by_leadlane(tenant_id, crm_system, leadlane_id)
+            if cached is not None:
+                found[leadlane_id] = cached
+            else:
+                missing.append(leadlane_id)
+
+        if not missing:
+            return found
+
+        rows = await self._db.fetch_all(
+            _SQL_GET_MANY_BY_LEADLANE_IDS,
+            {
+                "tenant_id": self._tenant_param(tenant_id),
+                "crm_system": self._sys_value(crm_system),
+                "ids": missing,
+            },
+        )
+        for row in rows:
+            link = CRMAccountLink(
+                tenant_id=tenant_id,
+                crm_system=crm_system,
+                leadlane_sub_company_id=str(row["leadlane_sub_company_id"]),
+                crm_account_id=str(row["crm_account_id"]),
+            )
+            _cache_link(tenant_id, crm_system, link)
+            found[link.leadlane_sub_company_id] = link
+        return found
+
+    async def get_many_by_crm_ids(
+        self,
+        tenant_id: UUID,
+        crm_system: CRMSystem,
+        crm_account_ids: Sequence[str],
+    ) -> Dict[str, CRMAccountLink]:
+        """
+        Batch-Variante von get_by_crm_id. Ergebnis: crm_account_id -> Link.
+        Wie get_by_crm_id zuerst aus _link_cache, nur Misses aus der DB.
+        """
+        found: Dict[str, CRMAccountLink] = {}
+        missing: List[str] = []
+        for crm_id in dict.fromkeys(crm_account_ids):
+            cached = _link_cache.get_by_crm(tenant_id, crm_system, crm_id)
+            if cached is not None:
+                found[crm_id] = cached
+            else:
+                missing.append(crm_id)
+
+        if not missing:
+            return found
+
+        rows = await self._db.fetch_all(
+            _SQL_GET_MANY_BY_CRM_IDS,
+            {
+                "tenant_id": self._tenant_param(tenant_id),
+                "crm_system": self._sys_value(crm_system),
+                "ids": missing,
+            },
         )
+        for row in rows:
+            link = CRMAccountLink(
+                tenant_id, crm_system, *_row_ids(row), last_event_at=row.get("last_event_at")
+            )
+            _cache_link(tenant_id, crm_system, link)
+            found[link.crm_account_id] = link
+        return found
+
+    async def update_last_event_at_many(
+        self,
+        tenant_id: UUID,
+        crm_system: CRMSystem,
+        rows: Sequence[Tuple[str, datetime]],
+    ) -> None:
+        """
+        Setzt last_event_at für rows = [(crm_account_id, occurred_at), ...]
+        (neuester Wert pro Account) in einem UPDATE. Damit erkennt der
+        Webhook-Processor veraltete Events schon am Link, ohne die Company
+        zu laden.
+        """
+        latest: Dict[str, datetime] = {}
+        for crm_id, occurred_at in rows:
+            if crm_id not in latest or latest[crm_id] < occurred_at:
+                latest[crm_id] = occurred_at
+        if not latest:
+            return
+
+        await self._db.execute(
+            _SQL_UPDATE_LAST_EVENT_AT_MANY,
+            {
+                "tenant_id": self._tenant_param(tenant_id),
+                "crm_system": self._sys_value(crm_system),
+                "crm_account_ids": list(latest),
+                "last_event_ats": list(latest.values()),
+            },
+        )
+
+        # Gecachte Links nachziehen (gleiche Regel wie im SQL: nur vorwärts),
+        # sonst prüft der nächste Batch gegen einen veralteten Stand
+        for crm_id, occurred_at in latest.items():
+            cached = _link_cache.get_by_crm(tenant_id, crm_system, crm_id)
+            if cached is not None and (
+                cached.last_event_at is None or cached.last_event_at < occurred_at
+            ):
+                _link_cache.put(
+                    tenant_id,
+                    crm_system,
+                    cached.leadlane_sub_company_id,
+                    crm_id,
+                    replace(cached, last_event_at=occurred_at),
+                )
 
     async def list_for_tenant_and_system(
         self,
@@ -132,29 +469,13 @@ class CRMAccountLinksRepository:
         limit: int = 1000,
         offset: int = 0,
     ) -> List[CRMAccountLink]:
-        query = """
-        SELECT tenant_id, crm_system, leadlane_sub_company_id, crm_account_id
-        FROM tmpl_c_db_crm_account_links
-        WHERE tenant_id = :tenant_id
-          AND crm_system = :crm_system
-        ORDER BY leadlane_sub_company_id
-        LIMIT :limit OFFSET :offset;
-        """
         rows = await self._db.fetch_all(
-            query,
+            _SQL_LIST_FOR_TENANT_AND_SYSTEM,
             {
-                "tenant_id": str(tenant_id),
-                "crm_system": crm_system.value,
+                "tenant_id": self._tenant_param(tenant_id),
+                "crm_system": self._sys_value(crm_system),
                 "limit": limit,
                 "offset": offset,
             },
         )
-        return [
-            CRMAccountLink(
-                tenant_id=tenant_id,
-                crm_system=crm_system,
-                leadlane_sub_company_id=row["leadlane_sub_company_id"],
-                crm_account_id=row["crm_account_id"],
-            )
-            for row in rows
-        ]
+        return [CRMAccountLink(tenant_id, crm_system, *_row_ids(row)) for row in rows]
@@ -1,15 +1,29 @@
 # app/integrations/crm/mapping/crm_contact_links_repository.py
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
-from typing import Optional, List
+from operator import itemgetter
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 from uuid import UUID
 
 from app.integrations.crm.crm_types import CRMSystem
 from app.db.database import Database
+from app.integrations.mapping.link_bulk_upsert import bulk_upsert_link_rows, bulk_upsert_sql
+from app.integrations.mapping.link_cache import LinkLookupCache
 
+# (leadlane_id, crm_id) aus einer Row – Key-Lookups laufen in C
+_ROW_IDS = itemgetter("leadlane_contact_id", "crm_contact_id")
 
-@dataclass
+
+def _row_ids(row: Mapping[str, Any]) -> Tuple[str, str]:
+    # (leadlane_id, crm_id) immer als str: bei uuid-Spalten liefert asyncpg
+    # UUID-Objekte, Aufrufer und _link_cache arbeiten mit str-IDs
+    leadlane_id, crm_id = _ROW_IDS(row)
+    return str(leadlane_id), str(crm_id)
+
+
+@dataclass(slots=True, frozen=True)
 class CRMContactLink:
     tenant_id: UUID
     crm_system: CRMSystem
@@ -17,6 +31,87 @@ class CRMContactLink:
     crm_contact_id: str
 
 
+# Prozessweit (Repositories werden pro Request gebaut), analog tenant_list_cache
+_link_cache: LinkLookupCache[CRMContactLink] = LinkLookupCache(ttl_seconds=300.0)
+
+
+# ---------------------------------------------------------------------------
+# SQL (Modul-Konstanten: einmal gebaut, stabiler Key für den Query-Compile-
+# Cache in Database und den Statement-Cache von asyncpg)
+# ---------------------------------------------------------------------------
+
+_SQL_UPSERT = """
+    INSERT INTO tmpl_c_db_crm_contact_links (
+        tenant_id,
+        crm_system,
+        leadlane_contact_id,
+        crm_contact_id
+    )
+    VALUES (:tenant_id, :crm_system, :leadlane_contact_id, :crm_contact_id)
+    ON CONFLICT (tenant_id, crm_system, leadlane_contact_id)
+    DO UPDATE SET crm_contact_id = EXCLUDED.crm_contact_id
+    RETURNING tenant_id, crm_system, leadlane_contact_id, crm_contact_id;
+"""
+
+_SQL_UPSERT_NO_RETURNING = """
+    INSERT INTO tmpl_c_db_crm_contact_links (
+        tenant_id,
+        crm_system,
+        leadlane_contact_id,
+        crm_contact_id
+    )
+    VALUES (:tenant_id, :crm_system, :leadlane_contact_id, :crm_contact_id)
+    ON CONFLICT (tenant_id, crm_system, leadlane_contact_id)
+    DO UPDATE SET crm_contact_id = EXCLUDED.crm_contact_id
+    WHERE tmpl_c_db_crm_contact_links.crm_contact_id IS DISTINCT FROM EXCLUDED.crm_contact_id;
+"""
+
+_SQL_GET_BY_LEADLANE_ID = """
+    SELECT tenant_id, crm_system, leadlane_contact_id, crm_contact_id
+    FROM tmpl_c_db_crm_contact_links
+    WHERE tenant_id = :tenant_id
+      AND crm_system = :crm_system
+      AND leadlane_contact_id = :leadlane_contact_id;
+"""
+
+_SQL_GET_BY_CRM_ID = """
+    SELECT tenant_id, crm_system, leadlane_contact_id, crm_contact_id
+    FROM tmpl_c_db_crm_contact_links
+    WHERE tenant_id = :tenant_id
+      AND crm_system = :crm_system
+      AND crm_contact_id = :crm_contact_id;
+"""
+
+_SQL_GET_MANY_BY_LEADLANE_IDS = """
+    SELECT tenant_id, crm_system, leadlane_contact_id, crm_contact_id
+    FROM tmpl_c_db_crm_contact_links
+    WHERE tenant_id = :tenant_id
+      AND crm_system = :crm_system
+      AND leadlane_contact_id = ANY(:ids);
+"""
+
+_SQL_GET_MANY_BY_CRM_IDS = """
+    SELECT tenant_id, crm_system, leadlane_contact_id, crm_contact_id
+    FROM tmpl_c_db_crm_contact_links
+    WHERE tenant_id = :tenant_id
+      AND crm_system = :crm_system
+      AND crm_contact_id = ANY(:ids);
+"""
+
+_SQL_LIST_FOR_TENANT_AND_SYSTEM = """
+    SELECT tenant_id, crm_system, leadlane_contact_id, crm_contact_id
+    FROM tmpl_c_db_crm_contact_links
+    WHERE tenant_id = :tenant_id
+      AND crm_system = :crm_system
+    ORDER BY leadlane_contact_id
+    LIMIT :limit OFFSET :offset;
+"""
+
+_SQL_BULK_UPSERT = bulk_upsert_sql(
+    "tmpl_c_db_crm_contact_links", "leadlane_contact_id", "crm_contact_id"
+)
+
+
 class CRMContactLinksRepository:
     """
     Link-Tabelle zwischen LeadLane-Contacts und CRM-Contacts.
@@ -24,6 +119,26 @@ class CRMContactLinksRepository:
 
     def __init__(self, db: Database) -> None:
         self._db = db
+        # asyncpg bindet UUIDs nativ (16 Byte binär) – str() nur für andere
+        # Database-Implementierungen nötig.
+        self._bind_uuid_native = isinstance(db, Database)
+
+    def _tenant_param(self, tenant_id: UUID) -> Any:
+        if self._bind_uuid_native:
+            return tenant_id
+        return self._tenant_str(tenant_id)
+
+    # Param-Binding: Enum-.value und UUID.__str__ (hexlify) einmal pro Wert
+    # statt bei jedem Query.
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def _sys_value(crm_system: CRMSystem) -> str:
+        return crm_system.value
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _tenant_str(tenant_id: UUID) -> str:
+        return str(tenant_id)
 
     async def upsert_link(
         self,
@@ -32,33 +147,78 @@ class CRMContactLinksRepository:
         leadlane_contact_id: str,
         crm_contact_id: str,
     ) -> CRMContactLink:
-        query = """
-        INSERT INTO tmpl_c_db_crm_contact_links (
-            tenant_id,
-            crm_system,
-            leadlane_contact_id,
-            crm_contact_id
+        row = await self._db.fetch_one(
+            _SQL_UPSERT,
+            {
+                "tenant_id": self._tenant_param(tenant_id),
+                "crm_system": self._sys_value(crm_system),
+                "leadlane_contact_id": leadlane_contact_id,
+                "crm_contact_id": crm_contact_id,
+            },
+        )
+        link = CRMContactLink(
+            tenant_id=tenant_id,
+            crm_system=crm_system,
+            leadlane_contact_id=str(row["leadlane_contact_id"]),
+            crm_contact_id=str(row["crm_contact_id"]),
         )
-        VALUES (:tenant_id, :crm_system, :leadlane_contact_id, :crm_contact_id)
-        ON CONFLICT (tenant_id, crm_system, leadlane_contact_id)
-        DO UPDATE SET crm_contact_id = EXCLUDED.crm_contact_id
-        RETURNING tenant_id, crm_system, leadlane_contact_id, crm_contact_id;
+        _link_cache.put(tenant_id, crm_system, link.leadlane_contact_id, link.crm_contact_id, link)
+        return link
+
+    async def upsert_link_fire_and_forget(
+        self,
+        tenant_id: UUID,
+        crm_system: CRMSystem,
+        leadlane_contact_id: str,
+        crm_contact_id: str,
+    ) -> CRMContactLink:
         """
-        row = await self._db.fetch_one(
-            query,
+        Wie upsert_link, aber ohne RETURNING (execute statt fetch_one).
+        Der Link wird lokal aus den Eingaben gebaut – die sind maßgeblich.
+        Unveränderte Links (gleiche CRM-ID) schreibt die DB nicht erneut
+        (kein neues Tupel/WAL, siehe WHERE im ON CONFLICT).
+        """
+        await self._db.execute(
+            _SQL_UPSERT_NO_RETURNING,
             {
-                "tenant_id": str(tenant_id),
-                "crm_system": crm_system.value,
+                "tenant_id": self._tenant_param(tenant_id),
+                "crm_system": self._sys_value(crm_system),
                 "leadlane_contact_id": leadlane_contact_id,
                 "crm_contact_id": crm_contact_id,
             },
         )
-        return CRMContactLink(
+        link = CRMContactLink(
             tenant_id=tenant_id,
             crm_system=crm_system,
-            leadlane_contact_id=row["leadlane_contact_id"],
-            crm_contact_id=row["crm_contact_id"],
+            leadlane_contact_id=leadlane_contact_id,
+            crm_contact_id=crm_contact_id,
+        )
+        _link_cache.put(tenant_id, crm_system, leadlane_contact_id, crm_contact_id, link)
+        return link
+
+    async def bulk_upsert_links(
+        self,
+        tenant_id: UUID,
+        crm_system: CRMSystem,
+        pairs: Sequence[Tuple[str, str]],
+    ) -> List[CRMContactLink]:
+        """
+        Multi-Row-Variante von upsert_link: pairs = [(leadlane_contact_id, crm_contact_id), ...].
+        Ein Statement (unnest) für alle Links statt ein Round-Trip pro Link;
+        doppelte leadlane_contact_id fasst bulk_upsert_link_rows zusammen
+        (letzter gewinnt).
+        """
+        rows = await bulk_upsert_link_rows(
+            self._db,
+            _SQL_BULK_UPSERT,
+            tenant_id=self._tenant_param(tenant_id),
+            crm_system=self._sys_value(crm_system),
+            pairs=pairs,
         )
+        links = [CRMContactLink(tenant_id, crm_system, *_row_ids(row)) for row in rows]
+        for link in links:
+            _link_cache.put(tenant_id, crm_system, link.leadlane_contact_id, link.crm_contact_id, link)
+        return links
 
     async def get_by_leadlane_id(
         self,
@@ -66,30 +226,32 @@ class CRMContactLinksRepository:
         crm_system: CRMSystem,
         leadlane_contact_id: str,
     ) -> Optional[CRMContactLink]:
-        query = """
-        SELECT tenant_id, crm_system, leadlane_contact_id, crm_contact_id
-        FROM tmpl_c_db_crm_contact_links
-        WHERE tenant_id = :tenant_id
-          AND crm_system = :crm_system
-          AND leadlane_contact_id = :leadlane_contact_id;
         """
+        Treffer kommen bis zu 5 Minuten aus dem Prozess-Cache (_link_cache).
+        """
+        cached = _link_cache.get_by_leadlane(tenant_id, crm_system, leadlane_contact_id)
+        if cached is not None:
+            return cached
+
         row = await self._db.fetch_one(
-            query,
+            _SQL_GET_BY_LEADLANE_ID,
             {
-                "tenant_id": str(tenant_id),
-                "crm_system": crm_system.value,
+                "tenant_id": self._tenant_param(tenant_id),
+                "crm_system": self._sys_value(crm_system),
                 "leadlane_contact_id": leadlane_contact_id,
             },
         )
         if not row:
             return None
 
-        return CRMContactLink(
+        link = CRMContactLink(
             tenant_id=tenant_id,
             crm_system=crm_system,
-            leadlane_contact_id=row["leadlane_contact_id"],
-            crm_contact_id=row["crm_contact_id"],
+            leadlane_contact_id=str(row["leadlane_contact_id"]),
+            crm_contact_id=str(row["crm_contact_id"]),
         )
+        _link_cache.put(tenant_id, crm_system, link.leadlane_contact_id, link.crm_contact_id, link)
+        return link
 
     async def get_by_crm_id(
         self,
@@ -97,30 +259,104 @@ class CRMContactLinksRepository:
         crm_system: CRMSystem,
         crm_contact_id: str,
     ) -> Optional[CRMContactLink]:
-        query = """
-        SELECT tenant_id, crm_system, leadlane_contact_id, crm_contact_id
-        FROM tmpl_c_db_crm_contact_links
-        WHERE tenant_id = :tenant_id
-          AND crm_system = :crm_system
-          AND crm_contact_id = :crm_contact_id;
         """
+        Treffer kommen bis zu 5 Minuten aus dem Prozess-Cache (_link_cache).
+        """
+        cached = _link_cache.get_by_crm(tenant_id, crm_system, crm_contact_id)
+        if cached is not None:
+            return cached
+
         row = await self._db.fetch_one(
-            query,
+            _SQL_GET_BY_CRM_ID,
             {
-                "tenant_id": str(tenant_id),
-                "crm_system": crm_system.value,
+                "tenant_id": self._tenant_param(tenant_id),
+                "crm_system": self._sys_value(crm_system),
                 "crm_contact_id": crm_contact_id,
             },
         )
         if not row:
             return None
 
-        return CRMContactLink(
+        link = CRMContactLink(
             tenant_id=tenant_id,
             crm_system=crm_system,
-            leadlane_contact_id=row["leadlane_contact_id"],
-            crm_contact_id=row["crm_contact_id"],
+            leadlane_contact_id=str(row["leadlane_contact_id"]),
+            crm_contact_id=str(row["crm_contact_id"]),
         )
+        _link_cache.put(tenant_id, crm_system, link.leadlane_contact_id, link.crm_contact_id, link)
+        return link
+
+    async def get_many_by_leadlane_ids(
+        self,
+        tenant_id: UUID,
+        crm_system: CRMSystem,
+        leadlane_contact_ids: Sequence[str],
+    ) -> Dict[str, CRMContactLink]:
+        """
+        Batch-Variante von get_by_leadlane_id (ein Round-Trip statt N).
+        Ergebnis: leadlane_contact_id -> Link; IDs ohne Link fehlen im dict.
+        Wie get_by_leadlane_id zuerst aus _link_cache, nur Misses aus der DB.
+        """
+        found: Dict[str, CRMContactLink] = {}
+        missing: List[str] = []
+        for leadlane_id in dict.fromkeys(leadlane_contact_ids):
+            cached = _link_cache.get_by_leadlane(tenant_id, crm_system, leadlane_id)
+            if cached is not None:
+                found[leadlane_id] = cached
+            else:
+                missing.append(leadlane_id)
+
+        if not missing:
+            return found
+
+        rows = await self._db.fetch_all(
+            _SQL_GET_MANY_BY_LEADLANE_IDS,
+            {
+                "tenant_id": self._tenant_param(tenant_id),
+                "crm_system": self._sys_value(crm_system),
+                "ids": missing,
+            },
+        )
+        for row in rows:
+            link = CRMContactLink(
+                tenant_id=tenant_id,
+                crm_system=crm_system,
+                leadlane_contact_id=str(row["leadlane_contact_id"]),
+                crm_contact_id=str(row["crm_contact_id"]),
+            )
+            _link_cache.put(tenant_id, crm_system, link.leadlane_contact_id, link.crm_contact_id, link)
+            found[link.leadlane_contact_id] = link
+        return found
+
+    async def get_many_by_crm_ids(
+        self,
+        tenant_id: UUID,
+        crm_system: CRMSystem,
+        crm_contact_ids: Sequence[str],
+    ) -> Dict[str, CRMContactLink]:
+        """
+        Batch-Variante von get_by_crm_id. Ergebnis: crm_contact_id -> Link.
+        """
+        if not crm_contact_ids:
+            return {}
+
+        rows = await self._db.fetch_all(
+            _SQL_GET_MANY_BY_CRM_IDS,
+            {
+                "tenant_id": self._tenant_param(tenant_id),
+                "crm_system": self._sys_value(crm_system),
+                "ids": list(crm_contact_ids),
+            },
+        )
+        return {
+            str(row["crm_contact_id"]): CRMContactLink(
+                tenant_id=tenant_id,
+                crm_system=crm_system,
+                leadlane_contact_id=str(row["leadlane_contact_id"]),
+                crm_contact_id=str(row["crm_contact_id"]),
+            )
+            for row in rows
+        }
 
     async def list_for_tenant_and_system(
         self,
@@ -129,29 +365,13 @@ class CRMContactLinksRepository:
         limit: int = 1000,
         offset: int = 0,
     ) -> List[CRMContactLink]:
-        query = """
-        SELECT tenant_id, crm_system, leadlane_contact_id, crm_contact_id
-        FROM tmpl_c_db_crm_contact_links
-        WHERE tenant_id = :tenant_id
-          AND crm_system = :crm_system
-        ORDER BY leadlane_contact_id
-        LIMIT :limit OFFSET :offset;
-        """
         rows = await self._db.fetch_all(
-            query,
+            _SQL_LIST_FOR_TENANT_AND_SYSTEM,
             {
-                "tenant_id": str(tenant_id),
-                "crm_system": crm_system.value,
+                "tenant_id": self._tenant_param(tenant_id),
+                "crm_system": self._sys_value(crm_system),
                 "limit": limit,
                 "offset": offset,
             },
         )
-        return [
-            CRMContactLink(
-                tenant_id=tenant_id,
-                crm_system=crm_system,
-                leadlane_contact_id=row["leadlane_contact_id"],
-                crm_contact_id=row["crm_contact_id"],
-            )
-            for row in rows
-        ]
+        return [CRMContactLink(tenant_id, crm_system, *_row_ids(row)) for row in rows]
@@ -1,19 +1,37 @@
 # app/integrations/crm/mapping/crm_field_mapping_engine.py
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, Mapping, Optional, Type, TypeVar
+import asyncio
+import copy
+import functools
+import time
+from dataclasses import dataclass, field, fields, is_dataclass, replace
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Type, TypeVar, Union
 from uuid import UUID
 
 from app.integrations.crm.crm_types import CRMSystem
-from .crm_field_mappings_repository import CRMFieldMappingsRepository, CRMFieldMappingRecord
+from .crm_field_mappings_repository import (
+    CRMFieldMappingsRepository,
+    CRMFieldMappingRecord,
+    mappings_version,
+)
 from .systems.hubspot_default_mapping import HUBSPOT_DEFAULT_MAPPINGS
 from .systems.salesforce_default_mapping import SALESFORCE_DEFAULT_MAPPINGS
 from .systems.sap_b1_default_mapping import SAP_B1_DEFAULT_MAPPINGS
-from dataclasses import replace
+
+try:  # Metriken nur, wenn prometheus_client installiert ist (requirements)
+    from prometheus_client import Counter, Histogram
+
+    _PROMETHEUS_AVAILABLE = True
+except ImportError:  # pragma: no cover - abhängig von der Umgebung
+    _PROMETHEUS_AVAILABLE = False
 
 T = TypeVar("T")
 
+# (Getter: udm_object -> Tuple der Werte, CRM-Feldnamen in gleicher Reihenfolge)
+_ExtractionPlan = Tuple[Callable[[Any], Tuple[Any, ...]], Tuple[str, ...]]
 
 
 @dataclass(frozen=True)
@@ -23,23 +41,325 @@ class EffectiveFieldMapping:
       - key: UDM-Feldname
       - value: CRM-Feldname
     """
-    udm_to_crm: Dict[str, str]
+    udm_to_crm: Mapping[str, str]
+    # Inverse (CRM-Feld → UDM-Feld) für map_crm_to_udm; wird einmal pro
+    # Mapping aus udm_to_crm abgeleitet, wenn nicht übergeben.
+    crm_to_udm: Mapping[str, str] = field(default_factory=dict)
+
+    # udm_to_crm als parallele Tupel (gleiche Reihenfolge) für die Mapping-
+    # Schleifen – sequentielles Durchlaufen statt dict.items().
+    udm_fields: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    crm_fields: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Beide Richtungen nur als schreibgeschützte Views herausgeben – die
+        # Instanzen werden über den Cache zwischen Aufrufern geteilt.
+        if not isinstance(self.udm_to_crm, MappingProxyType):
+            object.__setattr__(self, "udm_to_crm", MappingProxyType(dict(self.udm_to_crm)))
+        if not self.crm_to_udm and self.udm_to_crm:
+            object.__setattr__(
+                self,
+                "crm_to_udm",
+                MappingProxyType(
+                    {crm_field: udm_field for udm_field, crm_field in self.udm_to_crm.items()}
+                ),
+            )
+        elif not isinstance(self.crm_to_udm, MappingProxyType):
+            object.__setattr__(self, "crm_to_udm", MappingProxyType(dict(self.crm_to_udm)))
+
+        object.__setattr__(self, "udm_fields", tuple(self.udm_to_crm))
+        object.__setattr__(self, "crm_fields", tuple(self.udm_to_crm.values()))
+
+    # udm_cls -> _ExtractionPlan (None: keine Dataclass → generischer Pfad)
+    _plans: Dict[type, Optional[_ExtractionPlan]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def extraction_plan(self, udm_cls: type) -> Optional[_ExtractionPlan]:
+        """
+        Einmal pro UDM-Klasse: nur die Mapping-Felder, die die (Dataclass-)
+        Klasse wirklich hat, als ein attrgetter (Lookups laufen in C) –
+        kein hasattr/getattr pro Feld und Aufruf mehr.
+        """
+        try:
+            return self._plans[udm_cls]
+        except KeyError:
+            pass
+
+        plan: Optional[_ExtractionPlan] = None
+        if is_dataclass(udm_cls):
+            names = {f.name for f in fields(udm_cls)}
+            # Felder plus Klassen-Attribute (z.B. @property) – wie bisher hasattr
+            pairs = [
+                (u, c)
+                for u, c in zip(self.udm_fields, self.crm_fields)
+                if u in names or hasattr(udm_cls, u)
+            ]
+            if not pairs:
+                plan = (lambda obj: (), ())
+            elif len(pairs) == 1:
+                single = attrgetter(pairs[0][0])
+                plan = (lambda obj: (single(obj),), (pairs[0][1],))
+            else:
+                plan = (
+                    attrgetter(*(u for u, _ in pairs)),
+                    tuple(c for _, c in pairs),
+                )
+
+        self._plans[udm_cls] = plan
+        return plan
+
+    # udm_cls -> ((crm_field, udm_field), ...) für map_crm_to_udm
+    _inbound_plans: Dict[type, Tuple[Tuple[str, str], ...]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def inbound_plan(self, udm_cls: type) -> Tuple[Tuple[str, str], ...]:
+        """
+        Einmal pro UDM-Klasse: (CRM-Feld, UDM-Feld)-Paare, eingeschränkt auf
+        Felder, die udm_cls(...) / replace(...) annehmen (init-Felder).
+        """
+        plan = self._inbound_plans.get(udm_cls)
+        if plan is None:
+            pairs: Sequence[Tuple[str, str]] = tuple(self.crm_to_udm.items())
+            if is_dataclass(udm_cls):
+                init_fields = {f.name for f in fields(udm_cls) if f.init}
+                pairs = [(c, u) for c, u in pairs if u in init_fields]
+            plan = tuple(pairs)
+            self._inbound_plans[udm_cls] = plan
+        return plan
+
+    # udm_cls -> {crm_field: udm_field} (inbound_plan als Lookup-Tabelle)
+    _inbound_lookups: Dict[type, Mapping[str, str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def inbound_lookup(self, udm_cls: type) -> Mapping[str, str]:
+        """
+        inbound_plan(udm_cls) als Dict – für Payloads mit wenigen Properties
+        (z.B. Webhook-propertyChange) ist ein Lookup pro Property billiger als
+        ein Durchlauf über alle gemappten Felder.
+        """
+        lookup = self._inbound_lookups.get(udm_cls)
+        if lookup is None:
+            lookup = MappingProxyType(dict(self.inbound_plan(udm_cls)))
+            self._inbound_lookups[udm_cls] = lookup
+        return lookup
+
+
+# ---------------------------------------------------------------------------
+# Metriken (Cache-Hit-Rate / DB-Latenz). Bewusst ohne tenant_id als Label,
+# damit die Kardinalität begrenzt bleibt.
+# ---------------------------------------------------------------------------
+
+if _PROMETHEUS_AVAILABLE:
+    EFFECTIVE_MAPPING_CACHE = Counter(
+        "crm_mapping_cache_total",
+        "Lookups im EffectiveMappingCache",
+        ["crm_system", "op", "result"],
+    )
+    EFFECTIVE_MAPPING_FETCH_SECONDS = Histogram(
+        "crm_mapping_fetch_seconds",
+        "Dauer des DB-Loads für Feld-Mappings bei Cache-Miss",
+        ["crm_system", "op"],
+    )
+
+
+def _record_cache_lookup(crm_system: CRMSystem, op: str, hit: bool) -> None:
+    if _PROMETHEUS_AVAILABLE:
+        EFFECTIVE_MAPPING_CACHE.labels(crm_system.value, op, "hit" if hit else "miss").inc()
+
+
+def _record_fetch(crm_system: CRMSystem, op: str, seconds: float) -> None:
+    if _PROMETHEUS_AVAILABLE:
+        EFFECTIVE_MAPPING_FETCH_SECONDS.labels(crm_system.value, op).observe(seconds)
+
+
+# (tenant_id, crm_system, object_type, direction)
+_CacheKey = Tuple[Optional[UUID], CRMSystem, str, str]
+
+# direction-Werte der DB-Mappings, die je Richtung gelten
+_OUTBOUND = "outbound"
+_INBOUND = "inbound"
+_DIRECTIONS: Dict[str, Tuple[str, ...]] = {
+    _OUTBOUND: (_OUTBOUND, "bidirectional"),
+    _INBOUND: (_INBOUND, "bidirectional"),
+}
+
+
+def _tenant_key(tenant_id: Union[UUID, str, None]) -> Optional[UUID]:
+    # Clients bekommen tenant_id teils als str (crm_sync_service) – für den
+    # Cache-Key auf UUID normalisieren, damit Vorwärmen und Lookup passen.
+    if tenant_id is None or isinstance(tenant_id, UUID):
+        return tenant_id
+    return UUID(str(tenant_id))
+
+
+class EffectiveMappingCache:
+    """
+    In-Process-Cache für EffectiveFieldMapping pro (tenant_id, crm_system,
+    object_type, direction) – spart den DB-Roundtrip pro gemapptem Objekt.
+
+    - Einträge laufen nach ttl_seconds ab (Änderungen anderer Worker)
+    - Einträge aus einer älteren mappings_version() (Änderung über das
+      Repository in diesem Prozess) gelten sofort als veraltet
+    - invalidate(tenant_id, crm_system) für gezieltes Verwerfen
+    - get_or_load: Single-Flight – parallele Misses auf denselben Key warten
+      auf einen gemeinsamen DB-Load statt jeweils selbst zu laden
+
+    Die gecachten Mappings werden geteilt und dürfen nicht mutiert werden.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 10_000) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        # key -> (expires_at, version, mapping)
+        self._entries: Dict[_CacheKey, Tuple[float, int, EffectiveFieldMapping]] = {}
+        # key -> laufender Load (Single-Flight)
+        self._inflight: Dict[_CacheKey, asyncio.Future] = {}
+
+    def get(self, key: _CacheKey) -> Optional[EffectiveFieldMapping]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, version, mapping = entry
+        if expires_at <= time.monotonic() or version != mappings_version():
+            del self._entries[key]
+            return None
+        return mapping
+
+    def set(self, key: _CacheKey, version: int, mapping: EffectiveFieldMapping) -> None:
+        if key not in self._entries and len(self._entries) >= self._max_entries:
+            # Grob begrenzen: ältesten Eintrag (Einfügereihenfolge) verwerfen.
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self._ttl, version, mapping)
+
+    async def get_or_load(
+        self,
+        key: _CacheKey,
+        load: Callable[[], Awaitable[EffectiveFieldMapping]],
+    ) -> EffectiveFieldMapping:
+        """
+        Cache-Treffer oder load() – pro Key höchstens ein load() gleichzeitig.
+        Fehler des Loads bekommen alle Wartenden; wird der ladende Task
+        abgebrochen, übernimmt ein Wartender den Load.
+        """
+        while True:
+            mapping = self.get(key)
+            if mapping is not None:
+                return mapping
+
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # wir selbst wurden abgebrochen
+                # Lader abgebrochen → neu versuchen
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        # Version vor dem Laden merken: ändert sich das Mapping währenddessen,
+        # ist der Eintrag beim nächsten get() schon veraltet.
+        version = mappings_version()
+        try:
+            mapping = await load()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # ohne Wartende kein "never retrieved"-Log
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        self.set(key, version, mapping)
+        future.set_result(mapping)
+        return mapping
+
+    def invalidate(
+        self,
+        tenant_id: Optional[UUID] = None,
+        crm_system: Optional[CRMSystem] = None,
+    ) -> None:
+        if tenant_id is None and crm_system is None:
+            self._entries.clear()
+            return
+        for key in [
+            k
+            for k in self._entries
+            if (tenant_id is None or k[0] == tenant_id)
+            and (crm_system is None or k[1] == crm_system)
+        ]:
+            del self._entries[key]
+
+
+# Globale Instanz: die Engine wird pro Request gebaut (siehe dependencies.py)
+effective_mapping_cache = EffectiveMappingCache()
+
+
+_EMPTY_MAPPING: Mapping[str, str] = MappingProxyType({})
+
+# Default-Mappings einmal beim Import einfrieren (schreibgeschützt → können
+# ohne Kopie geteilt werden); object_type-Keys vorab kleingeschrieben.
+_DEFAULT_MAPPINGS: Dict[CRMSystem, Dict[str, Mapping[str, str]]] = {
+    crm_system: {
+        object_type.lower(): MappingProxyType(dict(fields))
+        for object_type, fields in defaults.items()
+    }
+    for crm_system, defaults in (
+        (CRMSystem.HUBSPOT, HUBSPOT_DEFAULT_MAPPINGS),
+        (CRMSystem.SALESFORCE, SALESFORCE_DEFAULT_MAPPINGS),
+        (CRMSystem.SAP_B1, SAP_B1_DEFAULT_MAPPINGS),
+    )
+}
 
 
 def _get_default_mapping_for(
     crm_system: CRMSystem,
     object_type: str,
-) -> Dict[str, str]:
-    object_type = object_type.lower()
+) -> Mapping[str, str]:
+    defaults = _DEFAULT_MAPPINGS.get(crm_system)
+    if defaults is None:
+        return _EMPTY_MAPPING
+    mapping = defaults.get(object_type)
+    if mapping is None:
+        mapping = defaults.get(object_type.lower(), _EMPTY_MAPPING)
+    return mapping
+
+
+@functools.lru_cache(maxsize=None)
+def _default_effective_mapping(
+    crm_system: CRMSystem,
+    object_type: str,
+) -> EffectiveFieldMapping:
+    # Ohne Overrides teilen sich alle Tenants eine Instanz (inkl. Inverse
+    # und extraction_plan-Cache).
+    return EffectiveFieldMapping(
+        udm_to_crm=_get_default_mapping_for(crm_system, object_type)
+    )
 
-    if crm_system == CRMSystem.HUBSPOT:
-        return HUBSPOT_DEFAULT_MAPPINGS.get(object_type, {})
-    if crm_system == CRMSystem.SALESFORCE:
-        return SALESFORCE_DEFAULT_MAPPINGS.get(object_type, {})
-    if crm_system == CRMSystem.SAP_B1:
-        return SAP_B1_DEFAULT_MAPPINGS.get(object_type, {})
 
-    return {}
+@functools.lru_cache(maxsize=None)
+def _patchable_in_place(udm_cls: type) -> bool:
+    # copy + setattr entspricht replace(), solange kein __post_init__ (bzw.
+    # InitVar) beim Neubau etwas ableiten würde.
+    return is_dataclass(udm_cls) and not hasattr(udm_cls, "__post_init__")
+
+
+def _patch_existing(existing: T, items: Mapping[str, Any]) -> T:
+    """
+    Flache Kopie von existing mit gesetzten items – ohne kwargs-Bindung und
+    __init__ wie bei dataclasses.replace().
+    """
+    new = copy.copy(existing)
+    for name, value in items.items():
+        object.__setattr__(new, name, value)
+    return new
 
 
 class CRMFieldMappingEngine:
@@ -54,8 +374,23 @@ class CRMFieldMappingEngine:
       4. Attribute vom UDM-Objekt auslesen und Properties-Dict bauen
     """
 
-    def __init__(self, mappings_repo: CRMFieldMappingsRepository) -> None:
+    def __init__(
+        self,
+        mappings_repo: CRMFieldMappingsRepository,
+        cache: Optional[EffectiveMappingCache] = None,
+    ) -> None:
         self._repo = mappings_repo
+        self._cache = cache if cache is not None else effective_mapping_cache
+
+    def invalidate(
+        self,
+        tenant_id: Optional[UUID] = None,
+        crm_system: Optional[CRMSystem] = None,
+    ) -> None:
+        """
+        Verwirft gecachte Mappings (ohne Argumente: alle).
+        """
+        self._cache.invalidate(_tenant_key(tenant_id), crm_system)
 
     async def get_effective_mapping(
         self,
@@ -63,27 +398,94 @@ class CRMFieldMappingEngine:
         tenant_id: Optional[UUID],
         crm_system: CRMSystem,
         object_type: str,
+        direction: str = _OUTBOUND,
     ) -> EffectiveFieldMapping:
-        # 1. Default-Mapping
-        default_mapping = dict(
-            _get_default_mapping_for(crm_system, object_type)
-        )  # udm_field -> crm_field
-
-        # 2. Tenant-spezifische + globale DB-Mappings laden
-        records = await self._repo.get_active_mappings_for_object(
+        """
+        direction="outbound" (UDM → CRM) berücksichtigt outbound/bidirectional-
+        Overrides, direction="inbound" (CRM → UDM) inbound/bidirectional.
+        """
+        key = (_tenant_key(tenant_id), crm_system, object_type, direction)
+        cached = self._cache.get(key)
+        _record_cache_lookup(crm_system, "single", cached is not None)
+        if cached is not None:
+            return cached
+
+        async def _load() -> EffectiveFieldMapping:
+            # Tenant-spezifische + globale DB-Mappings der Richtung laden
+            started = time.perf_counter()
+            records = await self._repo.get_active_mappings_for_object(
+                tenant_id=tenant_id,
+                crm_system=crm_system,
+                object_type=object_type,
+                directions=_DIRECTIONS[direction],
+            )
+            _record_fetch(crm_system, "single", time.perf_counter() - started)
+            return self._build_mapping(crm_system, object_type, records)
+
+        return await self._cache.get_or_load(key, _load)
+
+    async def get_effective_mappings(
+        self,
+        *,
+        tenant_id: Optional[UUID],
+        crm_system: CRMSystem,
+        object_types: Sequence[str],
+        direction: str = _OUTBOUND,
+    ) -> Dict[str, EffectiveFieldMapping]:
+        """
+        Batch-Variante von get_effective_mapping: alle nicht gecachten
+        object_types werden mit einer DB-Abfrage geladen (und gecacht).
+        """
+        tenant_key = _tenant_key(tenant_id)
+        result: Dict[str, EffectiveFieldMapping] = {}
+        missing: List[str] = []
+        for object_type in dict.fromkeys(object_types):
+            cached = self._cache.get((tenant_key, crm_system, object_type, direction))
+            _record_cache_lookup(crm_system, "batch", cached is not None)
+            if cached is not None:
+                result[object_type] = cached
+            else:
+                missing.append(object_type)
+
+        if not missing:
+            return result
+
+        version = mappings_version()
+        started = time.perf_counter()
+        records_by_type = await self._repo.get_active_mappings_for_objects(
             tenant_id=tenant_id,
             crm_system=crm_system,
-            object_type=object_type,
+            object_types=missing,
+            directions=_DIRECTIONS[direction],
         )
+        _record_fetch(crm_system, "batch", time.perf_counter() - started)
+        for object_type in missing:
+            mapping = self._build_mapping(
+                crm_system, object_type, records_by_type.get(object_type, [])
+            )
+            self._cache.set(
+                (tenant_key, crm_system, object_type, direction), version, mapping
+            )
+            result[object_type] = mapping
+        return result
+
+    @staticmethod
+    def _build_mapping(
+        crm_system: CRMSystem,
+        object_type: str,
+        records: Sequence[CRMFieldMappingRecord],
+    ) -> EffectiveFieldMapping:
+        # records sind bereits nach Richtung gefiltert (SQL); ohne Overrides
+        # wird das (geteilte) Default-Mapping ohne Kopie verwendet.
+        if not records:
+            return _default_effective_mapping(crm_system, object_type)
 
-        # 3. Mergen: DB-Mappings überschreiben Defaults
-        udm_to_crm = default_mapping
+        # Default-Mapping + DB-Mappings (überschreiben Defaults)
+        merged = dict(_get_default_mapping_for(crm_system, object_type))
         for rec in records:
-            # Nur outbound/bidirectional für UDM → CRM beachten
-            if rec.direction in ("outbound", "bidirectional"):
-                udm_to_crm[rec.udm_field] = rec.crm_field
+            merged[rec.udm_field] = rec.crm_field
 
-        return EffectiveFieldMapping(udm_to_crm=udm_to_crm)
+        return EffectiveFieldMapping(udm_to_crm=MappingProxyType(merged))
 
     async def map_udm_to_crm_properties(
         self,
@@ -107,19 +509,27 @@ class CRMFieldMappingEngine:
             object_type=object_type,
         )
 
-        properties: Dict[str, Any] = {}
-
-        for udm_field, crm_field in effective_mapping.udm_to_crm.items():
-            if not hasattr(udm_object, udm_field):
-                continue
-
-            value = getattr(udm_object, udm_field)
+        plan = effective_mapping.extraction_plan(type(udm_object))
+        if plan is not None:
+            getter, crm_fields = plan
             # None-Werte in der Regel überspringen, um keine Felder zu "löschen"
-            if value is not None:
-                properties[crm_field] = value
+            properties: Dict[str, Any] = {
+                crm_field: value
+                for crm_field, value in zip(crm_fields, getter(udm_object))
+                if value is not None
+            }
+        else:
+            # Fehlende Attribute → None → übersprungen (wie vorher hasattr)
+            properties = {
+                crm_field: value
+                for udm_field, crm_field in zip(
+                    effective_mapping.udm_fields, effective_mapping.crm_fields
+                )
+                if (value := getattr(udm_object, udm_field, None)) is not None
+            }
 
         if extra_fields:
-            properties.update(extra_fields)
+            properties |= extra_fields
 
         return properties
 
@@ -146,25 +556,31 @@ class CRMFieldMappingEngine:
             tenant_id=tenant_id,
             crm_system=crm_system,
             object_type=object_type,
+            direction=_INBOUND,
         )
 
-        # Invertierung: CRM-Feld → UDM-Feld
-        crm_to_udm: Dict[str, str] = {
-            crm_field: udm_field
-            for udm_field, crm_field in effective_mapping.udm_to_crm.items()
-        }
-
-        patch_data: Dict[str, Any] = {}
-
-        for crm_field, value in crm_properties.items():
-            udm_field = crm_to_udm.get(crm_field)
-            if udm_field is None:
-                # Feld ist im Mapping nicht definiert → ignorieren
-                continue
-            patch_data[udm_field] = value
+        # Über die kleinere Seite iterieren: (CRM-Feld, UDM-Feld)-Paare des
+        # Mappings oder – bei wenigen Properties – die Properties selbst mit
+        # einem Lookup pro Key. Beide Tabellen einmal pro Mapping + Klasse.
+        plan = effective_mapping.inbound_plan(udm_cls)
+        if len(crm_properties) < len(plan):
+            lookup = effective_mapping.inbound_lookup(udm_cls)
+            patch_data: Dict[str, Any] = {
+                udm_field: value
+                for crm_field, value in crm_properties.items()
+                if (udm_field := lookup.get(crm_field)) is not None
+            }
+        else:
+            patch_data = {
+                udm_field: crm_properties[crm_field]
+                for crm_field, udm_field in plan
+                if crm_field in crm_properties
+            }
 
         if existing is not None:
-            # Dataclass patchen
+            # Dataclass patchen (existing selbst bleibt unverändert)
+            if _patchable_in_place(type(existing)):
+                return _patch_existing(existing, patch_data)
             return replace(existing, **patch_data)
 
         # Neues Objekt bauen
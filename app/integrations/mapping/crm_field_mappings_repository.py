@@ -1,15 +1,34 @@
 # app/integrations/mapping/crm_field_mappings_repository.py
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
-from typing import Any, List, Mapping, Optional, Iterable
+from typing import Any, Dict, List, Mapping, Optional, Iterable, Sequence
 from uuid import UUID
 
 from app.db.database import Database
 from app.integrations.crm.crm_types import CRMSystem
 
 
-@dataclass
+# Prozessweiter Änderungszähler: jede Änderung über dieses Repository zählt
+# hoch, Caches (CRMFieldMappingEngine) erkennen so veraltete Einträge.
+_mappings_version = 0
+
+
+def mappings_version() -> int:
+    return _mappings_version
+
+
+def _bump_mappings_version() -> None:
+    global _mappings_version
+    _mappings_version += 1
+
+
+# crm_system-Spaltenwert → Enum, ohne Enum-Aufruf pro Zeile
+_CRM_BY_VALUE: Dict[str, CRMSystem] = {s.value: s for s in CRMSystem}
+
+
+@dataclass(slots=True)
 class CRMFieldMappingRecord:
     id: int
     tenant_id: Optional[UUID]
@@ -47,15 +66,54 @@ class CRMFieldMappingsRepository:
 
     @staticmethod
     def _row_to_record(row: Mapping[str, Any]) -> CRMFieldMappingRecord:
+        crm_system = _CRM_BY_VALUE.get(row["crm_system"])
         return CRMFieldMappingRecord(
-            id=row["id"],
-            tenant_id=row.get("tenant_id"),
-            crm_system=CRMSystem(row["crm_system"]),
-            object_type=row["object_type"],
-            udm_field=row["udm_field_name"],
-            crm_field=row["crm_field_name"],
-            is_active=row["is_active"],
-            direction=row.get("direction") or "bidirectional",
+            row["id"],
+            row.get("tenant_id"),
+            crm_system if crm_system is not None else CRMSystem.parse(row["crm_system"]),
+            sys.intern(row["object_type"]),
+            # interniert wie die Default-Mappings → schnelle Dict-Lookups
+            sys.intern(row["udm_field_name"]),
+            sys.intern(row["crm_field_name"]),
+            row["is_active"],
+            row.get("direction") or "bidirectional",
+        )
+
+    @staticmethod
+    def _rows_to_records(rows: Iterable[Mapping[str, Any]]) -> List[CRMFieldMappingRecord]:
+        """
+        Wie _row_to_record für viele Zeilen, mit Lookups als Locals.
+        """
+        by_value = _CRM_BY_VALUE
+        intern = sys.intern
+        record = CRMFieldMappingRecord
+        return [
+            record(
+                row["id"],
+                row.get("tenant_id"),
+                by_value.get(row["crm_system"]) or CRMSystem.parse(row["crm_system"]),
+                intern(row["object_type"]),
+                intern(row["udm_field_name"]),
+                intern(row["crm_field_name"]),
+                row["is_active"],
+                row.get("direction") or "bidirectional",
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def _with_direction_filter(
+        sql: str,
+        params: Dict[str, Any],
+        directions: Optional[Sequence[str]],
+    ) -> str:
+        # Zwei feste SQL-Varianten (mit/ohne Filter) → beide bleiben im
+        # Query-Cache der Database; der Filter greift vor DISTINCT ON.
+        if directions is None:
+            return sql.format(direction_filter="")
+        params["directions"] = list(directions)
+        return sql.format(
+            direction_filter="AND (direction IS NULL OR direction = ANY(:directions))"
         )
 
     # ------------------------------------------------------------------
@@ -68,15 +126,19 @@ class CRMFieldMappingsRepository:
         tenant_id: Optional[UUID],
         crm_system: CRMSystem,
         object_type: str,
+        directions: Optional[Sequence[str]] = None,
     ) -> List[CRMFieldMappingRecord]:
         """
         Liefert aktive Mappings für (tenant_id, crm_system, object_type).
 
         - Berücksichtigt tenant-spezifische UND globale (tenant_id IS NULL) Mappings
-        - Tenant-spezifische Mappings überschreiben globale
+        - Tenant-spezifische Mappings überschreiben globale (per DISTINCT ON
+          in der DB – es wird nur die gewinnende Zeile übertragen)
+        - directions: nur Mappings dieser Richtungen (z.B. ("outbound",
+          "bidirectional")); direction IS NULL zählt als bidirectional
         """
         sql = """
-        SELECT
+        SELECT DISTINCT ON (udm_field_name)
             id,
             tenant_id,
             crm_system,
@@ -93,25 +155,72 @@ class CRMFieldMappingsRepository:
                 (:tenant_id IS NOT NULL AND tenant_id = :tenant_id)
              OR (tenant_id IS NULL)
           )
-        ORDER BY tenant_id NULLS FIRST, udm_field_name
+          {direction_filter}
+        ORDER BY udm_field_name, (tenant_id IS NULL)
         """
-        rows = await self._db.fetch_all(
-            sql,
-            {
-                "tenant_id": tenant_id,
-                "crm_system": crm_system.value,
-                "object_type": object_type,
-            },
-        )
+        params: Dict[str, Any] = {
+            "tenant_id": tenant_id,
+            "crm_system": crm_system.value,
+            "object_type": object_type,
+        }
+        sql = self._with_direction_filter(sql, params, directions)
+        rows = await self._db.fetch_all(sql, params)
+
+        return self._rows_to_records(rows)
 
-        records = [self._row_to_record(row) for row in rows]
+    async def get_active_mappings_for_objects(
+        self,
+        *,
+        tenant_id: Optional[UUID],
+        crm_system: CRMSystem,
+        object_types: Sequence[str],
+        directions: Optional[Sequence[str]] = None,
+    ) -> Dict[str, List[CRMFieldMappingRecord]]:
+        """
+        Wie get_active_mappings_for_object, aber für mehrere object_types in
+        einem Roundtrip. Ergebnis: object_type -> Records (jeder angefragte
+        object_type ist enthalten, ggf. mit leerer Liste).
+        """
+        grouped: Dict[str, List[CRMFieldMappingRecord]] = {
+            object_type: [] for object_type in object_types
+        }
+        if not grouped:
+            return {}
+
+        sql = """
+        SELECT DISTINCT ON (object_type, udm_field_name)
+            id,
+            tenant_id,
+            crm_system,
+            object_type,
+            udm_field_name,
+            crm_field_name,
+            is_active,
+            direction
+        FROM crm_field_mappings
+        WHERE crm_system = :crm_system
+          AND object_type = ANY(:object_types)
+          AND is_active = TRUE
+          AND (
+                (:tenant_id IS NOT NULL AND tenant_id = :tenant_id)
+             OR (tenant_id IS NULL)
+          )
+          {direction_filter}
+        ORDER BY object_type, udm_field_name, (tenant_id IS NULL)
+        """
+        params: Dict[str, Any] = {
+            "tenant_id": tenant_id,
+            "crm_system": crm_system.value,
+            "object_types": list(grouped),
+        }
+        sql = self._with_direction_filter(sql, params, directions)
+        rows = await self._db.fetch_all(sql, params)
 
-        # Mergen: tenant-spezifische überschreiben globale
-        by_udm: dict[str, CRMFieldMappingRecord] = {}
-        for rec in records:
-            by_udm[rec.udm_field] = rec
+        # tenant-spezifische vs. globale Zeilen sind per DISTINCT ON schon gemergt
+        for rec in self._rows_to_records(rows):
+            grouped.setdefault(rec.object_type, []).append(rec)
 
-        return list(by_udm.values())
+        return grouped
 
     # ------------------------------------------------------------------
     # CRUD für API (Tenant + CRM)
@@ -188,6 +297,7 @@ class CRMFieldMappingsRepository:
                 "is_active": is_active,
             },
         )
+        _bump_mappings_version()
         return dict(row) if row else {}
 
     async def update_mapping(
@@ -221,8 +331,10 @@ class CRMFieldMappingsRepository:
         )
         if row is None:
             raise ValueError("mapping_not_found")
+        _bump_mappings_version()
         return dict(row)
 
     async def delete_mapping(self, mapping_id: int) -> None:
         sql = "DELETE FROM crm_field_mappings WHERE id = :id"
         await self._db.execute(sql, {"id": mapping_id})
+        _bump_mappings_version()
@@ -0,0 +1,66 @@
+# app/integrations/mapping/link_bulk_upsert.py
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+from app.db.database import Database
+
+
+def bulk_upsert_sql(table: str, leadlane_column: str, crm_column: str) -> str:
+    """
+    Baut das Bulk-Upsert einer Link-Tabelle (einmal beim Modul-Import).
+
+    Ein konstantes Statement über unnest() statt INSERT ... VALUES mit einer
+    Parameterliste pro Batch-Breite: ein SQL-String → ein Eintrag im
+    Query-Compile-Cache von Database und ein Prepared Statement bei asyncpg,
+    ohne 65535-Parameter-Limit. CAST(... AS uuid) für die LeadLane-ID, da
+    INSERT ... SELECT text nicht implizit in uuid-Spalten umwandelt.
+    """
+    return f"""
+    INSERT INTO {table} (
+        tenant_id,
+        crm_system,
+        {leadlane_column},
+        {crm_column}
+    )
+    SELECT CAST(:tenant_id AS uuid), CAST(:crm_system AS text),
+           CAST(u.leadlane_id AS uuid), u.crm_id
+    FROM unnest(
+        CAST(:leadlane_ids AS text[]),
+        CAST(:crm_ids AS text[])
+    ) AS u(leadlane_id, crm_id)
+    ON CONFLICT (tenant_id, crm_system, {leadlane_column})
+    DO UPDATE SET {crm_column} = EXCLUDED.{crm_column}
+    RETURNING tenant_id, crm_system, {leadlane_column}, {crm_column};
+"""
+
+
+async def bulk_upsert_link_rows(
+    db: Database,
+    sql: str,
+    *,
+    tenant_id: Any,
+    crm_system: str,
+    pairs: Sequence[Tuple[str, str]],
+) -> List[Mapping[str, Any]]:
+    """
+    Führt ein mit bulk_upsert_sql gebautes Statement für
+    pairs = [(leadlane_id, crm_id), ...] in einem Round-Trip aus.
+
+    Doppelte LeadLane-IDs werden vorher zusammengefasst (letzter gewinnt),
+    da ON CONFLICT dieselbe Zeile nicht zweimal in einem Statement
+    aktualisieren darf.
+    """
+    unique: Dict[str, str] = dict(pairs)
+    if not unique:
+        return []
+
+    return await db.fetch_all(
+        sql,
+        {
+            "tenant_id": tenant_id,
+            "crm_system": crm_system,
+            "leadlane_ids": list(unique),
+            "crm_ids": list(unique.values()),
+        },
+    )
@@ -0,0 +1,89 @@
+# app/integrations/mapping/link_cache.py
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Generic, Optional, Tuple, TypeVar
+from uuid import UUID
+
+from app.integrations.crm.crm_types import CRMSystem
+
+_L = TypeVar("_L")
+
+_Key = Tuple[UUID, CRMSystem, str]
+
+
+class LinkLookupCache(Generic[_L]):
+    """
+    In-Process-TTL-Cache für Link-Lookups (LeadLane-ID ↔ CRM-ID).
+
+    Die Link-Tabellen sind append-mostly, ein Sync-Lauf löst aber dieselbe
+    ID oft mehrfach auf (pro Deal, Contact, Activity). Der Cache hält beide
+    Richtungen:
+
+    - get_by_leadlane / get_by_crm: Treffer nur, solange nicht abgelaufen
+    - put: Write-Through aus den Repositories (Lookup + Upsert); ändert sich
+      die CRM-ID eines Links, wird der alte Reverse-Eintrag verworfen.
+
+    Es werden nur gefundene Links gecacht – ein "kein Link" muss immer frisch
+    aus der DB kommen, sonst würden Links anderer Worker bis zum TTL-Ablauf
+    übersehen (→ Dubletten im CRM).
+
+    Der Cache ist pro Prozess; mehrere Worker halten jeweils ihren eigenen.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 50_000) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        # (tenant_id, crm_system, leadlane_id) -> (expires_at, crm_id, link)
+        self._by_leadlane: Dict[_Key, Tuple[float, str, _L]] = {}
+        # (tenant_id, crm_system, crm_id) -> (expires_at, leadlane_id, link)
+        self._by_crm: Dict[_Key, Tuple[float, str, _L]] = {}
+
+    def get_by_leadlane(
+        self, tenant_id: UUID, crm_system: CRMSystem, leadlane_id: str
+    ) -> Optional[_L]:
+        return self._get(self._by_leadlane, (tenant_id, crm_system, leadlane_id))
+
+    def get_by_crm(
+        self, tenant_id: UUID, crm_system: CRMSystem, crm_id: str
+    ) -> Optional[_L]:
+        return self._get(self._by_crm, (tenant_id, crm_system, crm_id))
+
+    def put(
+        self,
+        tenant_id: UUID,
+        crm_system: CRMSystem,
+        leadlane_id: str,
+        crm_id: str,
+        link: _L,
+    ) -> None:
+        ll_key = (tenant_id, crm_system, leadlane_id)
+        previous = self._by_leadlane.get(ll_key)
+        if previous is not None and previous[1] != crm_id:
+            self._by_crm.pop((tenant_id, crm_system, previous[1]), None)
+
+        if ll_key not in self._by_leadlane and len(self._by_leadlane) >= self._max_entries:
+            # Grob begrenzen: ältesten Eintrag (Einfügereihenfolge) verwerfen.
+            old_key = next(iter(self._by_leadlane))
+            _, old_crm_id, _ = self._by_leadlane.pop(old_key)
+            self._by_crm.pop((old_key[0], old_key[1], old_crm_id), None)
+
+        expires_at = time.monotonic() + self._ttl
+        self._by_leadlane[ll_key] = (expires_at, crm_id, link)
+        self._by_crm[(tenant_id, crm_system, crm_id)] = (expires_at, leadlane_id, link)
+
+    def clear(self) -> None:
+        self._by_leadlane.clear()
+        self._by_crm.clear()
+
+    @staticmethod
+    def _get(entries: Dict[_Key, Tuple[float, str, Any]], key: _Key) -> Optional[_L]:
+        entry = entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, _, link = entry
+        if expires_at <= time.monotonic():
+            del entries[key]
+            return None
+        return link
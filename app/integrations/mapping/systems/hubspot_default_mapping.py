@@ -11,6 +11,8 @@ Struktur:
   }
 """
 
+import sys
+
 HUBSPOT_DEFAULT_MAPPINGS = {
     "company": {
         # UDM-Feld      → HubSpot-Property
@@ -44,3 +46,13 @@ HUBSPOT_DEFAULT_MAPPINGS = {
         "activity_timestamp": "hs_timestamp",
     },
 }
+
+# Feldnamen internieren: DB-Overrides (_row_to_record) werden ebenfalls
+# interniert, Dict-Lookups in der MappingEngine treffen so den Identitäts-Fastpath.
+HUBSPOT_DEFAULT_MAPPINGS = {
+    sys.intern(object_type): {
+        sys.intern(udm_field): sys.intern(crm_field)
+        for udm_field, crm_field in fields.items()
+    }
+    for object_type, fields in HUBSPOT_DEFAULT_MAPPINGS.items()
+}
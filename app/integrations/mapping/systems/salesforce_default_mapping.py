@@ -11,6 +11,8 @@ Struktur:
   }
 """
 
+import sys
+
 SALESFORCE_DEFAULT_MAPPINGS = {
     "company": {
         # UDM-Feld      → SF Account.Field
@@ -44,3 +46,12 @@ SALESFORCE_DEFAULT_MAPPINGS = {
         "activity_description": "Description",
     },
 }
+
+# Feldnamen internieren (wie bei HUBSPOT_DEFAULT_MAPPINGS).
+SALESFORCE_DEFAULT_MAPPINGS = {
+    sys.intern(object_type): {
+        sys.intern(udm_field): sys.intern(crm_field)
+        for udm_field, crm_field in fields.items()
+    }
+    for object_type, fields in SALESFORCE_DEFAULT_MAPPINGS.items()
+}
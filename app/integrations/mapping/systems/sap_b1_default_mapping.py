@@ -8,6 +8,8 @@ Default-Feld-Mappings für SAP Business One (Service Layer).
 - deal   → SalesOpportunities
 """
 
+import sys
+
 SAP_B1_DEFAULT_MAPPINGS = {
     "company": {
         # UDM-Feld      → BusinessPartners.Field
@@ -40,3 +42,12 @@ SAP_B1_DEFAULT_MAPPINGS = {
         "activity_timestamp": "StartDate",
     },
 }
+
+# Feldnamen internieren (wie bei HUBSPOT_DEFAULT_MAPPINGS).
+SAP_B1_DEFAULT_MAPPINGS = {
+    sys.intern(object_type): {
+        sys.intern(udm_field): sys.intern(crm_field)
+        for udm_field, crm_field in fields.items()
+    }
+    for object_type, fields in SAP_B1_DEFAULT_MAPPINGS.items()
+}
@@ -0,0 +1,148 @@
+# app/integrations/sync/crm_cache_invalidation.py
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, Optional
+from uuid import UUID
+
+import asyncpg
+
+from app.integrations.credentials.crm_credentials_store import connected_systems_cache
+from app.integrations.crm.crm_client_cache import crm_client_cache
+from app.integrations.crm.crm_types import CRMSystem
+from app.integrations.mapping.crm_field_mapping_engine import effective_mapping_cache
+
+logger = logging.getLogger(__name__)
+
+
+# NOTIFY-Kanäle der Trigger auf crm_connections / crm_field_mappings
+# (SQL siehe ideas.txt, "Trigger")
+CRM_CONNECTIONS_CHANNEL = "crm_connections_changed"
+CRM_FIELD_MAPPINGS_CHANNEL = "crm_field_mappings_changed"
+
+
+class CRMCacheInvalidationListener:
+    """
+    Invalidiert die prozessweiten CRM-Caches per Postgres LISTEN/NOTIFY,
+    sobald sich eine Zeile in crm_connections / crm_field_mappings ändert –
+    auch wenn die Änderung von einem anderen Worker oder direkt in der DB kam.
+
+    - crm_connections_changed   → connected_systems_cache + crm_client_cache
+      (Tenant)
+    - crm_field_mappings_changed → effective_mapping_cache (Tenant + System;
+      globale Mappings mit tenant_id NULL → alle Tenants des Systems) +
+      crm_client_cache (Mapping-Cache der Clients)
+
+    Läuft als Hintergrund-Task auf einer eigenen asyncpg-Connection (nicht
+    aus dem Pool – LISTEN hängt an der Session). Bricht die Verbindung ab,
+    werden beide Caches komplett verworfen (verpasste NOTIFYs) und die
+    Verbindung mit Backoff neu aufgebaut. Die TTLs der Caches bleiben als
+    Absicherung bestehen.
+    """
+
+    def __init__(self, *, reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0) -> None:
+        self._reconnect_delay = reconnect_delay
+        self._max_reconnect_delay = max_reconnect_delay
+        self._listen_task: Optional[asyncio.Task] = None
+
+    async def start(self, dsn: str) -> None:
+        if self._listen_task is not None and not self._listen_task.done():
+            return
+        self._listen_task = asyncio.create_task(
+            self._run(dsn), name="crm-cache-invalidation"
+        )
+
+    async def stop(self) -> None:
+        task, self._listen_task = self._listen_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    # ------------------------------------------------------------------
+    # Intern
+    # ------------------------------------------------------------------
+
+    async def _run(self, dsn: str) -> None:
+        delay = self._reconnect_delay
+        while True:
+            try:
+                conn = await asyncpg.connect(dsn)
+            except Exception:  # noqa: BLE001 - DB kurz weg → später erneut
+                logger.warning(
+                    "CRM cache invalidation: connect failed, retrying in %ss",
+                    delay,
+                    exc_info=True,
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self._max_reconnect_delay)
+                continue
+
+            closed = asyncio.Event()
+            conn.add_termination_listener(lambda _conn: closed.set())
+            try:
+                await conn.add_listener(CRM_CONNECTIONS_CHANNEL, self._on_notify)
+                await conn.add_listener(CRM_FIELD_MAPPINGS_CHANNEL, self._on_notify)
+                # Zwischen Verbindungsabbruch und LISTEN kann etwas verpasst
+                # worden sein → einmal alles verwerfen.
+                self._invalidate_all()
+                delay = self._reconnect_delay
+                logger.info("CRM cache invalidation: listening for changes")
+                await closed.wait()
+                logger.warning("CRM cache invalidation: connection lost, reconnecting")
+            except Exception:  # noqa: BLE001
+                logger.warning("CRM cache invalidation: listener failed", exc_info=True)
+            finally:
+                if not conn.is_closed():
+                    await conn.close()
+
+            self._invalidate_all()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self._max_reconnect_delay)
+
+    def _on_notify(self, _conn: Any, _pid: int, channel: str, payload: str) -> None:
+        try:
+            data = json.loads(payload)
+            tenant_id = UUID(data["tenant_id"]) if data.get("tenant_id") else None
+            crm_system = CRMSystem.parse(data["crm_system"]) if data.get("crm_system") else None
+        except (ValueError, KeyError, TypeError):
+            logger.warning("CRM cache invalidation: bad payload on %s: %r", channel, payload)
+            self._invalidate_all()
+            return
+
+        if channel == CRM_CONNECTIONS_CHANNEL:
+            if tenant_id is None:
+                connected_systems_cache.clear()
+                crm_client_cache.clear()
+            else:
+                connected_systems_cache.invalidate(tenant_id)
+                crm_client_cache.invalidate(tenant_id)
+        elif channel == CRM_FIELD_MAPPINGS_CHANNEL:
+            # tenant_id None = globales Mapping → alle Tenants dieses Systems
+            effective_mapping_cache.invalidate(tenant_id, crm_system)
+            if tenant_id is None:
+                crm_client_cache.clear()
+            else:
+                crm_client_cache.invalidate(tenant_id, crm_system)
+
+        logger.debug(
+            "CRM cache invalidated: channel=%s, tenant_id=%s, crm_system=%s",
+            channel,
+            tenant_id,
+            crm_system,
+        )
+
+    @staticmethod
+    def _invalidate_all() -> None:
+        connected_systems_cache.clear()
+        crm_client_cache.clear()
+        effective_mapping_cache.invalidate()
+
+
+# Globale Instanz, Start/Stop im App-Lifespan (app/main.py)
+crm_cache_invalidation_listener = CRMCacheInvalidationListener()
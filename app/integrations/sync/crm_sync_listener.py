@@ -3,9 +3,10 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Dict, TYPE_CHECKING
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, TYPE_CHECKING
 from uuid import UUID
 
+from app.integrations.credentials.crm_credentials_store import connected_systems_cache
 from app.integrations.crm.crm_types import (
     CRMSystem,
     CRMCompanyPayload,
@@ -13,15 +14,35 @@ from app.integrations.crm.crm_types import (
     CRMDealPayload,
     CRMActivityPayload,
     CRMSyncResult,
+    CRMSyncError,
 )
 
 if TYPE_CHECKING:
-    from app.integrations.sync.crm_sync_service import CRMSyncService
+    from app.integrations.sync.crm_sync_service import CRMSyncService, SyncContext
     from app.integrations.credentials.crm_credentials_store import CRMCredentialsStore
 
 
 logger = logging.getLogger(__name__)
 
+# Obergrenze pro CRM-System und Sync-Aufruf. Ein hängendes CRM soll das
+# Domain-Event nicht unbegrenzt blockieren.
+SYNC_TIMEOUT_S = 30.0
+
+# object_type (wie im Field-Mapping) -> (Methode des CRMSyncService, LeadLane-ID
+# des Payloads für Logs/Fehler)
+_FANOUT: Dict[str, Tuple[str, Callable[[Any], Optional[str]]]] = {
+    "company": ("sync_company_to_crm", lambda p: p.leadlane_sub_company_id),
+    "contact": ("sync_contact_to_crm", lambda p: p.leadlane_contact_id),
+    "deal": (
+        "sync_opportunity_to_crm",
+        lambda p: p.leadlane_demo_id or p.leadlane_account_id,
+    ),
+    "activity": (
+        "sync_activity_to_crm",
+        lambda p: p.leadlane_demo_id or p.leadlane_contact_id or p.leadlane_sub_company_id,
+    ),
+}
+
 
 class CRMSyncListener:
     """
@@ -31,32 +52,142 @@ class CRMSyncListener:
       - Ermitteln, welche CRM-Systeme für einen Tenant verbunden sind
       - CRMSyncService für jedes System aufrufen
       - Ergebnisse pro CRM-System zurückgeben
+
+    sync_timeout_seconds begrenzt jeden Sync-Aufruf pro CRM-System
+    (asyncio.wait_for); bei Überschreitung liefert das System ein
+    CRMSyncResult(success=False, code="crm_sync_timeout"). None = kein Timeout.
     """
 
     def __init__(
         self,
         sync_service: "CRMSyncService",
         credentials_store: "CRMCredentialsStore",
+        sync_timeout_seconds: Optional[float] = SYNC_TIMEOUT_S,
     ) -> None:
         self._sync_service = sync_service
         self._credentials_store = credentials_store
+        self._timeout = sync_timeout_seconds
 
     # ------------------------------------------------------------------
     # Internal helper
     # ------------------------------------------------------------------
 
-    async def _get_connected_systems(self, tenant_id: UUID) -> list[CRMSystem]:
+    async def _load_context(self, tenant_id: UUID) -> Optional["SyncContext"]:
         """
-        Liefert alle aktiv verbundenen CRM-Systeme für den Tenant.
-        Erwartet, dass der CredentialsStore eine passende Methode bereitstellt.
+        Lädt Verbindungen + Credentials aller aktiven CRM-Systeme des Tenants
+        mit einer DB-Abfrage (SyncContext); None, wenn keins verbunden ist.
+
+        Tenants ohne CRM sind der Normalfall: ist im connected_systems_cache
+        (30 s) bereits "keine Systeme" vermerkt, entfällt die Abfrage ganz.
+        Credential-Änderungen über den Store invalidieren den Tenant sofort.
         """
-        systems = await self._credentials_store.list_connected_systems(tenant_id)
+        cached = connected_systems_cache.get(tenant_id)
+        if cached is not None and not cached:
+            return None
+
+        context = await self._sync_service.load_sync_context(tenant_id)
         logger.debug(
             "Connected CRM systems for tenant_id=%s: %s",
             tenant_id,
-            [s.value for s in systems],
+            [s.value for s in context.systems],
         )
-        return list(systems)
+        return context if context.systems else None
+
+    async def _fanout(
+        self,
+        tenant_id: UUID,
+        object_type: str,
+        payload: Any,
+    ) -> Dict[CRMSystem, CRMSyncResult]:
+        """
+        Synct einen Payload zu allen verbundenen CRMs des Tenants.
+        """
+        context = await self._load_context(tenant_id)
+        if context is None:
+            logger.info(
+                "No connected CRMs for %s sync: tenant_id=%s, leadlane_id=%s",
+                object_type,
+                tenant_id,
+                _FANOUT[object_type][1](payload),
+            )
+            return {}
+
+        return await self._sync_to_systems(tenant_id, context, object_type, payload)
+
+    async def _sync_to_systems(
+        self,
+        tenant_id: UUID,
+        context: "SyncContext",
+        object_type: str,
+        payload: Any,
+    ) -> Dict[CRMSystem, CRMSyncResult]:
+        """
+        Ruft den Sync-Service für alle Systeme aus context parallel auf (mit
+        bereits geladenen Credentials), jeweils mit
+        self._timeout begrenzt. Ein fehlschlagendes oder hängendes CRM bricht
+        die anderen nicht ab (return_exceptions=True) – Exceptions und
+        Timeouts werden zu CRMSyncResult(success=False).
+        """
+        method_name, leadlane_id_of = _FANOUT[object_type]
+        sync = getattr(self._sync_service, method_name)
+        systems = context.systems
+
+        results = await asyncio.gather(
+            *[
+                asyncio.wait_for(
+                    sync(
+                        tenant_id=tenant_id,
+                        crm_system=system,
+                        payload=payload,
+                        context=context,
+                    ),
+                    timeout=self._timeout,
+                )
+                for system in systems
+            ],
+            return_exceptions=True,
+        )
+
+        out: Dict[CRMSystem, CRMSyncResult] = {}
+        for system, result in zip(systems, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result  # CancelledError & Co. nicht schlucken
+                if isinstance(result, asyncio.TimeoutError):
+                    logger.warning(
+                        "CRM sync timed out after %ss: tenant_id=%s, crm_system=%s, "
+                        "object_type=%s",
+                        self._timeout,
+                        tenant_id,
+                        system.value,
+                        object_type,
+                    )
+                    error = CRMSyncError(
+                        code="crm_sync_timeout",
+                        message=f"CRM sync timed out after {self._timeout}s",
+                    )
+                else:
+                    logger.error(
+                        "CRM sync failed: tenant_id=%s, crm_system=%s, object_type=%s",
+                        tenant_id,
+                        system.value,
+                        object_type,
+                        exc_info=result,
+                    )
+                    error = CRMSyncError(
+                        code="crm_sync_failed",
+                        message=str(result) or result.__class__.__name__,
+                    )
+                result = CRMSyncResult(
+                    success=False,
+                    crm_system=system,
+                    crm_object_type=object_type,
+                    crm_id=None,
+                    leadlane_id=leadlane_id_of(payload),
+                    errors=[error],
+                )
+            out[system] = result
+        return out
 
     # ------------------------------------------------------------------
     # Company / Account Events
@@ -71,28 +202,7 @@ class CRMSyncListener:
         Wird z.B. aufgerufen, wenn sich eine Company in LeadLane ändert.
         Synct zu allen verbundenen CRMs.
         """
-        systems = await self._get_connected_systems(tenant_id)
-        results: Dict[CRMSystem, CRMSyncResult] = {}
-
-        if not systems:
-            logger.info(
-                "No connected CRMs for company sync: tenant_id=%s, leadlane_company_id=%s",
-                tenant_id,
-                payload.leadlane_company_id,
-            )
-            return results
-
-        async def _sync(system: CRMSystem) -> tuple[CRMSystem, CRMSyncResult]:
-            res = await self._sync_service.sync_company_to_crm(
-                tenant_id=tenant_id,
-                crm_system=system,
-                payload=payload,
-            )
-            return system, res
-
-        pairs = await asyncio.gather(*[_sync(s) for s in systems])
-        results = {system: result for system, result in pairs}
-        return results
+        return await self._fanout(tenant_id, "company", payload)
 
     # ------------------------------------------------------------------
     # Contact Events
@@ -103,28 +213,7 @@ class CRMSyncListener:
         tenant_id: UUID,
         payload: CRMContactPayload,
     ) -> Dict[CRMSystem, CRMSyncResult]:
-        systems = await self._get_connected_systems(tenant_id)
-        results: Dict[CRMSystem, CRMSyncResult] = {}
-
-        if not systems:
-            logger.info(
-                "No connected CRMs for contact sync: tenant_id=%s, leadlane_contact_id=%s",
-                tenant_id,
-                payload.leadlane_contact_id,
-            )
-            return results
-
-        async def _sync(system: CRMSystem) -> tuple[CRMSystem, CRMSyncResult]:
-            res = await self._sync_service.sync_contact_to_crm(
-                tenant_id=tenant_id,
-                crm_system=system,
-                payload=payload,
-            )
-            return system, res
-
-        pairs = await asyncio.gather(*[_sync(s) for s in systems])
-        results = {system: result for system, result in pairs}
-        return results
+        return await self._fanout(tenant_id, "contact", payload)
 
     # ------------------------------------------------------------------
     # Deal / Opportunity Events
@@ -135,29 +224,7 @@ class CRMSyncListener:
         tenant_id: UUID,
         payload: CRMDealPayload,
     ) -> Dict[CRMSystem, CRMSyncResult]:
-        systems = await self._get_connected_systems(tenant_id)
-        results: Dict[CRMSystem, CRMSyncResult] = {}
-
-        if not systems:
-            logger.info(
-                "No connected CRMs for deal sync: tenant_id=%s, leadlane_opportunity_id=%s",
-                tenant_id,
-                payload.leadlane_opportunity_id,
-            )
-            return results
-
-        async def _sync(system: CRMSystem) -> tuple[CRMSystem, CRMSyncResult]:
-            # Dein Service heißt aktuell sync_opportunity_to_crm
-            res = await self._sync_service.sync_opportunity_to_crm(
-                tenant_id=tenant_id,
-                crm_system=system,
-                payload=payload,
-            )
-            return system, res
-
-        pairs = await asyncio.gather(*[_sync(s) for s in systems])
-        results = {system: result for system, result in pairs}
-        return results
+        return await self._fanout(tenant_id, "deal", payload)
 
     # ------------------------------------------------------------------
     # Activity Events
@@ -168,25 +235,69 @@ class CRMSyncListener:
         tenant_id: UUID,
         payload: CRMActivityPayload,
     ) -> Dict[CRMSystem, CRMSyncResult]:
-        systems = await self._get_connected_systems(tenant_id)
-        results: Dict[CRMSystem, CRMSyncResult] = {}
+        return await self._fanout(tenant_id, "activity", payload)
 
-        if not systems:
+    # ------------------------------------------------------------------
+    # Batch Events
+    # ------------------------------------------------------------------
+
+    async def on_batch_changed(
+        self,
+        tenant_id: UUID,
+        payloads_by_type: Mapping[str, Sequence[Any]],
+    ) -> Dict[str, List[Dict[CRMSystem, CRMSyncResult]]]:
+        """
+        Synct viele Payloads auf einmal, gruppiert nach object_type
+        ("company", "contact", "deal", "activity").
+
+        Verbindungen (SyncContext) werden einmal geladen und die Feld-Mappings
+        aller object_types pro System mit einer DB-Abfrage vorgeladen;
+        danach Fan-out wie bei den Einzel-Events.
+
+        Ergebnis: object_type -> Liste (in Payload-Reihenfolge) von
+        {CRMSystem: CRMSyncResult}.
+        """
+        unknown = set(payloads_by_type) - set(_FANOUT)
+        if unknown:
+            raise ValueError(f"Unbekannte object_types: {sorted(unknown)}")
+
+        context = await self._load_context(tenant_id)
+        if context is None:
             logger.info(
-                "No connected CRMs for activity sync: tenant_id=%s, leadlane_activity_id=%s",
+                "No connected CRMs for batch sync: tenant_id=%s, object_types=%s",
                 tenant_id,
-                payload.leadlane_activity_id,
+                list(payloads_by_type),
             )
-            return results
+            return {
+                object_type: [{} for _ in payloads]
+                for object_type, payloads in payloads_by_type.items()
+            }
 
-        async def _sync(system: CRMSystem) -> tuple[CRMSystem, CRMSyncResult]:
-            res = await self._sync_service.sync_activity_to_crm(
-                tenant_id=tenant_id,
-                crm_system=system,
-                payload=payload,
-            )
-            return system, res
+        object_types = [t for t, payloads in payloads_by_type.items() if payloads]
 
-        pairs = await asyncio.gather(*[_sync(s) for s in systems])
-        results = {system: result for system, result in pairs}
-        return results
+        async def _warm(system: CRMSystem) -> None:
+            try:
+                await self._sync_service.warm_field_mappings(
+                    tenant_id, system, object_types
+                )
+            except Exception:  # noqa: BLE001 - Sync lädt dann einzeln nach
+                logger.warning(
+                    "Preloading field mappings failed: tenant_id=%s, crm_system=%s",
+                    tenant_id,
+                    system.value,
+                    exc_info=True,
+                )
+
+        await asyncio.gather(*[_warm(s) for s in context.systems])
+
+        return {
+            object_type: list(
+                await asyncio.gather(
+                    *[
+                        self._sync_to_systems(tenant_id, context, object_type, p)
+                        for p in payloads
+                    ]
+                )
+            )
+            for object_type, payloads in payloads_by_type.items()
+        }
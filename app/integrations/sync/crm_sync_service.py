@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
-from typing import Optional, Union
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple, TypeVar, Union
 from uuid import UUID
 
+import httpx
+
 from app.integrations.crm.crm_types import (
     CRMSystem,
     CRMCompanyPayload,
@@ -15,10 +21,13 @@ from app.integrations.crm.crm_types import (
     CRMSyncResult,
     CRMSyncError,
 )
-from app.integrations.crm.crm_client_factory import create_crm_client
+from app.integrations.crm.crm_client import CRMClient
+from app.integrations.crm.crm_client_factory import get_crm_client
 from app.integrations.credentials.crm_credentials_store import (
     CRMCredentialsStore,
     CRMConnectionError,
+    CRMConnectionInfo,
+    connected_systems_cache,
 )
 from app.integrations.mapping import (
     CRMFieldMappingEngine,
@@ -32,11 +41,140 @@ logger = logging.getLogger(__name__)
 
 TenantId = Union[str, UUID]
 
+_P = TypeVar("_P")
+
+# max. gleichzeitige Upserts pro Batch-Aufruf (Tenant + CRM) – schont die
+# Rate-Limits der CRMs (HubSpot: 100 Requests / 10 s pro App und Account)
+_BATCH_CONCURRENCY = 8
+
+# Batch-Syncs schreiben gesammelte Links spätestens alle N Ergebnisse
+_LINK_FLUSH_SIZE = 500
+
+# Marker für _sync_one: existing_crm_id nicht vorab bekannt → Link selbst laden
+_LOOKUP: Any = object()
+
+# Erwartbare Fehler eines CRM-Upserts (HTTP/Netz, Timeout, Credentials):
+# eine Warn-Zeile statt Traceback. Alles andere loggt logger.exception.
+# CancelledError ist BaseException und wird nie abgefangen.
+_EXPECTED_UPSERT_ERRORS = (httpx.HTTPError, asyncio.TimeoutError, CRMConnectionError)
+
+# (code, message) -> CRMSyncError ohne details, für _simple_error_result.
+# Die Meldungen kommen aus festen Templates (pro CRM-System), die Menge ist
+# klein; _ERROR_TEMPLATES_MAX begrenzt sie trotzdem.
+_ERROR_TEMPLATES: Dict[Tuple[str, str], CRMSyncError] = {}
+_ERROR_TEMPLATES_MAX = 256
+
+# Link-Writes der Einzel-Syncs laufen als Task nach dem Return (kein DB-Roundtrip
+# im Aufrufpfad). Prozessweit, weil Services pro Request gebaut werden;
+# drain_pending_link_writes() wartet beim Shutdown darauf.
+_pending_link_writes: Set[asyncio.Task] = set()
+# (tenant_id, crm_system, object_type, leadlane_id) -> crm_id noch nicht
+# geschriebener Links – Lookups sehen sie so schon vor dem Commit.
+_pending_link_ids: Dict[Tuple[UUID, CRMSystem, str, str], str] = {}
+
+# tenant_id -> laufendes load_sync_context (Single-Flight für den
+# Credentials-Check, prozessweit – Services werden pro Request gebaut)
+_context_loads: Dict[UUID, asyncio.Future[SyncContext]] = {}
+
 
 def _as_uuid(value: TenantId) -> UUID:
     if isinstance(value, UUID):
         return value
-    return UUID(str(value))
+    return _parse_uuid(str(value))
+
+
+# Tenant-IDs kommen als str aus Events/Requests und wiederholen sich pro
+# Batch → UUID-Parsing einmal pro Wert statt pro Aufruf.
+@functools.lru_cache(maxsize=2048)
+def _parse_uuid(value: str) -> UUID:
+    return UUID(value)
+
+
+async def drain_pending_link_writes() -> None:
+    """
+    Wartet auf alle noch laufenden Link-Writes (App-Shutdown).
+    """
+    if _pending_link_writes:
+        await asyncio.gather(*list(_pending_link_writes), return_exceptions=True)
+
+
+@dataclass(slots=True, frozen=True)
+class SyncContext:
+    """
+    Pro Domain-Event einmal aufgelöste Sync-Voraussetzungen eines Tenants:
+    alle aktiven CRM-Verbindungen (inkl. Credentials) aus einer DB-Abfrage.
+
+    Wird vom CRMSyncListener an die sync_*_to_crm-Methoden durchgereicht,
+    damit der Credentials-Check nicht pro CRM-System erneut die DB fragt.
+    Feld-Mappings laufen weiterhin über den Cache der MappingEngine.
+    """
+
+    tenant_id: UUID
+    connections: Mapping[CRMSystem, CRMConnectionInfo]
+
+    @property
+    def systems(self) -> Tuple[CRMSystem, ...]:
+        return tuple(self.connections)
+
+
+@dataclass(slots=True, frozen=True)
+class _SyncSpec:
+    """
+    Was sich zwischen Company-, Contact-, Opportunity- und Activity-Sync
+    unterscheidet; der Ablauf selbst steht einmal in _sync_single/_sync_one.
+    """
+
+    object_type: str
+    leadlane_attr: str  # ID-Attribut am Payload
+    upsert_method: str  # Methode am CRMClient
+    links_repo_attr: str  # Link-Repository am Service (None-Repo → ohne Links)
+    link_leadlane_kw: str  # LeadLane-ID-Keyword von get_by_leadlane_id/upsert_link
+    link_crm_attr: str  # CRM-ID am Link bzw. Keyword von upsert_link
+    missing_id_message: str
+    upsert_error_message: str
+
+
+_COMPANY_SPEC = _SyncSpec(
+    object_type="company",
+    leadlane_attr="leadlane_sub_company_id",
+    upsert_method="upsert_company",
+    links_repo_attr="_account_links_repo",
+    link_leadlane_kw="leadlane_sub_company_id",
+    link_crm_attr="crm_account_id",
+    missing_id_message="CRMCompanyPayload.leadlane_sub_company_id ist erforderlich.",
+    upsert_error_message="Unerwarteter Fehler beim Upsert der Company im CRM.",
+)
+_CONTACT_SPEC = _SyncSpec(
+    object_type="contact",
+    leadlane_attr="leadlane_contact_id",
+    upsert_method="upsert_contact",
+    links_repo_attr="_contact_links_repo",
+    link_leadlane_kw="leadlane_contact_id",
+    link_crm_attr="crm_contact_id",
+    missing_id_message="CRMContactPayload.leadlane_contact_id ist erforderlich.",
+    upsert_error_message="Unerwarteter Fehler beim Upsert des Kontakts im CRM.",
+)
+_OPPORTUNITY_SPEC = _SyncSpec(
+    object_type="opportunity",
+    # Opportunities sind Demos: Payload und Link-Tabelle nutzen leadlane_demo_id
+    leadlane_attr="leadlane_demo_id",
+    upsert_method="upsert_deal",
+    links_repo_attr="_opportunity_links_repo",
+    link_leadlane_kw="leadlane_demo_id",
+    link_crm_attr="crm_opportunity_id",
+    missing_id_message="CRMDealPayload.leadlane_demo_id ist erforderlich.",
+    upsert_error_message="Unerwarteter Fehler beim Upsert der Opportunity im CRM.",
+)
+_ACTIVITY_SPEC = _SyncSpec(
+    object_type="activity",
+    leadlane_attr="leadlane_activity_id",
+    upsert_method="upsert_activity",
+    links_repo_attr="_activity_links_repo",
+    link_leadlane_kw="leadlane_activity_id",
+    link_crm_attr="crm_activity_id",
+    missing_id_message="CRMActivityPayload.leadlane_activity_id ist erforderlich.",
+    upsert_error_message="Unerwarteter Fehler beim Upsert der Aktivität im CRM.",
+)
 
 
 class CRMSyncService:
@@ -75,14 +213,68 @@ class CRMSyncService:
         tenant_id: TenantId,
         crm_system: CRMSystem,
         payload: CRMCompanyPayload,
+        context: Optional[SyncContext] = None,
     ) -> CRMSyncResult:
         """
         Synchronisiert eine Company (Account) in ein bestimmtes CRM.
         """
-        leadlane_id = payload.leadlane_sub_company_id
+        return await self._sync_single(_COMPANY_SPEC, tenant_id, crm_system, payload, context)
 
-        logger.info(
-            "Starting company sync: tenant_id=%s, crm_system=%s, leadlane_company_id=%s",
+    async def sync_contact_to_crm(
+        self,
+        tenant_id: TenantId,
+        crm_system: CRMSystem,
+        payload: CRMContactPayload,
+        context: Optional[SyncContext] = None,
+    ) -> CRMSyncResult:
+        """
+        Synchronisiert einen Contact in ein bestimmtes CRM.
+        """
+        return await self._sync_single(_CONTACT_SPEC, tenant_id, crm_system, payload, context)
+
+    async def sync_opportunity_to_crm(
+        self,
+        tenant_id: TenantId,
+        crm_system: CRMSystem,
+        payload: CRMDealPayload,
+        context: Optional[SyncContext] = None,
+    ) -> CRMSyncResult:
+        """
+        Synchronisiert eine Opportunity (Deal) in ein bestimmtes CRM.
+        """
+        return await self._sync_single(
+            _OPPORTUNITY_SPEC, tenant_id, crm_system, payload, context
+        )
+
+    async def sync_activity_to_crm(
+        self,
+        tenant_id: TenantId,
+        crm_system: CRMSystem,
+        payload: CRMActivityPayload,
+        context: Optional[SyncContext] = None,
+    ) -> CRMSyncResult:
+        """
+        Synchronisiert eine Aktivität (Call, Mail, Task, etc.) in ein bestimmtes CRM.
+        """
+        return await self._sync_single(_ACTIVITY_SPEC, tenant_id, crm_system, payload, context)
+
+    async def _sync_single(
+        self,
+        spec: _SyncSpec,
+        tenant_id: TenantId,
+        crm_system: CRMSystem,
+        payload: Any,
+        context: Optional[SyncContext],
+    ) -> CRMSyncResult:
+        """
+        Gemeinsamer Ablauf der Einzel-Syncs: Validierung, Credentials,
+        Client, dann _sync_one.
+        """
+        leadlane_id = getattr(payload, spec.leadlane_attr, None)
+
+        logger.debug(
+            "Starting %s sync: tenant_id=%s, crm_system=%s, leadlane_id=%s",
+            spec.object_type,
             tenant_id,
             crm_system.value,
             leadlane_id,
@@ -92,74 +284,42 @@ class CRMSyncService:
         if not leadlane_id:
             return self._simple_error_result(
                 crm_system=crm_system,
-                object_type="company",
+                object_type=spec.object_type,
                 leadlane_id=None,
                 code="missing_leadlane_id",
-                message="CRMCompanyPayload.leadlane_sub_company_id ist erforderlich.",
+                message=spec.missing_id_message,
             )
 
-        # 2) Credentials prüfen / laden
-        credentials_ok = await self._ensure_credentials(
-            tenant_id, crm_system, object_type="company", leadlane_id=leadlane_id
+        # 2) Credentials prüfen und vorhandenen Link holen – unabhängig
+        # voneinander, daher parallel (ein Roundtrip Latenz statt zwei)
+        credentials_ok, existing_crm_id = await asyncio.gather(
+            self._ensure_credentials(
+                tenant_id,
+                crm_system,
+                object_type=spec.object_type,
+                leadlane_id=leadlane_id,
+                context=context,
+            ),
+            self._lookup_existing_crm_id(spec, tenant_id, crm_system, leadlane_id),
+            return_exceptions=True,
         )
+        if isinstance(credentials_ok, BaseException):
+            raise credentials_ok
         if isinstance(credentials_ok, CRMSyncResult):
             # Im Fehlerfall geben wir direkt das Result zurück
             return credentials_ok
+        if isinstance(existing_crm_id, BaseException):
+            raise existing_crm_id
 
         # 3) CRM-Client erzeugen
-        client = create_crm_client(
-            crm_system=crm_system,
-            tenant_id=str(tenant_id),
-            credentials_store=self._credentials_store,
-            mapping_engine=self._mapping_engine,
-        )
-
-        # 4) Vorhandenen Link holen (falls schon einmal synchronisiert)
-        # nutzt DEIN Repo: get_by_leadlane_id(.., leadlane_sub_company_id)
-        tenant_uuid = _as_uuid(tenant_id)
-        existing_link = await self._account_links_repo.get_by_leadlane_id(
-            tenant_id=tenant_uuid,
-            crm_system=crm_system,
-            leadlane_sub_company_id=leadlane_id,
-        )
-        # Feldname aus deinem Dataclass: crm_account_id
-        existing_crm_id: Optional[str] = (
-            existing_link.crm_account_id if existing_link else None
-        )
-
-        # 5) Upsert ausführen
-        try:
-            result = await client.upsert_company(
-                payload=payload,
-                existing_crm_id=existing_crm_id,
-            )
-        except Exception as exc:  # noqa: BLE001
-            logger.exception(
-                "Error while upserting company to CRM: tenant_id=%s, crm_system=%s, leadlane_company_id=%s",
-                tenant_id,
-                crm_system.value,
-                leadlane_id,
-            )
-            return self._simple_error_result(
-                crm_system=crm_system,
-                object_type="company",
-                leadlane_id=leadlane_id,
-                code="crm_client_error",
-                message="Unerwarteter Fehler beim Upsert der Company im CRM.",
-                details={"exception": repr(exc)},
-            )
+        client = self._create_client(tenant_id, crm_system)
 
-        # 6) Link updaten/erstellen, wenn Upsert erfolgreich
-        await self._handle_link_update_for_company(
-            tenant_id=tenant_id,
-            crm_system=crm_system,
-            leadlane_company_id=leadlane_id,
-            existing_link_id=None,  # wir nutzen upsert_link, ID ist egal
-            result=result,
+        result = await self._sync_one(
+            spec, tenant_id, crm_system, client, payload, existing_crm_id=existing_crm_id
         )
-
         logger.info(
-            "Finished company sync: tenant_id=%s, crm_system=%s, leadlane_company_id=%s, success=%s",
+            "Finished %s sync: tenant_id=%s, crm_system=%s, leadlane_id=%s, success=%s",
+            spec.object_type,
             tenant_id,
             crm_system.value,
             leadlane_id,
@@ -167,280 +327,505 @@ class CRMSyncService:
         )
         return result
 
-    async def sync_contact_to_crm(
+    async def _sync_one(
         self,
+        spec: _SyncSpec,
         tenant_id: TenantId,
         crm_system: CRMSystem,
-        payload: CRMContactPayload,
+        client: CRMClient,
+        payload: Any,
+        existing_crm_id: Optional[str] = _LOOKUP,
+        update_link: bool = True,
     ) -> CRMSyncResult:
         """
-        Synchronisiert einen Contact in ein bestimmtes CRM.
+        Link-Lookup, Upsert und Link-Update für ein (validiertes) Objekt –
+        Credentials sind bereits geprüft, der Client ist erzeugt.
+        existing_crm_id: vorab (Batch) geladene CRM-ID; ohne → eigener Lookup.
+        update_link=False: Link schreibt der Aufrufer (Batch: bulk_upsert_links).
         """
-        leadlane_id = payload.leadlane_contact_id
+        leadlane_id = getattr(payload, spec.leadlane_attr)
+        links_repo = getattr(self, spec.links_repo_attr)
 
-        logger.info(
-            "Starting contact sync: tenant_id=%s, crm_system=%s, leadlane_contact_id=%s",
-            tenant_id,
-            crm_system.value,
-            leadlane_id,
-        )
-
-        if not leadlane_id:
-            return self._simple_error_result(
-                crm_system=crm_system,
-                object_type="contact",
-                leadlane_id=None,
-                code="missing_leadlane_id",
-                message="CRMContactPayload.leadlane_contact_id ist erforderlich.",
+        # 4) Vorhandenen Link holen (falls schon einmal synchronisiert)
+        if existing_crm_id is _LOOKUP:
+            existing_crm_id = await self._lookup_existing_crm_id(
+                spec, tenant_id, crm_system, leadlane_id
             )
 
-        credentials_ok = await self._ensure_credentials(
-            tenant_id, crm_system, object_type="contact", leadlane_id=leadlane_id
-        )
-        if isinstance(credentials_ok, CRMSyncResult):
-            return credentials_ok
-
-        client = create_crm_client(
-            crm_system=crm_system,
-            tenant_id=str(tenant_id),
-            credentials_store=self._credentials_store,
-            mapping_engine=self._mapping_engine,
-        )
-
-        tenant_uuid = _as_uuid(tenant_id)
-        existing_link = await self._contact_links_repo.get_by_leadlane_id(
-            tenant_id=tenant_uuid,
-            crm_system=crm_system,
-            leadlane_contact_id=leadlane_id,
-        )
-        existing_crm_id: Optional[str] = (
-            existing_link.crm_contact_id if existing_link else None
-        )
-
+        # 5) Upsert ausführen
         try:
-            result = await client.upsert_contact(
+            result = await getattr(client, spec.upsert_method)(
                 payload=payload,
                 existing_crm_id=existing_crm_id,
             )
         except Exception as exc:  # noqa: BLE001
-            logger.exception(
-                "Error while upserting contact to CRM: tenant_id=%s, crm_system=%s, leadlane_contact_id=%s",
-                tenant_id,
-                crm_system.value,
-                leadlane_id,
-            )
+            if isinstance(exc, _EXPECTED_UPSERT_ERRORS):
+                logger.warning(
+                    "Error while upserting %s to CRM: tenant_id=%s, crm_system=%s, leadlane_id=%s, error=%r",
+                    spec.object_type,
+                    tenant_id,
+                    crm_system.value,
+                    leadlane_id,
+                    exc,
+                )
+            else:
+                logger.exception(
+                    "Error while upserting %s to CRM: tenant_id=%s, crm_system=%s, leadlane_id=%s",
+                    spec.object_type,
+                    tenant_id,
+                    crm_system.value,
+                    leadlane_id,
+                )
             return self._simple_error_result(
                 crm_system=crm_system,
-                object_type="contact",
+                object_type=spec.object_type,
                 leadlane_id=leadlane_id,
                 code="crm_client_error",
-                message="Unerwarteter Fehler beim Upsert des Kontakts im CRM.",
+                message=spec.upsert_error_message,
                 details={"exception": repr(exc)},
             )
 
-        await self._handle_link_update_for_contact(
-            tenant_id=tenant_id,
-            crm_system=crm_system,
-            leadlane_contact_id=leadlane_id,
-            existing_link_id=None,
-            result=result,
-        )
+        # 6) Link updaten/erstellen, wenn Upsert erfolgreich – im Hintergrund
+        if (
+            update_link
+            and result.success
+            and result.crm_id
+            and result.crm_id != existing_crm_id
+            and links_repo is not None
+        ):
+            self._schedule_link_update(spec, tenant_id, crm_system, leadlane_id, result)
 
-        logger.info(
-            "Finished contact sync: tenant_id=%s, crm_system=%s, leadlane_contact_id=%s, success=%s",
-            tenant_id,
-            crm_system.value,
-            leadlane_id,
-            result.success,
-        )
         return result
 
-    async def sync_opportunity_to_crm(
+    async def _lookup_existing_crm_id(
         self,
+        spec: _SyncSpec,
         tenant_id: TenantId,
         crm_system: CRMSystem,
-        payload: CRMDealPayload,
-    ) -> CRMSyncResult:
+        leadlane_id: str,
+    ) -> Optional[str]:
         """
-        Synchronisiert eine Opportunity (Deal) in ein bestimmtes CRM.
+        CRM-ID des vorhandenen Links – zuerst ein noch nicht geschriebener
+        Link aus einem vorigen Sync, dann das Link-Repository.
         """
-        leadlane_id = payload.leadlane_opportunity_id
-
-        logger.info(
-            "Starting opportunity sync: tenant_id=%s, crm_system=%s, leadlane_opportunity_id=%s",
-            tenant_id,
-            crm_system.value,
-            leadlane_id,
-        )
-
-        if not leadlane_id:
-            return self._simple_error_result(
-                crm_system=crm_system,
-                object_type="opportunity",
-                leadlane_id=None,
-                code="missing_leadlane_id",
-                message="CRMDealPayload.leadlane_opportunity_id ist erforderlich.",
-            )
-
-        credentials_ok = await self._ensure_credentials(
-            tenant_id, crm_system, object_type="opportunity", leadlane_id=leadlane_id
-        )
-        if isinstance(credentials_ok, CRMSyncResult):
-            return credentials_ok
-
-        client = create_crm_client(
-            crm_system=crm_system,
-            tenant_id=str(tenant_id),
-            credentials_store=self._credentials_store,
-            mapping_engine=self._mapping_engine,
-        )
-
         tenant_uuid = _as_uuid(tenant_id)
-        # dein Repo heißt leadlane_demo_id – wir verwenden die Opportunity-ID dafür
-        existing_link = await self._opportunity_links_repo.get_by_leadlane_id(
+        crm_id = _pending_link_ids.get((tenant_uuid, crm_system, spec.object_type, leadlane_id))
+        if crm_id is not None:
+            return crm_id
+
+        links_repo = getattr(self, spec.links_repo_attr)
+        if links_repo is None:
+            return None
+        existing_link = await links_repo.get_by_leadlane_id(
             tenant_id=tenant_uuid,
             crm_system=crm_system,
-            leadlane_demo_id=leadlane_id,
-        )
-        existing_crm_id: Optional[str] = (
-            existing_link.crm_opportunity_id if existing_link else None
+            **{spec.link_leadlane_kw: leadlane_id},
         )
+        return getattr(existing_link, spec.link_crm_attr, None)
 
-        try:
-            result = await client.upsert_deal(
-                payload=payload,
-                existing_crm_id=existing_crm_id,
-            )
-        except Exception as exc:  # noqa: BLE001
-            logger.exception(
-                "Error while upserting opportunity to CRM: tenant_id=%s, crm_system=%s, leadlane_opportunity_id=%s",
-                tenant_id,
-                crm_system.value,
-                leadlane_id,
-            )
-            return self._simple_error_result(
+    def _schedule_link_update(
+        self,
+        spec: _SyncSpec,
+        tenant_id: TenantId,
+        crm_system: CRMSystem,
+        leadlane_id: str,
+        result: CRMSyncResult,
+    ) -> None:
+        """
+        Startet _handle_link_update als Task; der Sync-Aufrufer wartet nicht
+        auf den DB-Write. Fehler werden im Done-Callback geloggt.
+        """
+        key = (_as_uuid(tenant_id), crm_system, spec.object_type, leadlane_id)
+        crm_id = result.crm_id
+        _pending_link_ids[key] = crm_id
+
+        task = asyncio.create_task(
+            self._handle_link_update(
+                spec,
+                tenant_id=tenant_id,
                 crm_system=crm_system,
-                object_type="opportunity",
                 leadlane_id=leadlane_id,
-                code="crm_client_error",
-                message="Unerwarteter Fehler beim Upsert der Opportunity im CRM.",
-                details={"exception": repr(exc)},
+                existing_crm_id=None,
+                result=result,
             )
-
-        await self._handle_link_update_for_opportunity(
-            tenant_id=tenant_id,
-            crm_system=crm_system,
-            leadlane_opportunity_id=leadlane_id,
-            existing_link_id=None,
-            result=result,
         )
+        _pending_link_writes.add(task)
+
+        def _done(task: asyncio.Task) -> None:
+            _pending_link_writes.discard(task)
+            if _pending_link_ids.get(key) == crm_id:
+                del _pending_link_ids[key]
+            if not task.cancelled() and task.exception() is not None:
+                logger.error(
+                    "Link update failed: tenant_id=%s, crm_system=%s, object_type=%s, leadlane_id=%s",
+                    tenant_id,
+                    crm_system.value,
+                    spec.object_type,
+                    leadlane_id,
+                    exc_info=task.exception(),
+                )
 
-        logger.info(
-            "Finished opportunity sync: tenant_id=%s, crm_system=%s, leadlane_opportunity_id=%s, success=%s",
+        task.add_done_callback(_done)
+
+    # -------------------------------------------------------------------------
+    # Batch-API: Credentials + Client einmal pro (Tenant, CRM), Upserts parallel
+    # -------------------------------------------------------------------------
+
+    async def sync_companies_to_crm(
+        self,
+        tenant_id: TenantId,
+        crm_system: CRMSystem,
+        payloads: Sequence[CRMCompanyPayload],
+        context: Optional[SyncContext] = None,
+        max_concurrency: int = _BATCH_CONCURRENCY,
+    ) -> List[CRMSyncResult]:
+        """
+        Wie sync_company_to_crm für viele Companies. Ergebnisse in
+        Reihenfolge der payloads.
+        """
+        return await self._sync_batch(
+            _COMPANY_SPEC,
             tenant_id,
-            crm_system.value,
-            leadlane_id,
-            result.success,
+            crm_system,
+            payloads,
+            lookup_crm_ids=self._lookup_account_crm_ids,
+            upsert_links=self._account_links_repo.bulk_upsert_links,
+            context=context,
+            max_concurrency=max_concurrency,
         )
-        return result
 
-    async def sync_activity_to_crm(
+    async def sync_contacts_to_crm(
         self,
         tenant_id: TenantId,
         crm_system: CRMSystem,
-        payload: CRMActivityPayload,
-    ) -> CRMSyncResult:
+        payloads: Sequence[CRMContactPayload],
+        context: Optional[SyncContext] = None,
+        max_concurrency: int = _BATCH_CONCURRENCY,
+    ) -> List[CRMSyncResult]:
         """
-        Synchronisiert eine Aktivität (Call, Mail, Task, etc.) in ein bestimmtes CRM.
+        Wie sync_contact_to_crm für viele Contacts. Ergebnisse in
+        Reihenfolge der payloads.
         """
-        leadlane_id = payload.leadlane_activity_id
-
-        logger.info(
-            "Starting activity sync: tenant_id=%s, crm_system=%s, leadlane_activity_id=%s",
+        return await self._sync_batch(
+            _CONTACT_SPEC,
             tenant_id,
-            crm_system.value,
-            leadlane_id,
+            crm_system,
+            payloads,
+            lookup_crm_ids=self._lookup_contact_crm_ids,
+            upsert_links=self._contact_links_repo.bulk_upsert_links,
+            context=context,
+            max_concurrency=max_concurrency,
         )
 
-        if not leadlane_id:
-            return self._simple_error_result(
-                crm_system=crm_system,
-                object_type="activity",
-                leadlane_id=None,
-                code="missing_leadlane_id",
-                message="CRMActivityPayload.leadlane_activity_id ist erforderlich.",
-            )
+    async def stream_sync_companies_to_crm(
+        self,
+        tenant_id: TenantId,
+        crm_system: CRMSystem,
+        payloads: Sequence[CRMCompanyPayload],
+        context: Optional[SyncContext] = None,
+        max_concurrency: int = _BATCH_CONCURRENCY,
+    ) -> AsyncIterator[CRMSyncResult]:
+        """
+        Wie sync_companies_to_crm, liefert die Ergebnisse aber sofort in
+        Fertigstellungs-Reihenfolge (Zuordnung über result.leadlane_id).
+        """
+        async for _, result in self._iter_batch(
+            _COMPANY_SPEC,
+            tenant_id,
+            crm_system,
+            payloads,
+            lookup_crm_ids=self._lookup_account_crm_ids,
+            upsert_links=self._account_links_repo.bulk_upsert_links,
+            context=context,
+            max_concurrency=max_concurrency,
+        ):
+            yield result
+
+    async def stream_sync_contacts_to_crm(
+        self,
+        tenant_id: TenantId,
+        crm_system: CRMSystem,
+        payloads: Sequence[CRMContactPayload],
+        context: Optional[SyncContext] = None,
+        max_concurrency: int = _BATCH_CONCURRENCY,
+    ) -> AsyncIterator[CRMSyncResult]:
+        """
+        Wie sync_contacts_to_crm, Ergebnisse in Fertigstellungs-Reihenfolge.
+        """
+        async for _, result in self._iter_batch(
+            _CONTACT_SPEC,
+            tenant_id,
+            crm_system,
+            payloads,
+            lookup_crm_ids=self._lookup_contact_crm_ids,
+            upsert_links=self._contact_links_repo.bulk_upsert_links,
+            context=context,
+            max_concurrency=max_concurrency,
+        ):
+            yield result
+
+    async def _sync_batch(
+        self,
+        spec: _SyncSpec,
+        tenant_id: TenantId,
+        crm_system: CRMSystem,
+        payloads: Sequence[_P],
+        **kwargs: Any,
+    ) -> List[CRMSyncResult]:
+        """
+        _iter_batch, eingesammelt in Reihenfolge der payloads.
+        """
+        out: List[Optional[CRMSyncResult]] = [None] * len(payloads)
+        async for index, result in self._iter_batch(spec, tenant_id, crm_system, payloads, **kwargs):
+            out[index] = result
+        return out  # type: ignore[return-value]
 
-        credentials_ok = await self._ensure_credentials(
-            tenant_id, crm_system, object_type="activity", leadlane_id=leadlane_id
-        )
-        if isinstance(credentials_ok, CRMSyncResult):
-            return credentials_ok
+    async def _iter_batch(
+        self,
+        spec: _SyncSpec,
+        tenant_id: TenantId,
+        crm_system: CRMSystem,
+        payloads: Sequence[_P],
+        *,
+        lookup_crm_ids: Callable[[UUID, CRMSystem, List[str]], Awaitable[Dict[str, str]]],
+        upsert_links: Callable[[UUID, CRMSystem, Sequence[Tuple[str, str]]], Awaitable[Any]],
+        context: Optional[SyncContext],
+        max_concurrency: int,
+    ) -> AsyncIterator[Tuple[int, CRMSyncResult]]:
+        """
+        Gemeinsamer Ablauf der Batch-Syncs, liefert (Index in payloads, Result)
+        in Fertigstellungs-Reihenfolge:
+          1) Credentials einmal prüfen, Client einmal erzeugen
+          2) vorhandene Links aller Payloads mit einer Abfrage laden
+          3) _sync_one pro Payload, max. max_concurrency Tasks gleichzeitig
+             (Tasks werden erst bei freiem Slot angelegt)
+          4) Exceptions → CRMSyncResult(success=False)
+          5) neue/geänderte Links per Bulk-Upsert schreiben, alle
+             _LINK_FLUSH_SIZE Ergebnisse und am Ende
+
+        Bricht der Aufrufer die Iteration ab, werden laufende Tasks abgebrochen
+        und die bis dahin gesammelten Links trotzdem geschrieben.
+        """
+        if not payloads:
+            return
 
-        if not self._activity_links_repo:
-            # Falls du Activities (noch) nicht verlinkst, trotzdem ins CRM schreiben
-            logger.debug("No activity_links_repo configured – skipping link handling.")
+        object_type = spec.object_type
+        leadlane_id_of: Callable[[_P], Optional[str]] = attrgetter(spec.leadlane_attr)
 
-        client = create_crm_client(
-            crm_system=crm_system,
-            tenant_id=str(tenant_id),
-            credentials_store=self._credentials_store,
-            mapping_engine=self._mapping_engine,
+        logger.info(
+            "Starting %s batch sync: tenant_id=%s, crm_system=%s, count=%s",
+            object_type,
+            tenant_id,
+            crm_system.value,
+            len(payloads),
         )
 
-        existing_link = None
-        if self._activity_links_repo:
-            tenant_uuid = _as_uuid(tenant_id)
-            # hier musst du schauen, wie dein Activity-Link-Repo heißt – ich gehe von get_by_leadlane_id aus
-            existing_link = await self._activity_links_repo.get_by_leadlane_id(
-                tenant_id=tenant_uuid,
-                crm_system=crm_system,
-                leadlane_activity_id=leadlane_id,
-            )
-
-        # analog: crm_activity_id o.ä., je nach Dataclass
-        existing_crm_id: Optional[str] = (
-            getattr(existing_link, "crm_activity_id", None) if existing_link else None
+        credentials_error = await self._ensure_credentials(
+            tenant_id, crm_system, object_type=object_type, context=context
         )
+        if credentials_error is not None:
+            for index, payload in enumerate(payloads):
+                yield index, credentials_error.copy(update={"leadlane_id": leadlane_id_of(payload)})
+            return
+
+        client = self._create_client(tenant_id, crm_system)
 
+        # LeadLane-ID -> CRM-ID; None → Fallback auf Einzel-Lookups
+        existing: Optional[Dict[str, str]]
         try:
-            result = await client.upsert_activity(
-                payload=payload,
-                existing_crm_id=existing_crm_id,
+            existing = await lookup_crm_ids(
+                _as_uuid(tenant_id),
+                crm_system,
+                [i for i in map(leadlane_id_of, payloads) if i],
             )
-        except Exception as exc:  # noqa: BLE001
-            logger.exception(
-                "Error while upserting activity to CRM: tenant_id=%s, crm_system=%s, leadlane_activity_id=%s",
+        except Exception:  # noqa: BLE001
+            logger.warning(
+                "Bulk link lookup failed, falling back to single lookups: "
+                "tenant_id=%s, crm_system=%s, object_type=%s",
                 tenant_id,
                 crm_system.value,
-                leadlane_id,
-            )
-            return self._simple_error_result(
-                crm_system=crm_system,
-                object_type="activity",
-                leadlane_id=leadlane_id,
-                code="crm_client_error",
-                message="Unerwarteter Fehler beim Upsert der Aktivität im CRM.",
-                details={"exception": repr(exc)},
+                object_type,
+                exc_info=True,
             )
+            existing = None
 
-        if self._activity_links_repo:
-            await self._handle_link_update_for_activity(
-                tenant_id=tenant_id,
-                crm_system=crm_system,
-                leadlane_activity_id=leadlane_id,
-                existing_link_id=None,
-                result=result,
-            )
+        # noch laufende Link-Writes von Einzel-Syncs stehen nicht in der DB
+        if existing is not None and _pending_link_ids:
+            tenant_uuid = _as_uuid(tenant_id)
+            for leadlane_id in filter(None, map(leadlane_id_of, payloads)):
+                pending = _pending_link_ids.get((tenant_uuid, crm_system, object_type, leadlane_id))
+                if pending is not None:
+                    existing[leadlane_id] = pending
+
+        link_pairs: List[Tuple[str, str]] = []
+
+        async def _flush_links() -> None:
+            if not link_pairs:
+                return
+            pairs = link_pairs[:]
+            link_pairs.clear()
+            try:
+                await upsert_links(_as_uuid(tenant_id), crm_system, pairs)
+            except Exception:  # noqa: BLE001 - CRM-Upserts sind bereits erfolgt
+                logger.exception(
+                    "Bulk link upsert failed: tenant_id=%s, crm_system=%s, object_type=%s, count=%s",
+                    tenant_id,
+                    crm_system.value,
+                    object_type,
+                    len(pairs),
+                )
+
+        def _finish(index: int, task: asyncio.Task) -> CRMSyncResult:
+            leadlane_id = leadlane_id_of(payloads[index])
+            exc = task.exception()
+            if exc is not None:
+                if not isinstance(exc, Exception):
+                    raise exc
+                logger.error(
+                    "Error in %s batch sync: tenant_id=%s, crm_system=%s, leadlane_id=%s",
+                    object_type,
+                    tenant_id,
+                    crm_system.value,
+                    leadlane_id,
+                    exc_info=exc,
+                )
+                return self._simple_error_result(
+                    crm_system=crm_system,
+                    object_type=object_type,
+                    leadlane_id=leadlane_id,
+                    code="crm_sync_failed",
+                    message=str(exc) or exc.__class__.__name__,
+                )
+
+            result: CRMSyncResult = task.result()
+            # Nur Links schreiben, die neu sind oder sich geändert haben
+            if (
+                result.success
+                and result.crm_id
+                and (existing is None or existing.get(leadlane_id) != result.crm_id)
+            ):
+                link_pairs.append((leadlane_id, result.crm_id))
+            return result
+
+        limit = max(1, max_concurrency)
+        running: Dict[asyncio.Task, int] = {}
+        count = failed = 0
+        try:
+            for index, payload in enumerate(payloads):
+                leadlane_id = leadlane_id_of(payload)
+                if not leadlane_id:
+                    count += 1
+                    failed += 1
+                    yield index, self._simple_error_result(
+                        crm_system=crm_system,
+                        object_type=object_type,
+                        leadlane_id=None,
+                        code="missing_leadlane_id",
+                        message=spec.missing_id_message,
+                    )
+                    continue
+
+                task = asyncio.ensure_future(
+                    self._sync_one(
+                        spec,
+                        tenant_id,
+                        crm_system,
+                        client,
+                        payload,
+                        existing_crm_id=_LOOKUP if existing is None else existing.get(leadlane_id),
+                        update_link=False,
+                    )
+                )
+                running[task] = index
+
+                # Slot frei machen, bevor der nächste Task angelegt wird
+                while len(running) >= limit:
+                    done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        done_index = running.pop(task)
+                        result = _finish(done_index, task)
+                        count += 1
+                        failed += not result.success
+                        yield done_index, result
+                    if len(link_pairs) >= _LINK_FLUSH_SIZE:
+                        await _flush_links()
+
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    done_index = running.pop(task)
+                    result = _finish(done_index, task)
+                    count += 1
+                    failed += not result.success
+                    yield done_index, result
+                if len(link_pairs) >= _LINK_FLUSH_SIZE:
+                    await _flush_links()
+        finally:
+            for task in running:
+                task.cancel()
+            await _flush_links()
 
         logger.info(
-            "Finished activity sync: tenant_id=%s, crm_system=%s, leadlane_activity_id=%s, success=%s",
+            "Finished %s batch sync: tenant_id=%s, crm_system=%s, count=%s, failed=%s",
+            object_type,
             tenant_id,
             crm_system.value,
-            leadlane_id,
-            result.success,
+            count,
+            failed,
+        )
+
+    async def _lookup_account_crm_ids(
+        self, tenant_id: UUID, crm_system: CRMSystem, leadlane_ids: List[str]
+    ) -> Dict[str, str]:
+        links = await self._account_links_repo.get_many_by_leadlane_ids(
+            tenant_id=tenant_id,
+            crm_system=crm_system,
+            leadlane_sub_company_ids=leadlane_ids,
+        )
+        return {leadlane_id: link.crm_account_id for leadlane_id, link in links.items()}
+
+    async def _lookup_contact_crm_ids(
+        self, tenant_id: UUID, crm_system: CRMSystem, leadlane_ids: List[str]
+    ) -> Dict[str, str]:
+        links = await self._contact_links_repo.get_many_by_leadlane_ids(
+            tenant_id=tenant_id,
+            crm_system=crm_system,
+            leadlane_contact_ids=leadlane_ids,
+        )
+        return {leadlane_id: link.crm_contact_id for leadlane_id, link in links.items()}
+
+    async def load_sync_context(self, tenant_id: TenantId) -> SyncContext:
+        """
+        Lädt alle aktiven CRM-Verbindungen des Tenants mit einer Abfrage und
+        aktualisiert nebenbei den connected_systems_cache.
+        """
+        tenant_uuid = _as_uuid(tenant_id)
+        connections = {
+            conn.crm_system: conn
+            for conn in await self._credentials_store.list_connections_for_tenant(
+                tenant_uuid
+            )
+            if conn.is_enabled
+        }
+        connected_systems_cache.set(tenant_uuid, sorted(connections, key=lambda s: s.value))
+        return SyncContext(tenant_id=tenant_uuid, connections=connections)
+
+    async def warm_field_mappings(
+        self,
+        tenant_id: TenantId,
+        crm_system: CRMSystem,
+        object_types: Sequence[str],
+    ) -> None:
+        """
+        Lädt die Feld-Mappings für mehrere object_types mit einer DB-Abfrage
+        in den Mapping-Cache, bevor ein Batch synchronisiert wird (statt einer
+        Abfrage pro object_type beim ersten Upsert).
+        """
+        await self._mapping_engine.get_effective_mappings(
+            tenant_id=_as_uuid(tenant_id),
+            crm_system=crm_system,
+            object_types=object_types,
         )
-        return result
 
     # -------------------------------------------------------------------------
     # Helpers: Credentials, Fehler, Link-Handling
@@ -452,16 +837,39 @@ class CRMSyncService:
         crm_system: CRMSystem,
         object_type: str,
         leadlane_id: Optional[str] = None,
+        context: Optional[SyncContext] = None,
     ) -> Optional[CRMSyncResult]:
         """
         Prüft, ob für den Tenant/CRM gültige Credentials vorhanden sind.
+        Mit context ohne eigene DB-Abfrage (nur aktive Verbindungen enthalten).
+
+        Ohne context: positiver Check aus dem connected_systems_cache (30 s
+        TTL, bei Änderungen invalidiert), damit nicht jedes Objekt die
+        Credentials erneut lädt. Nur im Fehlerfall wird die Verbindung
+        einzeln gelesen (missing_credentials vs. connection_disabled).
 
         Gibt:
         - None, wenn alles ok
         - CRMSyncResult mit Fehler, wenn nicht
         """
+        if context is None:
+            try:
+                if crm_system in await self._active_systems(tenant_id):
+                    return None
+            except Exception:  # noqa: BLE001 - Fallback: Einzelabfrage unten
+                logger.debug(
+                    "Loading active CRM systems failed: tenant_id=%s", tenant_id, exc_info=True
+                )
+
         try:
-            conn = await self._credentials_store.get_credentials(tenant_id, crm_system)
+            if context is not None:
+                conn = context.connections.get(crm_system)
+            else:
+                conn = await self._credentials_store.get_credentials(tenant_id, crm_system)
+            if conn is None:
+                raise CRMConnectionError(
+                    f"No CRM connection for tenant={tenant_id}, crm_system={crm_system.value}"
+                )
         except CRMConnectionError as exc:
             logger.warning(
                 "No CRM credentials for sync: tenant_id=%s, crm_system=%s, object_type=%s, leadlane_id=%s, error=%s",
@@ -498,6 +906,35 @@ class CRMSyncService:
 
         return None
 
+    async def _active_systems(self, tenant_id: TenantId) -> Tuple[CRMSystem, ...]:
+        """
+        Aktive CRM-Systeme des Tenants aus dem connected_systems_cache. Bei
+        einem Miss lädt genau ein load_sync_context pro Tenant, auch wenn
+        viele Syncs gleichzeitig fragen.
+        """
+        tenant_uuid = _as_uuid(tenant_id)
+        systems = connected_systems_cache.get(tenant_uuid)
+        if systems is not None:
+            return systems
+
+        load = _context_loads.get(tenant_uuid)
+        if load is None:
+            load = asyncio.ensure_future(self.load_sync_context(tenant_uuid))
+            _context_loads[tenant_uuid] = load
+            load.add_done_callback(lambda _f: _context_loads.pop(tenant_uuid, None))
+        # shield: ein abgebrochener Aufrufer bricht den Load der anderen nicht ab
+        context = await asyncio.shield(load)
+        return context.systems
+
+    def _create_client(self, tenant_id: TenantId, crm_system: CRMSystem) -> CRMClient:
+        # prozessweit gecacht pro (Tenant, System), siehe CRMClientCache
+        return get_crm_client(
+            crm_system=crm_system,
+            tenant_id=str(tenant_id),
+            credentials_store=self._credentials_store,
+            mapping_engine=self._mapping_engine,
+        )
+
     def _simple_error_result(
         self,
         crm_system: CRMSystem,
@@ -507,120 +944,60 @@ class CRMSyncService:
         message: str,
         details: Optional[dict] = None,
     ) -> CRMSyncResult:
-        return CRMSyncResult(
+        """
+        Fehler-Result ohne pydantic-Validierung (construct): alle Werte kommen
+        aus dem Service selbst. Fehler ohne details werden pro (code, message)
+        einmal gebaut und geteilt – Ergebnisse gelten als read-only.
+        """
+        if details:
+            error = CRMSyncError(code=code, message=message, details=details)
+        else:
+            error = _ERROR_TEMPLATES.get((code, message))
+            if error is None:
+                error = CRMSyncError(code=code, message=message, details={})
+                if len(_ERROR_TEMPLATES) < _ERROR_TEMPLATES_MAX:
+                    _ERROR_TEMPLATES[(code, message)] = error
+
+        return CRMSyncResult.construct(
             success=False,
             crm_system=crm_system,
             crm_object_type=object_type,
             crm_id=None,
             leadlane_id=leadlane_id,
-            errors=[
-                CRMSyncError(
-                    code=code,
-                    message=message,
-                    details=details or {},
-                )
-            ],
+            errors=[error],
             raw_response=None,
         )
 
-    async def _handle_link_update_for_company(
-        self,
-        tenant_id: TenantId,
-        crm_system: CRMSystem,
-        leadlane_company_id: str,
-        existing_link_id: Optional[int],
-        result: CRMSyncResult,
-    ) -> None:
-        if not result.success or not result.crm_id:
-            logger.debug(
-                "Skipping company link update – sync not successful or missing crm_id. tenant_id=%s, crm_system=%s, leadlane_company_id=%s",
-                tenant_id,
-                crm_system.value,
-                leadlane_company_id,
-            )
-            return
-
-        # Variante A: immer upsert_link – dein Repo kümmert sich um INSERT/UPDATE
-        tenant_uuid = _as_uuid(tenant_id)
-        await self._account_links_repo.upsert_link(
-            tenant_id=tenant_uuid,
-            crm_system=crm_system,
-            leadlane_sub_company_id=leadlane_company_id,
-            crm_account_id=result.crm_id,
-        )
-
-    async def _handle_link_update_for_contact(
-        self,
-        tenant_id: TenantId,
-        crm_system: CRMSystem,
-        leadlane_contact_id: str,
-        existing_link_id: Optional[int],
-        result: CRMSyncResult,
-    ) -> None:
-        if not result.success or not result.crm_id:
-            logger.debug(
-                "Skipping contact link update – sync not successful or missing crm_id. tenant_id=%s, crm_system=%s, leadlane_contact_id=%s",
-                tenant_id,
-                crm_system.value,
-                leadlane_contact_id,
-            )
-            return
-
-        tenant_uuid = _as_uuid(tenant_id)
-        await self._contact_links_repo.upsert_link(
-            tenant_id=tenant_uuid,
-            crm_system=crm_system,
-            leadlane_contact_id=leadlane_contact_id,
-            crm_contact_id=result.crm_id,
-        )
-
-    async def _handle_link_update_for_opportunity(
+    async def _handle_link_update(
         self,
+        spec: _SyncSpec,
+        *,
         tenant_id: TenantId,
         crm_system: CRMSystem,
-        leadlane_opportunity_id: str,
-        existing_link_id: Optional[int],
+        leadlane_id: str,
+        existing_crm_id: Optional[str],
         result: CRMSyncResult,
     ) -> None:
-        if not result.success or not result.crm_id:
+        links_repo = getattr(self, spec.links_repo_attr)
+        if not result.success or not result.crm_id or links_repo is None:
             logger.debug(
-                "Skipping opportunity link update – sync not successful or missing crm_id. tenant_id=%s, crm_system=%s, leadlane_opportunity_id=%s",
+                "Skipping %s link update – sync not successful, missing crm_id or no repo. tenant_id=%s, crm_system=%s, leadlane_id=%s",
+                spec.object_type,
                 tenant_id,
                 crm_system.value,
-                leadlane_opportunity_id,
+                leadlane_id,
             )
             return
 
-        tenant_uuid = _as_uuid(tenant_id)
-        await self._opportunity_links_repo.upsert_link(
-            tenant_id=tenant_uuid,
-            crm_system=crm_system,
-            # deine Tabelle nutzt leadlane_demo_id als Schlüssel
-            leadlane_demo_id=leadlane_opportunity_id,
-            crm_opportunity_id=result.crm_id,
-        )
-
-    async def _handle_link_update_for_activity(
-        self,
-        tenant_id: TenantId,
-        crm_system: CRMSystem,
-        leadlane_activity_id: str,
-        existing_link_id: Optional[int],
-        result: CRMSyncResult,
-    ) -> None:
-        if not result.success or not result.crm_id or not self._activity_links_repo:
-            logger.debug(
-                "Skipping activity link update – sync not successful, missing crm_id or no repo. tenant_id=%s, crm_system=%s, leadlane_activity_id=%s",
-                tenant_id,
-                crm_system.value,
-                leadlane_activity_id,
-            )
+        if result.crm_id == existing_crm_id:
+            # Link zeigt schon auf diese CRM-ID (Re-Sync) → kein Schreibzugriff
             return
 
-        tenant_uuid = _as_uuid(tenant_id)
-        await self._activity_links_repo.upsert_link(
-            tenant_id=tenant_uuid,
+        # Upsert ohne RETURNING (Ergebnis wird nicht gebraucht); das Repo
+        # kümmert sich um INSERT/UPDATE und überspringt unveränderte Links
+        upsert = getattr(links_repo, "upsert_link_fire_and_forget", links_repo.upsert_link)
+        await upsert(
+            tenant_id=_as_uuid(tenant_id),
             crm_system=crm_system,
-            leadlane_activity_id=leadlane_activity_id,
-            crm_activity_id=result.crm_id,
+            **{spec.link_leadlane_kw: leadlane_id, spec.link_crm_attr: result.crm_id},
         )
@@ -2,7 +2,12 @@
 from __future__ import annotations
 
 import logging
-from typing import Callable, Awaitable
+from dataclasses import fields, is_dataclass
+from decimal import Decimal
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Awaitable, Dict, Tuple
+from uuid import UUID
 
 from app.domain.events.company_events import CompanyUpdatedEvent
 from app.domain.repositories.company_repository import CompanyRepository
@@ -12,6 +17,79 @@ from app.integrations.sync.crm_sync_listener import CRMSyncListener
 logger = logging.getLogger(__name__)
 
 
+# Payload-Felder, die gleichnamig aus dem Domain-Modell übernommen werden
+# (responsible_sdr_id wird in handle noch zu str konvertiert)
+_COMPANY_FIELDS: Tuple[str, ...] = (
+    "central_sub_company_id",
+    "central_parent_company_id",
+    "tenant_parent_company_id",
+    "business_description",
+    "country_region",
+    "city",
+    "postal_code",
+    "address_line_1",
+    "url",
+    "website",
+    "linkedin_account",
+    "email_address",
+    "phone",
+    "phone_alt",
+    "employees_total",
+    "sales_eur",
+    "year_founded",
+    "primary_industry_code",
+    "primary_industry_system",
+    "duns_number",
+    "lifecycle_phase",
+    "loss_reason",
+    "account_summary_gpt",
+    "company_description_leadlane",
+    "name",
+    "responsible_sdr_id",
+)
+
+# Werte für Felder, die das Domain-Modell nicht hat (Rest: None)
+_COMPANY_DEFAULTS: Dict[str, Any] = {"name": "Unknown Company"}
+
+
+@lru_cache(maxsize=None)
+def _company_reader(company_cls: type) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Einmal pro Domain-Klasse: liest alle _COMPANY_FIELDS, die die Klasse hat,
+    mit einem attrgetter (Lookups laufen in C); fehlende Felder bekommen
+    _COMPANY_DEFAULTS bzw. None.
+    Keine Dataclass → getattr pro Feld wie bisher.
+    """
+    if not is_dataclass(company_cls):
+        return lambda company: {
+            f: getattr(company, f, _COMPANY_DEFAULTS.get(f)) for f in _COMPANY_FIELDS
+        }
+
+    names = {f.name for f in fields(company_cls)}
+    present = tuple(f for f in _COMPANY_FIELDS if f in names or hasattr(company_cls, f))
+    missing = {
+        f: _COMPANY_DEFAULTS.get(f) for f in _COMPANY_FIELDS if f not in present
+    }
+    if not present:
+        return lambda company: dict(missing)
+    if len(present) == 1:
+        single = attrgetter(present[0])
+        return lambda company: {present[0]: single(company), **missing}
+
+    get_all = attrgetter(*present)
+    return lambda company: {**missing, **dict(zip(present, get_all(company)))}
+
+
+def _payload_value(value: Any) -> Any:
+    # CRMCompanyPayload validiert nicht (keine Pydantic-Coercion mehr):
+    # Domain-Typen hier auf die Payload-Typen bringen (float / str).
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
 def make_company_updated_handler(
     crm_sync_listener: CRMSyncListener,
     company_repository: CompanyRepository,
@@ -45,37 +123,16 @@ def make_company_updated_handler(
             return
 
         # Minimales Mapping Company -> CRMCompanyPayload.
-        # Wir nutzen getattr, damit es nicht crasht, wenn einzelne Felder im Domain-Modell fehlen.
+        # Felder, die im Domain-Modell fehlen, bekommen Defaults (kein Crash).
+        values = {
+            key: _payload_value(value)
+            for key, value in _company_reader(type(company))(company).items()
+        }
+        sdr_id = values.pop("responsible_sdr_id")
         payload = CRMCompanyPayload(
+            **values,
             leadlane_sub_company_id=str(event.leadlane_sub_company_id),
-            central_sub_company_id=getattr(company, "central_sub_company_id", None),
-            central_parent_company_id=getattr(company, "central_parent_company_id", None),
-            tenant_parent_company_id=getattr(company, "tenant_parent_company_id", None),
-            name=getattr(company, "name", "Unknown Company"),
-            business_description=getattr(company, "business_description", None),
-            country_region=getattr(company, "country_region", None),
-            city=getattr(company, "city", None),
-            postal_code=getattr(company, "postal_code", None),
-            address_line_1=getattr(company, "address_line_1", None),
-            url=getattr(company, "url", None),
-            website=getattr(company, "website", None),
-            linkedin_account=getattr(company, "linkedin_account", None),
-            email_address=getattr(company, "email_address", None),
-            phone=getattr(company, "phone", None),
-            phone_alt=getattr(company, "phone_alt", None),
-            employees_total=getattr(company, "employees_total", None),
-            sales_eur=getattr(company, "sales_eur", None),
-            year_founded=getattr(company, "year_founded", None),
-            primary_industry_code=getattr(company, "primary_industry_code", None),
-            primary_industry_system=getattr(company, "primary_industry_system", None),
-            duns_number=getattr(company, "duns_number", None),
-            lifecycle_phase=getattr(company, "lifecycle_phase", None),
-            loss_reason=getattr(company, "loss_reason", None),
-            responsible_sdr_id=getattr(company, "responsible_sdr_id", None),
-            account_summary_gpt=getattr(company, "account_summary_gpt", None),
-            company_description_leadlane=getattr(
-                company, "company_description_leadlane", None
-            ),
+            responsible_sdr_id=str(sdr_id) if sdr_id else None,
             properties={},  # falls du später Custom-Properties aus der DB laden willst
         )
 
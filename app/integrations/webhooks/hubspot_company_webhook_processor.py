@@ -1,20 +1,80 @@
 # app/integrations/webhooks/hubspot_company_webhook_processor.py
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, Dict, Iterable, Mapping
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 from uuid import UUID
 
 from fastapi import HTTPException, status
 
+from app.config import settings
 from app.domain.models.company import Company
 from app.domain.repositories.company_repository import CompanyRepository
+from app.domain.services.list_cache import tenant_list_cache
 from app.integrations.crm.crm_types import CRMSystem
 from app.integrations.mapping import CRMAccountLinksRepository, CRMFieldMappingEngine
 from app.integrations.webhooks.webhook_idempotency_repository import (
     WebhookIdempotencyRepository,
 )
 
+logger = logging.getLogger(__name__)
+
+
+# occurredAt (ms since epoch) → naive UTC-datetime, wie bisher
+# utcfromtimestamp, aber ohne die localtime-Maschinerie (und nicht deprecated)
+_EPOCH = datetime(1970, 1, 1)
+
+
+
+def _parse_occurred_at(raw: Any) -> Optional[datetime]:
+    """
+    occurredAt → naive UTC-datetime (wie last_event_at / last_modified_time,
+    sonst scheitert der Out-of-order-Vergleich an naive vs. aware).
+    """
+    if not raw:
+        return None
+    # HubSpot schickt i.d.R. ms since epoch
+    if isinstance(raw, (int, float)):
+        return _EPOCH + timedelta(milliseconds=raw)
+    # Fallback: ISO8601-String etc. – bei Bedarf anpassen
+    parsed = datetime.fromisoformat(str(raw))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+# Mögliche Keys je Feld, in dieser Reihenfolge (erster nicht-leerer gewinnt)
+_EVENT_ID_KEYS = ("eventId", "event_id", "id")
+_OBJECT_ID_KEYS = ("objectId", "object_id", "companyId")
+
+
+def _first_id(ev: Mapping[str, Any], keys: Tuple[str, ...]) -> str:
+    """
+    Erster nicht-leere Wert unter keys als getrimmter String ("" wenn keiner);
+    str() nur für Nicht-Strings (HubSpot schickt IDs teils als int).
+    """
+    for key in keys:
+        value = ev.get(key)
+        if value:
+            return value.strip() if isinstance(value, str) else str(value).strip()
+    return ""
+
+
+# (event_id, occurred_at, Roh-Event)
+_ParsedEvent = Tuple[str, Optional[datetime], Mapping[str, Any]]
+
+
+def _parse_event(ev: Mapping[str, Any]) -> Optional[_ParsedEvent]:
+    """
+    (event_id, occurred_at, ev); None ohne Event-ID.
+    """
+    event_id = _first_id(ev, _EVENT_ID_KEYS)
+    if not event_id:
+        return None
+    return event_id, _parse_occurred_at(ev.get("occurredAt") or ev.get("occurred_at")), ev
+
 
 class HubSpotCompanyWebhookProcessor:
     """
@@ -49,112 +109,248 @@ class HubSpotCompanyWebhookProcessor:
         - ev["objectId"] / "object_id"]: HubSpot Company ID
         - ev["properties"]: Dict[str, Any] der Felder
         (Passe das bei Bedarf an eure echte HubSpot-Payload an.)
+
+        = receive_events + process_events; mit Webhook-Queue laufen die
+        beiden Schritte getrennt (Annahme im Request, Rest im Worker).
         """
+        await self.process_events(await self.receive_events(events))
 
+    async def receive_events(
+        self,
+        events: Iterable[Mapping[str, Any]],
+    ) -> List[_ParsedEvent]:
+        """
+        Parst die Events und trägt sie (idempotent) als 'received' ein.
+        Rückgabe: nur die neuen Events, jede Event-ID einmal.
+        Fehlt eine Event-ID → HTTPException(400), bevor etwas geschrieben wird.
+        """
+        # 1) Alle Events parsen, bevor irgendetwas geschrieben wird
+        parsed: List[_ParsedEvent] = []
         for ev in events:
-            event_id = str(
-                ev.get("eventId")
-                or ev.get("event_id")
-                or ev.get("id")
-                or ""
-            ).strip()
-            if not event_id:
+            item = _parse_event(ev)
+            if item is None:
                 # Ohne Event-ID können wir keine Idempotenz machen → lieber 400
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Missing event_id in HubSpot webhook payload",
                 )
+            parsed.append(item)
 
-            occurred_raw = ev.get("occurredAt") or ev.get("occurred_at")
-            if occurred_raw:
-                # HubSpot schickt i.d.R. ms since epoch
-                if isinstance(occurred_raw, (int, float)):
-                    occurred_at = datetime.utcfromtimestamp(occurred_raw / 1000.0)
-                else:
-                    # Fallback: ISO8601-String etc. – bei Bedarf anpassen
-                    occurred_at = datetime.fromisoformat(str(occurred_raw))
-            else:
-                occurred_at = None
-
-            # Idempotenz: ist das Event neu?
-            is_new = await self.idempotency_repo.try_mark_received(
-                crm_system=CRMSystem.HUBSPOT.value,
-                event_id=event_id,
-                occurred_at=occurred_at,
-            )
-            if not is_new:
-                # Duplikat → einfach überspringen
-                continue
+        if not parsed:
+            return []
+
+        # 2) Idempotenz für alle Events in einem Round-Trip; mit Inbox wird das
+        # Roh-Event mitgespeichert (Replay, falls die Verarbeitung verloren geht)
+        inbox = settings.webhook_event_inbox_enabled
+        new_event_ids = await self.idempotency_repo.try_mark_received_many(
+            crm_system=CRMSystem.HUBSPOT.value,
+            rows=[(event_id, occurred_at) for event_id, occurred_at, _ in parsed],
+            tenant_id=self.tenant_id if inbox else None,
+            payloads={event_id: ev for event_id, _, ev in parsed} if inbox else None,
+        )
+
+        received: List[_ParsedEvent] = []
+        for item in parsed:
+            # Duplikate (auch innerhalb desselben Requests) überspringen;
+            # nur das erste Vorkommen einer Event-ID verarbeiten
+            if item[0] in new_event_ids:
+                new_event_ids.discard(item[0])
+                received.append(item)
+        return received
 
-            hubspot_company_id = str(
-                ev.get("objectId")
-                or ev.get("object_id")
-                or ev.get("companyId")
-                or ""
-            ).strip()
+    async def replay_events(self, events: Iterable[Mapping[str, Any]]) -> None:
+        """
+        Verarbeitet bereits als 'received' eingetragene Events erneut
+        (WebhookReplayer) – ohne Idempotenz-Eintrag, direkt process_events.
+        """
+        parsed = [item for item in map(_parse_event, events) if item is not None]
+        await self.process_events(parsed)
+
+    async def process_events(self, received: List[_ParsedEvent]) -> None:
+        """
+        Verarbeitet die von receive_events gelieferten Events und schreibt
+        ihren Status.
+        """
+        if not received:
+            return
+
+        # 3) HubSpot Company ID bestimmen; Status (event_id, status, last_error)
+        # sammeln und am Ende mit einem UPDATE schreiben – auch wenn ein
+        # Event scheitert
+        status_updates: List[Tuple[str, str, Optional[str]]] = []
+        pending: List[Tuple[str, Optional[datetime], Mapping[str, Any], str]] = []
+        for event_id, occurred_at, ev in received:
+            hubspot_company_id = _first_id(ev, _OBJECT_ID_KEYS)
             if not hubspot_company_id:
-                await self.idempotency_repo.mark_processed(
-                    crm_system=CRMSystem.HUBSPOT.value,
-                    event_id=event_id,
-                    status="skipped_no_object_id",
-                )
+                status_updates.append((event_id, "skipped_no_object_id", None))
                 continue
+            pending.append((event_id, occurred_at, ev, hubspot_company_id))
 
-            # Link HubSpot Company ID → LeadLane SubCompany ID
-            link = await self.account_links_repo.get_by_crm_id(
+        try:
+            # 4) Links und Companies aller Events mit je einer Abfrage laden
+            # (HubSpot Company ID → LeadLane SubCompany ID → Company)
+            links = await self.account_links_repo.get_many_by_crm_ids(
                 tenant_id=self.tenant_id,
                 crm_system=CRMSystem.HUBSPOT,
-                crm_account_id=hubspot_company_id,
+                crm_account_ids=[item[3] for item in pending],
             )
-            if not link:
-                # Company ist uns (noch) nicht bekannt → optional später "on the fly" anlegen
-                await self.idempotency_repo.mark_processed(
-                    crm_system=CRMSystem.HUBSPOT.value,
-                    event_id=event_id,
-                    status="skipped_no_link",
-                )
-                continue
 
-            # Company aus der DB laden
-            company = await self.company_repo.get_by_id(
+            fresh: List[Tuple[str, Optional[datetime], Mapping[str, Any], UUID]] = []
+            crm_ids: Dict[UUID, str] = {}
+            for event_id, occurred_at, ev, hubspot_company_id in pending:
+                link = links.get(hubspot_company_id)
+                if not link:
+                    # Company ist uns (noch) nicht bekannt → optional später "on the fly" anlegen
+                    status_updates.append((event_id, "skipped_no_link", None))
+                    continue
+
+                # Out-of-order schon am Link erkennen (last_event_at = occurredAt
+                # des zuletzt verarbeiteten Events) → Company muss nicht geladen werden
+                if occurred_at and link.last_event_at and occurred_at <= link.last_event_at:
+                    status_updates.append((event_id, "skipped_out_of_order", None))
+                    continue
+                company_id = link.leadlane_sub_company_uuid
+                crm_ids[company_id] = link.crm_account_id
+                fresh.append((event_id, occurred_at, ev, company_id))
+
+            companies = await self.company_repo.get_many_by_ids(
                 tenant_id=self.tenant_id,
-                leadlane_sub_company_id=UUID(link.leadlane_sub_company_id),
-            )
-            if not company:
-                await self.idempotency_repo.mark_processed(
-                    crm_system=CRMSystem.HUBSPOT.value,
-                    event_id=event_id,
-                    status="skipped_no_company",
+                leadlane_sub_company_ids=[item[3] for item in fresh],
+            ) if fresh else {}
+
+            # Events pro Company gruppieren (Reihenfolge bleibt erhalten)
+            groups: Dict[UUID, List[_ParsedEvent]] = {}
+            for event_id, occurred_at, ev, company_id in fresh:
+                if company_id not in companies:
+                    status_updates.append((event_id, "skipped_no_company", None))
+                    continue
+                groups.setdefault(company_id, []).append((event_id, occurred_at, ev))
+
+            # 5) Mapping: Companies parallel (begrenzt), Events einer Company
+            # nacheinander – jedes Event patcht den vorherigen Stand
+            # company_id -> (Endstand, gemappte Events als (event_id, occurred_at))
+            mapped: Dict[UUID, Tuple[Company, List[Tuple[str, Optional[datetime]]]]] = {}
+            if groups:
+                semaphore = asyncio.Semaphore(
+                    max(1, min(len(groups), settings.webhook_concurrency))
                 )
-                continue
 
-            # Out-of-order: Ist das Event älter als der bekannte Stand?
-            if occurred_at and occurred_at <= company.last_modified_time:
-                await self.idempotency_repo.mark_processed(
-                    crm_system=CRMSystem.HUBSPOT.value,
-                    event_id=event_id,
-                    status="skipped_out_of_order",
+                async def _map_company(
+                    company_id: UUID, company: Company, group: List[_ParsedEvent]
+                ) -> None:
+                    applied: List[Tuple[str, Optional[datetime]]] = []
+                    async with semaphore:
+                        for event_id, occurred_at, ev in group:
+                            try:
+                                updated_company = await self._map_event(company, occurred_at, ev)
+                            except Exception as exc:  # noqa: BLE001 - ein Event darf den Batch nicht abbrechen
+                                logger.exception(
+                                    "HubSpot company webhook event failed: tenant_id=%s, event_id=%s",
+                                    self.tenant_id,
+                                    event_id,
+                                )
+                                status_updates.append(
+                                    (event_id, "failed", str(exc) or exc.__class__.__name__)
+                                )
+                                continue
+                            if updated_company is None:
+                                status_updates.append((event_id, "skipped_out_of_order", None))
+                                continue
+                            company = updated_company
+                            applied.append((event_id, occurred_at))
+                    if applied:
+                        mapped[company_id] = (company, applied)
+
+                await asyncio.gather(
+                    *(
+                        _map_company(company_id, companies[company_id], group)
+                        for company_id, group in groups.items()
+                    )
                 )
-                continue
 
-            properties: Dict[str, Any] = ev.get("properties") or {}
+            # 6) Alle geänderten Companies in einer Transaktion speichern – ein
+            # Commit statt einem pro Event, pro Company nur der Endstand
+            if mapped:
+                await self._save_mapped(mapped, crm_ids, status_updates)
+        finally:
+            await self.idempotency_repo.mark_processed_many(
+                crm_system=CRMSystem.HUBSPOT.value,
+                rows=status_updates,
+            )
 
-            # CRM → UDM mappen (Patch)
-            updated_company: Company = await self.mapping_engine.map_crm_to_udm(
-                tenant_id=self.tenant_id,
-                crm_system=CRMSystem.HUBSPOT,
-                object_type="company",
-                crm_properties=properties,
-                udm_cls=Company,
-                existing=company,
+    async def _map_event(
+        self,
+        company: Company,
+        occurred_at: Optional[datetime],
+        ev: Mapping[str, Any],
+    ) -> Optional[Company]:
+        """
+        Mappt ein Event auf die Company (ohne Speichern).
+        None, wenn das Event älter als der bekannte Stand ist (out-of-order).
+        """
+        # Out-of-order: Ist das Event älter als der bekannte Stand?
+        if occurred_at and occurred_at <= company.last_modified_time:
+            return None
+
+        properties: Dict[str, Any] = ev.get("properties") or {}
+
+        # CRM → UDM mappen (Patch)
+        return await self.mapping_engine.map_crm_to_udm(
+            tenant_id=self.tenant_id,
+            crm_system=CRMSystem.HUBSPOT,
+            object_type="company",
+            crm_properties=properties,
+            udm_cls=Company,
+            existing=company,
+        )
+
+    async def _save_mapped(
+        self,
+        mapped: Dict[UUID, Tuple[Company, List[Tuple[str, Optional[datetime]]]]],
+        crm_ids: Dict[UUID, str],
+        status_updates: List[Tuple[str, str, Optional[str]]],
+    ) -> None:
+        """
+        Speichert die Endstände aller Companies (save_many, eine Transaktion)
+        und trägt die Status der zugehörigen Events ein. Schlägt das Speichern
+        fehl, gilt das für alle Events des Batches ('failed').
+        """
+        try:
+            await self.company_repo.save_many([company for company, _ in mapped.values()])
+        except Exception as exc:  # noqa: BLE001 - Status statt 500, siehe finally in process_events
+            logger.exception(
+                "Saving HubSpot webhook companies failed: tenant_id=%s, count=%s",
+                self.tenant_id,
+                len(mapped),
             )
+            error = str(exc) or exc.__class__.__name__
+            status_updates.extend(
+                (event_id, "failed", error)
+                for _, applied in mapped.values()
+                for event_id, _ in applied
+            )
+            return
 
-            # In DB speichern
-            await self.company_repo.save(updated_company)
+        # gecachte Company-Liste des Tenants ist jetzt veraltet
+        tenant_list_cache.invalidate(self.tenant_id, "company")
 
-            # Status auf processed setzen
-            await self.idempotency_repo.mark_processed(
-                crm_system=CRMSystem.HUBSPOT.value,
-                event_id=event_id,
-                status="processed",
+        # (HubSpot Company ID, occurredAt) verarbeiteter Events → last_event_at
+        processed_events: List[Tuple[str, datetime]] = []
+        for company_id, (_, applied) in mapped.items():
+            for event_id, occurred_at in applied:
+                status_updates.append((event_id, "processed", None))
+                if occurred_at:
+                    processed_events.append((crm_ids[company_id], occurred_at))
+
+        try:
+            await self.account_links_repo.update_last_event_at_many(
+                tenant_id=self.tenant_id,
+                crm_system=CRMSystem.HUBSPOT,
+                rows=processed_events,
+            )
+        except Exception:  # noqa: BLE001 - nur Optimierung, Company-Check bleibt
+            logger.warning(
+                "Could not update last_event_at on account links: tenant_id=%s",
+                self.tenant_id,
+                exc_info=True,
             )
@@ -1,10 +1,152 @@
 # app/integrations/webhooks/webhook_idempotency_repository.py
 from __future__ import annotations
 
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+from uuid import UUID
 
 from app.db.database import Database
+from app.integrations.crm.json_codec import dumps, loads
+
+# SQL als Modul-Konstanten: stabiler Key für den Query-Compile-Cache in
+# Database und den Statement-Cache von asyncpg
+_SQL_MARK_RECEIVED = """
+    INSERT INTO public.crm_webhook_events (
+        crm_system, event_id, occurred_at
+    )
+    VALUES (:crm_system, :event_id, :occurred_at)
+    ON CONFLICT (crm_system, event_id) DO NOTHING
+    RETURNING crm_system, event_id;
+"""
+
+_SQL_MARK_PROCESSED = """
+    UPDATE public.crm_webhook_events
+    SET processed_at = now(),
+        status = :status,
+        last_error = :last_error
+    WHERE crm_system = :crm_system
+      AND event_id = :event_id;
+"""
+
+# Mehrere Events mit einem INSERT (Arrays statt N Round-Trips); CAST statt
+# ::-Syntax, da :name als Parameter interpretiert wird.
+_SQL_MARK_RECEIVED_MANY = """
+    INSERT INTO public.crm_webhook_events (
+        crm_system, event_id, occurred_at
+    )
+    SELECT :crm_system, e.event_id, e.occurred_at
+    FROM unnest(
+        CAST(:event_ids AS text[]),
+        CAST(:occurred_ats AS timestamptz[])
+    ) AS e(event_id, occurred_at)
+    ON CONFLICT (crm_system, event_id) DO NOTHING
+    RETURNING event_id;
+"""
+
+# Wie _SQL_MARK_RECEIVED_MANY, zusätzlich tenant_id + Roh-Event (payload),
+# damit liegengebliebene Events ohne HubSpot-Retry nachverarbeitet werden
+# können (claim_stale_received). Nur mit webhook_event_inbox_enabled –
+# braucht die Spalten aus ideas.txt.
+_SQL_MARK_RECEIVED_MANY_WITH_PAYLOAD = """
+    INSERT INTO public.crm_webhook_events (
+        crm_system, event_id, occurred_at, tenant_id, payload
+    )
+    SELECT :crm_system, e.event_id, e.occurred_at,
+           CAST(:tenant_id AS uuid), CAST(e.payload AS jsonb)
+    FROM unnest(
+        CAST(:event_ids AS text[]),
+        CAST(:occurred_ats AS timestamptz[]),
+        CAST(:payloads AS text[])
+    ) AS e(event_id, occurred_at, payload)
+    ON CONFLICT (crm_system, event_id) DO NOTHING
+    RETURNING event_id;
+"""
+
+# Events, die seit stale_after_seconds auf 'received' stehen (Job verloren:
+# Crash, Drain-Timeout der Webhook-Queue), für einen neuen Versuch
+# beanspruchen. claimed_at verschiebt den nächsten Versuch; SKIP LOCKED,
+# damit parallele Worker nicht dieselben Zeilen ziehen.
+_SQL_CLAIM_STALE_RECEIVED = """
+    UPDATE public.crm_webhook_events AS e
+    SET claimed_at = now()
+    FROM (
+        SELECT crm_system, event_id
+        FROM public.crm_webhook_events
+        WHERE crm_system = :crm_system
+          AND status = 'received'
+          AND payload IS NOT NULL
+          AND tenant_id IS NOT NULL
+          AND COALESCE(claimed_at, created_at)
+              < now() - make_interval(secs => CAST(:stale_after_seconds AS double precision))
+        ORDER BY created_at
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    ) AS stale
+    WHERE e.crm_system = stale.crm_system
+      AND e.event_id = stale.event_id
+    RETURNING e.tenant_id, e.event_id, e.payload;
+"""
+
+_SQL_MARK_PROCESSED_MANY = """
+    UPDATE public.crm_webhook_events
+    SET processed_at = now(),
+        status = u.status,
+        last_error = u.last_error
+    FROM unnest(
+        CAST(:event_ids AS text[]),
+        CAST(:statuses AS text[]),
+        CAST(:last_errors AS text[])
+    ) AS u(event_id, status, last_error)
+    WHERE crm_webhook_events.crm_system = :crm_system
+      AND crm_webhook_events.event_id = u.event_id;
+"""
+
+
+class SeenWebhookEventsCache:
+    """
+    In-Process-Vorfilter für bereits bekannte Webhook-Events.
+
+    HubSpot-Retries schicken dieselben event_ids mehrfach; ein Treffer hier
+    spart den INSERT-Round-Trip nach crm_webhook_events. Eingetragen wird
+    erst, nachdem die DB das Event gesehen hat (neu oder Duplikat) – ein
+    fehlgeschlagener INSERT landet also nie im Cache. Die Tabelle bleibt
+    die Quelle der Wahrheit, ein Cache-Miss heißt nur "DB fragen".
+
+    Der Cache ist pro Prozess; mehrere Worker halten jeweils ihren eigenen.
+    """
+
+    def __init__(self, ttl_seconds: float = 86_400.0, max_entries: int = 100_000) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        # (crm_system, event_id) -> expires_at
+        self._entries: Dict[Tuple[str, str], float] = {}
+
+    def seen(self, crm_system: str, event_id: str) -> bool:
+        key = (crm_system, event_id)
+        expires_at = self._entries.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False
+        return True
+
+    def add_many(self, crm_system: str, event_ids: Iterable[str]) -> None:
+        expires_at = time.monotonic() + self._ttl
+        for event_id in event_ids:
+            key = (crm_system, event_id)
+            if key not in self._entries and len(self._entries) >= self._max_entries:
+                # Grob begrenzen: ältesten Eintrag (Einfügereihenfolge) verwerfen.
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = expires_at
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Globale Instanz, Repositories werden pro Request gebaut
+seen_webhook_events_cache = SeenWebhookEventsCache()
 
 
 class WebhookIdempotencyRepository:
@@ -13,8 +155,14 @@ class WebhookIdempotencyRepository:
     den Verarbeitungsstatus zu tracken.
     """
 
-    def __init__(self, db: Database) -> None:
+    def __init__(
+        self,
+        db: Database,
+        *,
+        seen_cache: Optional[SeenWebhookEventsCache] = None,
+    ) -> None:
         self._db = db
+        self._seen = seen_cache if seen_cache is not None else seen_webhook_events_cache
 
     async def try_mark_received(
         self,
@@ -30,24 +178,94 @@ class WebhookIdempotencyRepository:
         - True: Event war neu (wurde eingefügt)
         - False: Event existiert bereits (Duplikat)
         """
-        query = """
-        INSERT INTO public.crm_webhook_events (
-            crm_system, event_id, occurred_at
-        )
-        VALUES (:crm_system, :event_id, :occurred_at)
-        ON CONFLICT (crm_system, event_id) DO NOTHING
-        RETURNING crm_system, event_id;
-        """
+        if self._seen.seen(crm_system, event_id):
+            return False
+
         row = await self._db.fetch_one(
-            query,
+            _SQL_MARK_RECEIVED,
             {
                 "crm_system": crm_system,
                 "event_id": event_id,
                 "occurred_at": occurred_at,
             },
         )
+        self._seen.add_many(crm_system, (event_id,))
         return row is not None
 
+    async def try_mark_received_many(
+        self,
+        *,
+        crm_system: str,
+        rows: Sequence[Tuple[str, Optional[datetime]]],
+        tenant_id: Optional[UUID] = None,
+        payloads: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    ) -> Set[str]:
+        """
+        Batch-Variante von try_mark_received: rows = [(event_id, occurred_at), ...].
+        Ein Round-Trip für alle Events; mehrfach vorkommende event_ids zählen
+        einmal (erstes occurred_at gewinnt).
+
+        payloads (event_id → Roh-Event) + tenant_id werden mitgespeichert,
+        wenn payloads übergeben wird (Spalten aus ideas.txt nötig); nur solche
+        Events kann claim_stale_received erneut ausliefern.
+
+        Rückgabe: die event_ids, die neu eingetragen wurden – alle anderen
+        sind Duplikate. Im Seen-Cache bekannte Events gehen nicht mehr an die DB.
+        """
+        unique: Dict[str, Optional[datetime]] = {}
+        for event_id, occurred_at in rows:
+            if not self._seen.seen(crm_system, event_id):
+                unique.setdefault(event_id, occurred_at)
+        if not unique:
+            return set()
+
+        params: Dict[str, Any] = {
+            "crm_system": crm_system,
+            "event_ids": list(unique),
+            "occurred_ats": list(unique.values()),
+        }
+        sql = _SQL_MARK_RECEIVED_MANY
+        if payloads is not None:
+            sql = _SQL_MARK_RECEIVED_MANY_WITH_PAYLOAD
+            params["tenant_id"] = tenant_id
+            params["payloads"] = [
+                dumps(payloads[event_id]).decode("utf-8") if event_id in payloads else None
+                for event_id in unique
+            ]
+        result = await self._db.fetch_all(sql, params)
+        self._seen.add_many(crm_system, unique)
+        return {row["event_id"] for row in result}
+
+    async def claim_stale_received(
+        self,
+        *,
+        crm_system: str,
+        stale_after_seconds: float,
+        limit: int = 500,
+    ) -> List[Tuple[UUID, Mapping[str, Any]]]:
+        """
+        Beansprucht Events, die seit stale_after_seconds nicht über
+        'received' hinausgekommen sind, und liefert (tenant_id, Roh-Event).
+        Ein erneut beanspruchtes Event kommt frühestens nach weiteren
+        stale_after_seconds wieder (claimed_at).
+        """
+        rows = await self._db.fetch_all(
+            _SQL_CLAIM_STALE_RECEIVED,
+            {
+                "crm_system": crm_system,
+                "stale_after_seconds": float(stale_after_seconds),
+                "limit": limit,
+            },
+        )
+        claimed: List[Tuple[UUID, Mapping[str, Any]]] = []
+        for row in rows:
+            payload = row["payload"]
+            # jsonb kommt von asyncpg ohne eigenen Codec als str
+            if isinstance(payload, (str, bytes)):
+                payload = loads(payload)
+            claimed.append((row["tenant_id"], payload))
+        return claimed
+
     async def mark_processed(
         self,
         *,
@@ -56,16 +274,8 @@ class WebhookIdempotencyRepository:
         status: str = "processed",
         last_error: Optional[str] = None,
     ) -> None:
-        query = """
-        UPDATE public.crm_webhook_events
-        SET processed_at = now(),
-            status = :status,
-            last_error = :last_error
-        WHERE crm_system = :crm_system
-          AND event_id = :event_id;
-        """
         await self._db.execute(
-            query,
+            _SQL_MARK_PROCESSED,
             {
                 "crm_system": crm_system,
                 "event_id": event_id,
@@ -73,3 +283,29 @@ class WebhookIdempotencyRepository:
                 "last_error": last_error,
             },
         )
+
+    async def mark_processed_many(
+        self,
+        *,
+        crm_system: str,
+        rows: Sequence[Tuple[str, str, Optional[str]]],
+    ) -> None:
+        """
+        Batch-Variante von mark_processed: rows = [(event_id, status, last_error), ...]
+        in einem UPDATE. Bei mehrfacher event_id gilt der letzte Eintrag.
+        """
+        unique: Dict[str, Tuple[str, Optional[str]]] = {
+            event_id: (status, last_error) for event_id, status, last_error in rows
+        }
+        if not unique:
+            return
+
+        await self._db.execute(
+            _SQL_MARK_PROCESSED_MANY,
+            {
+                "crm_system": crm_system,
+                "event_ids": list(unique),
+                "statuses": [status for status, _ in unique.values()],
+                "last_errors": [last_error for _, last_error in unique.values()],
+            },
+        )
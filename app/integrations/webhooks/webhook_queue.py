@@ -0,0 +1,107 @@
+# app/integrations/webhooks/webhook_queue.py
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+WebhookJob = Callable[[], Awaitable[None]]
+
+
+class WebhookQueue:
+    """
+    Begrenzte In-Process-Queue für die Webhook-Verarbeitung.
+
+    Der Webhook-Endpunkt prüft Signatur + Idempotenz (Events stehen danach
+    als 'received' in crm_webhook_events), legt die eigentliche Verarbeitung
+    als Job hier ab und antwortet sofort – HubSpot wartet also nicht auf
+    Mapping/Save und schickt keine Retries wegen langsamer Antworten.
+
+    - N Worker-Tasks arbeiten die Jobs ab (start/stop im App-Lifespan).
+    - submit() gibt False zurück, wenn die Queue nicht läuft oder voll ist;
+      der Aufrufer verarbeitet dann selbst (inline wie bisher).
+    - stop() wartet bis drain_timeout auf wartende Jobs, danach werden die
+      Worker abgebrochen. Nicht verarbeitete Events bleiben mit Status
+      'received' in crm_webhook_events stehen und werden – mit
+      webhook_event_inbox_enabled – vom WebhookReplayer (webhook_replay.py)
+      nachverarbeitet.
+    """
+
+    def __init__(self, *, queue_maxsize: int = 1000, drain_timeout: float = 10.0) -> None:
+        self._queue_maxsize = queue_maxsize
+        self._drain_timeout = drain_timeout
+        self._queue: Optional[asyncio.Queue[WebhookJob]] = None
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return self._queue is not None
+
+    async def start(self, workers: int) -> None:
+        if self._queue is not None:
+            return
+
+        queue: asyncio.Queue[WebhookJob] = asyncio.Queue(maxsize=self._queue_maxsize)
+        self._queue = queue
+        self._workers = [
+            asyncio.create_task(self._work(queue), name=f"webhook-worker-{i}")
+            for i in range(max(1, workers))
+        ]
+        logger.info(
+            "Webhook-Queue gestartet (workers=%s, queue_maxsize=%s)",
+            len(self._workers),
+            self._queue_maxsize,
+        )
+
+    async def stop(self) -> None:
+        queue, workers = self._queue, self._workers
+        if queue is None:
+            return
+
+        # keine neuen Jobs mehr annehmen
+        self._queue = None
+        self._workers = []
+
+        try:
+            await asyncio.wait_for(queue.join(), self._drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Webhook-Queue: %s Jobs nach %ss nicht abgearbeitet",
+                queue.qsize(),
+                self._drain_timeout,
+            )
+
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        logger.info("Webhook-Queue gestoppt.")
+
+    def submit(self, job: WebhookJob) -> bool:
+        if self._queue is None:
+            return False
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            logger.warning(
+                "Webhook-Queue voll (maxsize=%s) – Verarbeitung inline",
+                self._queue_maxsize,
+            )
+            return False
+        return True
+
+    @staticmethod
+    async def _work(queue: "asyncio.Queue[WebhookJob]") -> None:
+        while True:
+            job = await queue.get()
+            try:
+                await job()
+            except Exception:  # noqa: BLE001 - ein Job darf den Worker nicht beenden
+                logger.exception("Webhook-Job fehlgeschlagen")
+            finally:
+                queue.task_done()
+
+
+# Globale Instanz, Start/Stop im App-Lifespan (app/main.py)
+webhook_queue = WebhookQueue()
@@ -0,0 +1,128 @@
+# app/integrations/webhooks/webhook_replay.py
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Mapping, Optional
+from uuid import UUID
+
+from app.config import settings
+from app.db.database import Database
+from app.domain.repositories.company_repository import CompanyRepository
+from app.integrations.crm.crm_types import CRMSystem
+from app.integrations.mapping import (
+    CRMAccountLinksRepository,
+    CRMFieldMappingEngine,
+    CRMFieldMappingsRepository,
+)
+from app.integrations.webhooks.hubspot_company_webhook_processor import (
+    HubSpotCompanyWebhookProcessor,
+)
+from app.integrations.webhooks.webhook_idempotency_repository import (
+    WebhookIdempotencyRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookReplayer:
+    """
+    Verarbeitet Webhook-Events nach, die nach der Annahme liegen geblieben
+    sind (Status 'received' älter als stale_after_seconds).
+
+    Die Idempotenz-Zeile entsteht vor der Verarbeitung; geht der Job danach
+    verloren (Crash, Drain-Timeout der Webhook-Queue), würden HubSpot-Retries
+    als Duplikat verworfen – und mit Webhook-Queue kommt nach der sofortigen
+    200-Antwort gar kein Retry. Die Events stehen deshalb samt Roh-Event in
+    crm_webhook_events und werden hier periodisch erneut beansprucht
+    (claim_stale_received, SKIP LOCKED → mehrere Worker teilen sich die Arbeit).
+
+    Ein doppelt verarbeitetes Event (Job lief doch noch) ist unkritisch:
+    last_event_at am Link bzw. last_modified_time der Company verwerfen es
+    als out-of-order.
+
+    Läuft nur mit webhook_event_inbox_enabled (Start in app/main.py) – ohne
+    die Inbox-Spalten gibt es weder Roh-Events noch claimed_at.
+    """
+
+    def __init__(
+        self,
+        *,
+        stale_after_seconds: float = 300.0,
+        interval_seconds: float = 60.0,
+        batch_size: int = 500,
+    ) -> None:
+        self._stale_after = stale_after_seconds
+        self._interval = interval_seconds
+        self._batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, db: Database) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run(db), name="webhook-replay")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def replay_once(self, db: Database) -> int:
+        """
+        Ein Durchlauf: beanspruchte Events pro Tenant verarbeiten.
+        Rückgabe: Anzahl der erneut verarbeiteten Events.
+        """
+        idempotency_repo = WebhookIdempotencyRepository(db)
+        claimed = await idempotency_repo.claim_stale_received(
+            crm_system=CRMSystem.HUBSPOT.value,
+            stale_after_seconds=self._stale_after,
+            limit=self._batch_size,
+        )
+        if not claimed:
+            return 0
+
+        by_tenant: Dict[UUID, List[Mapping[str, Any]]] = {}
+        for tenant_id, event in claimed:
+            by_tenant.setdefault(tenant_id, []).append(event)
+
+        for tenant_id, events in by_tenant.items():
+            processor = HubSpotCompanyWebhookProcessor(
+                tenant_id=tenant_id,
+                company_repo=CompanyRepository(db),
+                account_links_repo=CRMAccountLinksRepository(db),
+                mapping_engine=CRMFieldMappingEngine(CRMFieldMappingsRepository(db)),
+                idempotency_repo=idempotency_repo,
+            )
+            await processor.replay_events(events)
+
+        logger.warning(
+            "Webhook-Replay: %s liegengebliebene Events erneut verarbeitet (%s Tenants)",
+            len(claimed),
+            len(by_tenant),
+        )
+        return len(claimed)
+
+    # ------------------------------------------------------------------
+    # Intern
+    # ------------------------------------------------------------------
+
+    async def _run(self, db: Database) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                # volle Batches direkt nacheinander abarbeiten
+                while await self.replay_once(db) >= self._batch_size:
+                    pass
+            except Exception:  # noqa: BLE001 - nächster Durchlauf versucht es erneut
+                logger.exception("Webhook-Replay fehlgeschlagen")
+
+
+# Globale Instanz, Start/Stop im App-Lifespan (app/main.py)
+webhook_replayer = WebhookReplayer(
+    stale_after_seconds=max(1, settings.webhook_replay_after_seconds)
+)
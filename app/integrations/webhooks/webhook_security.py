@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 import base64
+import binascii
 import hashlib
 import hmac
 import time
+from functools import lru_cache
 from typing import Mapping, Optional
 
 from fastapi import HTTPException, status
@@ -12,14 +14,40 @@ from fastapi import HTTPException, status
 from app.config import settings
 from app.integrations.crm.crm_types import CRMSystem
 
+# Replay-Schutz für v3: maximal ±5 Minuten Abweichung
+_FIVE_MIN_MS = 5 * 60 * 1000
 
-def _safe_compare(a: str, b: str) -> bool:
+_SHA256_DIGEST_SIZE = hashlib.sha256().digest_size
+
+
+def _safe_compare(a: bytes, b: bytes) -> bool:
     """
     Konstante Zeitvergleichs-Funktion zum Schutz vor Timing-Angriffen.
     """
     return hmac.compare_digest(a, b)
 
 
+def _signature_bytes(signature: str, *, encoding: str, version: str) -> bytes:
+    """
+    Dekodiert den Signatur-Header (hex bzw. base64) einmal in Bytes, damit
+    direkt gegen digest() verglichen werden kann. Ungültig oder keine
+    SHA-256-Länge → 401, noch bevor der Body gehasht wird.
+    """
+    try:
+        if encoding == "hex":
+            decoded = bytes.fromhex(signature)
+        else:
+            decoded = base64.b64decode(signature, validate=True)
+    except (ValueError, binascii.Error):
+        decoded = b""
+    if len(decoded) != _SHA256_DIGEST_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Invalid HubSpot {version} webhook signature",
+        )
+    return decoded
+
+
 def _require_hubspot_secret() -> str:
     secret = settings.hubspot_webhook_secret
     if not secret:
@@ -31,6 +59,23 @@ def _require_hubspot_secret() -> str:
     return secret
 
 
+# Das Secret ist konstant → Hash-/HMAC-Zustand nach dem Secret einmal
+# berechnen und pro Request nur kopieren. Key = Secret-String, damit ein
+# geändertes Secret automatisch einen neuen Eintrag bekommt.
+@lru_cache(maxsize=4)
+def _sha256_with_secret(secret: str) -> "hashlib._Hash":
+    return hashlib.sha256(secret.encode("utf-8"))
+
+
+# Mit einem OpenSSL-Konstruktor (hashlib.sha256) als digestmod liegt der
+# HMAC-Zustand komplett in OpenSSL (_hashlib.HMAC): copy()/update()/digest()
+# gehen direkt auf HMAC_Update/HMAC_Final, SHA-NI inklusive – eine eigene
+# C-Extension würde nur den Python-Aufruf pro update() sparen.
+@lru_cache(maxsize=4)
+def _hmac_sha256(secret: str) -> hmac.HMAC:
+    return hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+
+
 def _validate_hubspot_v1(*, secret: str, raw_body: bytes, signature: str) -> None:
     """
     v1-Signatur (CRM-Object Webhooks):
@@ -40,10 +85,12 @@ def _validate_hubspot_v1(*, secret: str, raw_body: bytes, signature: str) -> Non
     Siehe HubSpot-Doku:
       - v1: Client secret + request body → SHA256, hex 
     """
-    body_str = raw_body.decode("utf-8")
-    source = f"{secret}{body_str}"
-    expected = hashlib.sha256(source.encode("utf-8")).hexdigest()
-    if not _safe_compare(expected, signature):
+    expected = _signature_bytes(signature, encoding="hex", version="v1")
+
+    # Body als bytes direkt in den Hash – kein decode/f-String/encode
+    h = _sha256_with_secret(secret).copy()
+    h.update(raw_body)
+    if not _safe_compare(h.digest(), expected):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid HubSpot v1 webhook signature",
@@ -64,10 +111,13 @@ def _validate_hubspot_v2(
       expected = SHA256( client_secret + http_method + URI + request_body )
       
     """
-    body_str = raw_body.decode("utf-8")
-    source = f"{secret}{method.upper()}{request_uri}{body_str}"
-    expected = hashlib.sha256(source.encode("utf-8")).hexdigest()
-    if not _safe_compare(expected, signature):
+    expected = _signature_bytes(signature, encoding="hex", version="v2")
+
+    h = _sha256_with_secret(secret).copy()
+    h.update(method.upper().encode("utf-8"))
+    h.update(request_uri.encode("utf-8"))
+    h.update(raw_body)
+    if not _safe_compare(h.digest(), expected):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid HubSpot v2 webhook signature",
@@ -115,27 +165,24 @@ def _validate_hubspot_v3(
             detail="Invalid HubSpot timestamp header",
         )
 
-    # Replay-Schutz: maximal ±5 Minuten
-    now_ms = int(time.time() * 1000)
-    five_min_ms = 5 * 60 * 1000
-    if abs(now_ms - ts_ms) > five_min_ms:
+    # Replay-Schutz: maximal ±5 Minuten (time_ns: int, kein float-Umweg)
+    now_ms = time.time_ns() // 1_000_000
+    if abs(now_ms - ts_ms) > _FIVE_MIN_MS:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="HubSpot webhook timestamp too old",
         )
 
-    body_str = raw_body.decode("utf-8")
-    source = f"{method.upper()}{request_uri}{body_str}{ts_header}"
-
-    mac = hmac.new(
-        secret.encode("utf-8"),
-        msg=source.encode("utf-8"),
-        digestmod=hashlib.sha256,
-    )
-    expected_bytes = mac.digest()
-    expected_b64 = base64.b64encode(expected_bytes).decode("utf-8")
+    # Erst alle billigen Prüfungen (Header, Zeitfenster, Signatur-Format),
+    # dann der O(Body)-HMAC; der Body wird nie dekodiert oder kopiert.
+    expected = _signature_bytes(signature, encoding="base64", version="v3")
 
-    if not _safe_compare(expected_b64, signature):
+    mac = _hmac_sha256(secret).copy()
+    mac.update(method.upper().encode("utf-8"))
+    mac.update(request_uri.encode("utf-8"))
+    mac.update(raw_body)
+    mac.update(ts_header.encode("utf-8"))
+    if not _safe_compare(mac.digest(), expected):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid HubSpot v3 webhook signature",
@@ -14,6 +14,7 @@ from app.db.database import Database
 from app.domain.events.event_bus import event_bus
 from app.domain.events.company_events import CompanyUpdatedEvent
 from app.domain.repositories.company_repository import CompanyRepository
+from app.domain.services.opportunity_service import flush_pending_opportunity_writes
 
 from app.integrations.mapping import (
     CRMFieldMappingsRepository,
@@ -23,11 +24,27 @@ from app.integrations.mapping import (
     CRMOpportunityLinksRepository,
 )
 from app.integrations.credentials.crm_credentials_store import CRMCredentialsStore
-from app.integrations.sync.crm_sync_service import CRMSyncService
+from app.integrations.crm.hubspot.hubspot_refresh import hubspot_oauth_client
+from app.integrations.crm.hubspot.http import close_shared_client
+from app.integrations.crm.salesforce.http import (
+    close_shared_client as close_salesforce_client,
+)
+from app.integrations.crm.sap_b1.http import (
+    close_shared_client as close_sap_b1_client,
+)
+from app.integrations.sync.crm_sync_service import (
+    CRMSyncService,
+    drain_pending_link_writes,
+)
 from app.integrations.sync.crm_sync_listener import CRMSyncListener
+from app.integrations.sync.crm_cache_invalidation import (
+    crm_cache_invalidation_listener,
+)
 from app.integrations.sync.handlers.company_crm_sync_handler import (
     make_company_updated_handler,
 )
+from app.integrations.webhooks.webhook_queue import webhook_queue
+from app.integrations.webhooks.webhook_replay import webhook_replayer
 
 from app.api.admin_crm_router import admin_crm_router
 from app.api.tenant_crm_router import tenant_crm_router
@@ -42,12 +59,67 @@ from app.api.error_handlers import (
 
 logger = logging.getLogger(__name__)
 
+# Einmal beim Import berechnet (mit gunicorn --preload im Master, die Worker
+# erben es per fork)
+_CORS_ORIGINS = tuple(str(o) for o in settings.cors_origins)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # We are NOT using the local Postgres database.
-    # Do NOT connect/disconnect at startup to avoid asyncpg errors.
-    yield
+    # We are NOT using the local Postgres database by default.
+    # Do NOT connect/disconnect at startup to avoid asyncpg errors –
+    # unless DATABASE_CONNECT_ON_STARTUP is set: then one shared pool
+    # (app.state.db) serves all repositories (links, credentials, mappings).
+    db: Database | None = None
+    if settings.database_connect_on_startup:
+        db = Database(
+            settings.database_url,
+            min_size=settings.db_pool_min_size,
+            max_size=settings.db_pool_max_size,
+            statement_cache_size=settings.db_statement_cache_size,
+            max_cached_statement_lifetime=settings.db_max_cached_statement_lifetime,
+        )
+        await db.connect()
+        app.state.db = db
+
+    # Hintergrund-Consumer für event_bus.publish_background (Queue + Batching)
+    await event_bus.start()
+    # CRM-Caches sofort bei DB-Änderungen invalidieren (eigene Connection,
+    # nur wenn die NOTIFY-Trigger eingerichtet sind)
+    if settings.crm_cache_notify_enabled:
+        await crm_cache_invalidation_listener.start(settings.database_url)
+    # Webhook-Verarbeitung im Hintergrund (sofortige Antwort an das CRM)
+    if settings.webhook_queue_workers > 0:
+        await webhook_queue.start(workers=settings.webhook_queue_workers)
+    # liegengebliebene Webhook-Events nachverarbeiten (braucht den DB-Pool)
+    if (
+        db is not None
+        and settings.webhook_event_inbox_enabled
+        and settings.webhook_replay_after_seconds > 0
+    ):
+        await webhook_replayer.start(db)
+    try:
+        yield
+    finally:
+        await crm_cache_invalidation_listener.stop()
+        await webhook_replayer.stop()
+        # wartende Webhook-Jobs abarbeiten, solange DB/Clients noch offen sind
+        await webhook_queue.stop()
+        await event_bus.stop()
+        # Link-Writes der letzten Syncs noch in die DB bringen
+        await drain_pending_link_writes()
+        # gepufferte Opportunity-Writes (Write-Combining) schreiben
+        await flush_pending_opportunity_writes()
+        # gemeinsamer HTTP-Client für HubSpot-Token-Calls (Connect + Refresh)
+        await hubspot_oauth_client.close()
+        # gemeinsamer Connection-Pool für HubSpot-API-Calls aller Tenants
+        await close_shared_client()
+        # dito für Salesforce (alle Orgs/instance_urls)
+        await close_salesforce_client()
+        # dito für die SAP-B1-Service-Layer
+        await close_sap_b1_client()
+        if db is not None:
+            await db.disconnect()
 
 def create_app() -> FastAPI:
     app = FastAPI(
@@ -63,10 +135,10 @@ def create_app() -> FastAPI:
     app.add_exception_handler(Exception, unhandled_exception_handler)
 
     # CORS
-    if settings.cors_origins:
+    if _CORS_ORIGINS:
         app.add_middleware(
             CORSMiddleware,
-            allow_origins=[str(o) for o in settings.cors_origins],
+            allow_origins=_CORS_ORIGINS,
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
@@ -1,7 +1,10 @@
 # app/security/auth.py
 
 
-from typing import Optional, List
+import logging
+import time
+from functools import lru_cache
+from typing import Any, Mapping, Optional, List
 from uuid import UUID
 
 import jwt
@@ -11,6 +14,8 @@ from pydantic import BaseModel, Field
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 security_scheme = HTTPBearer(auto_error=False)
 
 
@@ -29,21 +34,49 @@ auth_settings = AuthSettings(
 )
 
 
+
+def _load_jwt_key(key: str, algorithm: str) -> Any:
+    """
+    Parst den Key einmal beim Import (PEM → Key-Objekt bei RS*/ES*/PS*),
+    statt ihn in jwt.decode bei jedem Request neu zu laden.
+    Fallback: der Roh-String – PyJWT parst ihn dann wie bisher pro Aufruf.
+    """
+    if not key:
+        return key
+    try:
+        return jwt.algorithms.get_default_algorithms()[algorithm].prepare_key(key)
+    except Exception:  # noqa: BLE001 - ungültiger Key fällt erst beim Decode auf
+        logger.warning("Could not preload JWT key for algorithm %s", algorithm, exc_info=True)
+        return key
+
+
+_JWT_KEY = _load_jwt_key(auth_settings.jwt_public_key, auth_settings.jwt_algorithm)
+_JWT_ALGORITHMS = [auth_settings.jwt_algorithm]
+
+
 class TokenData(BaseModel):
     sub: str
     tenant_id: UUID
     scopes: List[str] = Field(default_factory=list)
 
 
-def _decode_jwt(token: str) -> dict:
+# Clients schicken dasselbe Token über seine Laufzeit immer wieder → die
+# Signaturprüfung pro Token nur einmal. Fehler werden von lru_cache nicht
+# gecacht; exp und nbf prüft _decode_jwt bei jedem Aufruf selbst.
+@lru_cache(maxsize=4096)
+def _verify_jwt(token: str) -> Mapping[str, Any]:
+    return jwt.decode(
+        token,
+        _JWT_KEY,
+        algorithms=_JWT_ALGORITHMS,
+        audience=auth_settings.jwt_audience,
+        issuer=auth_settings.jwt_issuer,
+    )
+
+
+def _decode_jwt(token: str) -> Mapping[str, Any]:
     try:
-        payload = jwt.decode(
-            token,
-            auth_settings.jwt_public_key,
-            algorithms=[auth_settings.jwt_algorithm],
-            audience=auth_settings.jwt_audience,
-            issuer=auth_settings.jwt_issuer,
-        )
+        payload = _verify_jwt(token)
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -55,6 +88,21 @@ def _decode_jwt(token: str) -> dict:
             detail="invalid_token",
         )
 
+    # Zeit-Claims auch bei Cache-Treffern prüfen (wie jwt.decode, ohne Leeway)
+    now = time.time()
+    exp = payload.get("exp")
+    if exp is not None and exp <= now:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="token_expired",
+        )
+    nbf = payload.get("nbf")
+    if nbf is not None and nbf > now:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="invalid_token",
+        )
+
     return payload
 
 
@@ -0,0 +1,34 @@
+# tests/test_auth.py
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.security import auth
+
+
+def test_decode_jwt_rechecks_nbf_on_cached_payload(monkeypatch):
+    payload = {"sub": "u1", "nbf": time.time() + 60, "exp": time.time() + 3600}
+    monkeypatch.setattr(auth, "_verify_jwt", lambda token: payload)
+
+    with pytest.raises(HTTPException) as exc_info:
+        auth._decode_jwt("token")
+
+    assert exc_info.value.detail == "invalid_token"
+
+
+def test_decode_jwt_rechecks_exp_on_cached_payload(monkeypatch):
+    payload = {"sub": "u1", "exp": time.time() - 1}
+    monkeypatch.setattr(auth, "_verify_jwt", lambda token: payload)
+
+    with pytest.raises(HTTPException) as exc_info:
+        auth._decode_jwt("token")
+
+    assert exc_info.value.detail == "token_expired"
+
+
+def test_decode_jwt_accepts_valid_cached_payload(monkeypatch):
+    payload = {"sub": "u1", "nbf": time.time() - 1, "exp": time.time() + 3600}
+    monkeypatch.setattr(auth, "_verify_jwt", lambda token: payload)
+
+    assert auth._decode_jwt("token") is payload
@@ -0,0 +1,31 @@
+# tests/test_company_service.py
+from uuid import uuid4
+
+from app.domain.services.company_service import CompanyService
+from app.domain.services.list_cache import tenant_list_cache
+
+
+class FakeCompanyRepository:
+    def __init__(self, companies):
+        self.companies = companies
+        self.calls = 0
+
+    async def list_for_tenant(self, tenant_id, limit=100, offset=0):
+        self.calls += 1
+        return list(self.companies)
+
+
+async def test_list_companies_returns_list_on_hit_and_miss():
+    tenant_id = uuid4()
+    repo = FakeCompanyRepository(["a", "b"])
+    service = CompanyService(repo)
+
+    miss = await service.list_companies_for_tenant(tenant_id)
+    hit = await service.list_companies_for_tenant(tenant_id)
+    hit.append("c")
+
+    assert miss == hit[:2] == ["a", "b"]
+    assert type(miss) is type(hit) is list
+    assert await service.list_companies_for_tenant(tenant_id) == ["a", "b"]
+    assert repo.calls == 1
+    tenant_list_cache.invalidate(tenant_id, "company")
@@ -0,0 +1,89 @@
+# tests/test_crm_account_links_repository.py
+from datetime import datetime
+from uuid import UUID, uuid4
+
+from app.integrations.crm.crm_types import CRMSystem
+from app.integrations.mapping.crm_account_links_repository import CRMAccountLinksRepository
+
+
+class FakeDatabase:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    async def fetch_all(self, sql, params):
+        self.calls.append(params)
+        return self.rows
+
+    async def execute(self, sql, params):
+        self.calls.append(params)
+
+
+async def test_get_many_by_leadlane_ids_keys_uuid_rows_by_str():
+    leadlane_id = uuid4()
+    db = FakeDatabase([{"leadlane_sub_company_id": leadlane_id, "crm_account_id": 123}])
+    repo = CRMAccountLinksRepository(db)
+
+    found = await repo.get_many_by_leadlane_ids(uuid4(), CRMSystem.HUBSPOT, [str(leadlane_id)])
+
+    link = found[str(leadlane_id)]
+    assert link.crm_account_id == "123"
+    assert link.leadlane_sub_company_uuid == leadlane_id
+
+
+async def test_get_many_by_crm_ids_serves_second_lookup_from_cache():
+    tenant_id = uuid4()
+    leadlane_id = uuid4()
+    db = FakeDatabase(
+        [{"leadlane_sub_company_id": leadlane_id, "crm_account_id": "h1", "last_event_at": None}]
+    )
+    repo = CRMAccountLinksRepository(db)
+
+    first = await repo.get_many_by_crm_ids(tenant_id, CRMSystem.HUBSPOT, ["h1"])
+    second = await repo.get_many_by_crm_ids(tenant_id, CRMSystem.HUBSPOT, ["h1"])
+
+    assert first == second
+    assert first["h1"].leadlane_sub_company_id == str(leadlane_id)
+    assert len(db.calls) == 1
+
+
+async def test_update_last_event_at_many_updates_cached_links():
+    tenant_id = uuid4()
+    db = FakeDatabase(
+        [{"leadlane_sub_company_id": uuid4(), "crm_account_id": "h1", "last_event_at": None}]
+    )
+    repo = CRMAccountLinksRepository(db)
+    await repo.get_many_by_crm_ids(tenant_id, CRMSystem.HUBSPOT, ["h1"])
+    occurred_at = datetime(2024, 1, 1, 12, 0)
+
+    await repo.update_last_event_at_many(tenant_id, CRMSystem.HUBSPOT, [("h1", occurred_at)])
+    cached = await repo.get_many_by_crm_ids(tenant_id, CRMSystem.HUBSPOT, ["h1"])
+
+    assert cached["h1"].last_event_at == occurred_at
+
+
+async def test_bulk_upsert_links_uses_one_statement_for_any_batch_size():
+    tenant_id = uuid4()
+    ids = [str(uuid4()) for _ in range(3)]
+    db = FakeDatabase(
+        [{"leadlane_sub_company_id": UUID(i), "crm_account_id": f"h{n}"} for n, i in enumerate(ids)]
+    )
+    repo = CRMAccountLinksRepository(db)
+    statements = []
+    fetch_all = db.fetch_all
+
+    async def recording_fetch_all(sql, params):
+        statements.append(sql)
+        return await fetch_all(sql, params)
+
+    db.fetch_all = recording_fetch_all
+
+    await repo.bulk_upsert_links(tenant_id, CRMSystem.HUBSPOT, [(ids[0], "h0")])
+    links = await repo.bulk_upsert_links(
+        tenant_id, CRMSystem.HUBSPOT, [(ids[0], "x"), (ids[1], "h1"), (ids[2], "h2"), (ids[0], "h0")]
+    )
+
+    assert len(set(statements)) == 1
+    assert db.calls[1]["leadlane_ids"] == ids
+    assert db.calls[1]["crm_ids"] == ["h0", "h1", "h2"]
+    assert [link.leadlane_sub_company_id for link in links] == ids
@@ -0,0 +1,53 @@
+# tests/test_crm_client_cache.py
+from uuid import uuid4
+
+from app.integrations.crm.crm_client_cache import CRMClientCache
+from app.integrations.crm.crm_types import CRMSystem
+from app.integrations.mapping import crm_field_mappings_repository
+
+
+def _factory():
+    created = []
+
+    def create():
+        client = object()
+        created.append(client)
+        return client
+
+    return create, created
+
+
+def test_get_or_create_reuses_client():
+    cache = CRMClientCache()
+    create, created = _factory()
+    tenant_id = uuid4()
+
+    first = cache.get_or_create(tenant_id, CRMSystem.HUBSPOT, create)
+    second = cache.get_or_create(str(tenant_id), CRMSystem.HUBSPOT, create)
+
+    assert first is second
+    assert len(created) == 1
+
+
+def test_invalidate_rebuilds_client():
+    cache = CRMClientCache()
+    create, created = _factory()
+    tenant_id = uuid4()
+    cache.get_or_create(tenant_id, CRMSystem.HUBSPOT, create)
+
+    cache.invalidate(tenant_id)
+    cache.get_or_create(tenant_id, CRMSystem.HUBSPOT, create)
+
+    assert len(created) == 2
+
+
+def test_mapping_change_rebuilds_client():
+    cache = CRMClientCache()
+    create, created = _factory()
+    tenant_id = uuid4()
+    cache.get_or_create(tenant_id, CRMSystem.HUBSPOT, create)
+
+    crm_field_mappings_repository._bump_mappings_version()
+    cache.get_or_create(tenant_id, CRMSystem.HUBSPOT, create)
+
+    assert len(created) == 2
@@ -0,0 +1,81 @@
+# tests/test_crm_sync_service.py
+from uuid import uuid4
+
+from app.integrations.credentials.crm_credentials_store import CRMConnectionInfo
+from app.integrations.crm.crm_types import CRMDealPayload, CRMSyncResult, CRMSystem
+from app.integrations.sync.crm_sync_service import (
+    CRMSyncService,
+    SyncContext,
+    drain_pending_link_writes,
+)
+
+
+class FakeOpportunityLinksRepository:
+    def __init__(self):
+        self.lookups = []
+        self.upserts = []
+
+    async def get_by_leadlane_id(self, *, tenant_id, crm_system, leadlane_demo_id):
+        self.lookups.append(leadlane_demo_id)
+        return None
+
+    async def upsert_link(self, **kwargs):
+        raise AssertionError("Sync schreibt Links ohne RETURNING")
+
+    async def upsert_link_fire_and_forget(self, **kwargs):
+        self.upserts.append(kwargs)
+
+
+class FakeClient:
+    def __init__(self):
+        self.deals = []
+
+    async def upsert_deal(self, payload, existing_crm_id=None):
+        self.deals.append((payload, existing_crm_id))
+        return CRMSyncResult(
+            success=True,
+            crm_system=CRMSystem.HUBSPOT,
+            crm_object_type="deal",
+            crm_id="deal-1",
+            leadlane_id=payload.leadlane_demo_id,
+        )
+
+
+async def test_sync_opportunity_uses_demo_id_for_lookup_and_link():
+    tenant_id = uuid4()
+    demo_id = str(uuid4())
+    links = FakeOpportunityLinksRepository()
+    client = FakeClient()
+    service = CRMSyncService(
+        credentials_store=None,
+        mapping_engine=None,
+        account_links_repo=None,
+        contact_links_repo=None,
+        opportunity_links_repo=links,
+    )
+    service._create_client = lambda tenant_id, crm_system: client
+    connection = CRMConnectionInfo(
+        tenant_id=tenant_id,
+        crm_system=CRMSystem.HUBSPOT,
+        access_token="token",
+        refresh_token=None,
+        expires_at=None,
+    )
+    context = SyncContext(tenant_id=tenant_id, connections={CRMSystem.HUBSPOT: connection})
+
+    result = await service.sync_opportunity_to_crm(
+        tenant_id, CRMSystem.HUBSPOT, CRMDealPayload(leadlane_demo_id=demo_id), context
+    )
+    await drain_pending_link_writes()
+
+    assert result.success
+    assert links.lookups == [demo_id]
+    assert client.deals[0][1] is None
+    assert links.upserts == [
+        {
+            "tenant_id": tenant_id,
+            "crm_system": CRMSystem.HUBSPOT,
+            "leadlane_demo_id": demo_id,
+            "crm_opportunity_id": "deal-1",
+        }
+    ]
@@ -0,0 +1,42 @@
+# tests/test_event_bus.py
+import asyncio
+
+from app.domain.events.domain_event import DomainEvent
+from app.domain.events.event_bus import EventBus
+
+
+async def test_stop_dispatches_all_queued_events_in_batches():
+    bus = EventBus(batch_size=4, flush_ms=10)
+    handled = []
+
+    async def handler(event):
+        await asyncio.sleep(0.01)
+        handled.append(event.id)
+
+    bus.subscribe(DomainEvent, handler)
+    await bus.start()
+    events = [DomainEvent() for _ in range(10)]
+    for event in events:
+        bus.publish_background(event)
+    await asyncio.sleep(0)
+
+    await bus.stop()
+
+    assert sorted(handled) == sorted(event.id for event in events)
+
+
+async def test_publish_background_drops_events_when_queue_full():
+    bus = EventBus(queue_maxsize=1)
+    handled = []
+
+    async def handler(event):
+        handled.append(event.id)
+
+    bus.subscribe(DomainEvent, handler)
+    await bus.start()
+    bus.publish_background(DomainEvent())
+    bus.publish_background(DomainEvent())
+
+    await bus.stop()
+
+    assert len(handled) == 1
@@ -0,0 +1,26 @@
+# tests/test_hubspot_client.py
+from app.integrations.crm.crm_types import CRMCompanyPayload
+from app.integrations.crm.hubspot.hubspot_client import _payload_cache_key
+
+
+def _payload(properties):
+    return CRMCompanyPayload(name="ACME", leadlane_sub_company_id="c1", properties=properties)
+
+
+def test_payload_cache_key_distinguishes_bool_int_and_float():
+    keys = {
+        _payload_cache_key("company", _payload({"flag": value}))
+        for value in (True, 1, 1.0)
+    }
+
+    assert len(keys) == 3
+
+
+def test_payload_cache_key_equal_payloads_share_key():
+    assert _payload_cache_key("company", _payload({"a": 1})) == _payload_cache_key(
+        "company", _payload({"a": 1})
+    )
+
+
+def test_payload_cache_key_unhashable_value_is_not_cached():
+    assert _payload_cache_key("company", _payload({"tags": ["a"]})) is None
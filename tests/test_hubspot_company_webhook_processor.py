@@ -0,0 +1,21 @@
+# tests/test_hubspot_company_webhook_processor.py
+from datetime import datetime
+
+from app.integrations.webhooks.hubspot_company_webhook_processor import (
+    _parse_occurred_at,
+)
+
+
+def test_parse_occurred_at_epoch_millis_is_naive_utc():
+    assert _parse_occurred_at(1_700_000_000_000) == datetime(2023, 11, 14, 22, 13, 20)
+
+
+def test_parse_occurred_at_aware_iso_is_converted_to_naive_utc():
+    parsed = _parse_occurred_at("2024-01-01T13:00:00+01:00")
+
+    assert parsed == datetime(2024, 1, 1, 12, 0)
+    assert parsed.tzinfo is None
+
+
+def test_parse_occurred_at_empty():
+    assert _parse_occurred_at(None) is None
@@ -0,0 +1,35 @@
+# tests/test_json_codec.py
+from decimal import Decimal
+from uuid import uuid4
+
+import httpx
+
+from app.integrations.crm.json_codec import decode_body, dumps, loads
+
+
+def test_dumps_encodes_decimal_and_uuid():
+    company_id = uuid4()
+
+    body = loads(dumps({"sales_eur": Decimal("12.50"), "id": company_id}))
+
+    assert body == {"sales_eur": 12.5, "id": str(company_id)}
+
+
+def test_decode_body_json():
+    response = httpx.Response(
+        200, headers={"content-type": "application/json"}, content=b'{"a": 1}'
+    )
+
+    assert decode_body(response) == {"a": 1}
+
+
+def test_decode_body_falls_back_to_text_on_invalid_json():
+    response = httpx.Response(
+        502, headers={"content-type": "application/json"}, content=b"<html>Bad Gateway"
+    )
+
+    assert decode_body(response) == "<html>Bad Gateway"
+
+
+def test_decode_body_empty():
+    assert decode_body(httpx.Response(204)) is None
@@ -0,0 +1,37 @@
+# tests/test_list_cache.py
+from uuid import uuid4
+
+from app.domain.services.list_cache import TenantListCache
+
+
+def test_get_returns_tuple_copy():
+    cache = TenantListCache()
+    tenant_id = uuid4()
+    items = ["a", "b"]
+
+    cache.set(tenant_id, "company", 100, items)
+    items.append("c")
+
+    assert cache.get(tenant_id, "company", 100) == ("a", "b")
+
+
+def test_invalidate_drops_all_pages_of_tag_only():
+    cache = TenantListCache()
+    tenant_id = uuid4()
+    cache.set(tenant_id, "company", 100, ["a"])
+    cache.set(tenant_id, "company", 50, ["a"])
+    cache.set(tenant_id, "contact", 100, ["x"])
+
+    cache.invalidate(tenant_id, "company")
+
+    assert cache.get(tenant_id, "company", 100) is None
+    assert cache.get(tenant_id, "company", 50) is None
+    assert cache.get(tenant_id, "contact", 100) == ("x",)
+
+
+def test_expired_entry_is_a_miss():
+    cache = TenantListCache(ttl_seconds=0)
+    tenant_id = uuid4()
+    cache.set(tenant_id, "company", 100, ["a"])
+
+    assert cache.get(tenant_id, "company", 100) is None
@@ -0,0 +1,93 @@
+# tests/test_opportunity_service.py
+import asyncio
+from uuid import uuid4
+
+from app.domain.models.opportunity import Opportunity
+from app.domain.services.opportunity_service import OpportunityService
+
+
+class FakeOpportunityRepository:
+    def __init__(self, fail_for=None):
+        self.batches = []
+        self.saved = []
+        self.fail_for = fail_for
+
+    async def save_many(self, opportunities):
+        if self.fail_for is not None:
+            raise ValueError("batch failed")
+        self.batches.append(list(opportunities))
+
+    async def save(self, opportunity):
+        if opportunity.leadlane_demo_id == self.fail_for:
+            raise ValueError("bad row")
+        self.saved.append(opportunity)
+        return opportunity
+
+
+def _opportunity(tenant_id, demo_id, **kwargs):
+    return Opportunity(
+        tenant_id=tenant_id,
+        leadlane_demo_id=demo_id,
+        leadlane_sub_company_id=uuid4(),
+        leadlane_contact_id=uuid4(),
+        **kwargs,
+    )
+
+
+async def test_writes_in_window_are_combined_last_one_wins():
+    repo = FakeOpportunityRepository()
+    service = OpportunityService(repo, coalesce_window_ms=5)
+    tenant_id, demo_id = uuid4(), uuid4()
+    first = _opportunity(tenant_id, demo_id)
+    second = _opportunity(tenant_id, demo_id)
+
+    results = await asyncio.gather(
+        service.save_opportunity(first, actor="alice"),
+        service.save_opportunity(second, actor="bob"),
+        service.save_opportunity(_opportunity(tenant_id, uuid4())),
+    )
+
+    assert len(repo.batches) == 1
+    assert len(repo.batches[0]) == 2
+    assert results[0] is second and results[1] is second
+    assert second.created_by == "alice"
+    assert second.modified_by == "bob"
+
+
+async def test_close_flushes_pending_writes():
+    repo = FakeOpportunityRepository()
+    service = OpportunityService(repo, coalesce_window_ms=60_000)
+    save = asyncio.create_task(service.save_opportunity(_opportunity(uuid4(), uuid4())))
+    await asyncio.sleep(0)
+
+    await service.close()
+
+    await save
+    assert len(repo.batches) == 1
+
+
+async def test_writes_are_immediate_by_default():
+    repo = FakeOpportunityRepository()
+    service = OpportunityService(repo)
+    opportunity = _opportunity(uuid4(), uuid4())
+
+    assert await service.save_opportunity(opportunity) is opportunity
+    assert repo.saved == [opportunity]
+    assert repo.batches == []
+
+
+async def test_batch_failure_falls_back_to_single_saves():
+    bad_id = uuid4()
+    repo = FakeOpportunityRepository(fail_for=bad_id)
+    service = OpportunityService(repo, coalesce_window_ms=5)
+    good = _opportunity(uuid4(), uuid4())
+
+    results = await asyncio.gather(
+        service.save_opportunity(_opportunity(uuid4(), bad_id)),
+        service.save_opportunity(good),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], ValueError)
+    assert results[1] is good
+    assert repo.saved == [good]
@@ -0,0 +1,56 @@
+# tests/test_salesforce_client.py
+from uuid import uuid4
+
+from app.config import settings
+from app.integrations.credentials.crm_credentials_store import CRMConnectionInfo
+from app.integrations.crm.crm_types import CRMSystem
+from app.integrations.crm.salesforce.salesforce_client import SalesforceCRMClient
+
+
+class FakeCredentialsStore:
+    def __init__(self, info):
+        self.info = info
+        self.saved = []
+
+    async def get_credentials(self, tenant_id, crm_system):
+        return self.info
+
+    async def upsert_credentials(self, info):
+        self.saved.append(info)
+
+
+async def test_refresh_auth_persists_new_tokens(monkeypatch):
+    tenant_id = uuid4()
+    stored = CRMConnectionInfo(
+        tenant_id=tenant_id,
+        crm_system=CRMSystem.SALESFORCE,
+        access_token="old-access",
+        refresh_token="old-refresh",
+        expires_at=None,
+        scope="api",
+    )
+    store = FakeCredentialsStore(stored)
+    client = SalesforceCRMClient(
+        tenant_id,
+        {
+            "access_token": "old-access",
+            "refresh_token": "old-refresh",
+            "instance_url": "https://example.my.salesforce.com",
+        },
+        credentials_store=store,
+    )
+    monkeypatch.setattr(settings, "salesforce_client_id", "id")
+    monkeypatch.setattr(settings, "salesforce_client_secret", "secret")
+
+    async def refresh_access_token(**kwargs):
+        return {"access_token": "new-access", "refresh_token": "new-refresh"}
+
+    monkeypatch.setattr(client._api, "refresh_access_token", refresh_access_token)
+
+    assert await client.refresh_auth()
+
+    assert len(store.saved) == 1
+    saved = store.saved[0]
+    assert saved.access_token == "new-access"
+    assert saved.refresh_token == "new-refresh"
+    assert saved.scope == "api"
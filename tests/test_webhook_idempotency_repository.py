@@ -0,0 +1,63 @@
+# tests/test_webhook_idempotency_repository.py
+from datetime import datetime
+from uuid import uuid4
+
+from app.integrations.webhooks.webhook_idempotency_repository import (
+    SeenWebhookEventsCache,
+    WebhookIdempotencyRepository,
+)
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.calls = []
+
+    async def fetch_all(self, sql, params):
+        self.calls.append(params)
+        # alle angefragten Events gelten als neu
+        return [{"event_id": event_id} for event_id in params["event_ids"]]
+
+
+async def test_try_mark_received_many_dedups_and_skips_seen_events():
+    db = FakeDatabase()
+    repo = WebhookIdempotencyRepository(db, seen_cache=SeenWebhookEventsCache())
+    occurred_at = datetime(2024, 1, 1)
+
+    first = await repo.try_mark_received_many(
+        crm_system="hubspot",
+        rows=[("e1", occurred_at), ("e2", None), ("e1", None)],
+        tenant_id=uuid4(),
+        payloads={"e1": {"eventId": "e1"}},
+    )
+    second = await repo.try_mark_received_many(
+        crm_system="hubspot", rows=[("e1", None), ("e2", None)]
+    )
+
+    assert first == {"e1", "e2"}
+    assert second == set()
+    assert len(db.calls) == 1
+    params = db.calls[0]
+    assert params["event_ids"] == ["e1", "e2"]
+    assert params["occurred_ats"] == [occurred_at, None]
+    assert params["payloads"] == ['{"eventId":"e1"}', None]
+
+
+def test_seen_cache_is_per_crm_system_and_expires():
+    cache = SeenWebhookEventsCache()
+    cache.add_many("hubspot", ["e1"])
+
+    assert cache.seen("hubspot", "e1")
+    assert not cache.seen("salesforce", "e1")
+
+    expired = SeenWebhookEventsCache(ttl_seconds=0)
+    expired.add_many("hubspot", ["e1"])
+    assert not expired.seen("hubspot", "e1")
+
+
+async def test_try_mark_received_many_without_payloads_uses_plain_insert():
+    db = FakeDatabase()
+    repo = WebhookIdempotencyRepository(db, seen_cache=SeenWebhookEventsCache())
+
+    await repo.try_mark_received_many(crm_system="hubspot", rows=[("e1", None)])
+
+    assert set(db.calls[0]) == {"crm_system", "event_ids", "occurred_ats"}